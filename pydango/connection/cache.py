@@ -0,0 +1,152 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from aioarango.typings import Json
+
+from pydango.connection.codec import CodecType, get_codec
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    revalidations: int = 0
+    entries: int = 0
+    size: int = 0
+
+
+@dataclass
+class CachedDocument:
+    """
+    a stale document has to be revalidated against the `_rev` of the stored document before it is used.
+    """
+
+    document: Json
+    rev: Optional[str]
+    stale: bool = False
+
+
+class DocumentCache(ABC):
+    """
+    read cache of the documents fetched by `PydangoSession.get` and `get_many`, keyed by `_id`.
+
+    the session invalidates the documents it writes or removes, documents written by other clients are caught when a
+    stale entry is revalidated.
+    """
+
+    stats: CacheStats
+
+    @abstractmethod
+    def get(self, _id: str, allow_stale: bool = True) -> Optional[CachedDocument]: ...
+
+    @abstractmethod
+    def set(self, _id: str, document: Json, rev: Optional[str]) -> None: ...
+
+    @abstractmethod
+    def revalidate(self, _id: str, rev: Optional[str]) -> bool:
+        """
+        refreshes a stale entry still at revision `rev`, drops it otherwise.
+        """
+
+    @abstractmethod
+    def invalidate(self, _id: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+@dataclass
+class _Entry:
+    data: bytes
+    rev: Optional[str]
+    expires: float
+
+
+class LRUDocumentCache(DocumentCache):
+    """
+    in-process cache bounded by the size of the encoded documents, the least recently used ones are evicted first.
+
+    entries are fresh for `ttl` seconds, then revalidated. documents are kept encoded with `codec`, every hit decodes
+    its own copy.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        codec: CodecType = "auto",
+    ) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes should be a positive integer")
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._codec = get_codec(codec)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    def get(self, _id: str, allow_stale: bool = True) -> Optional[CachedDocument]:
+        entry = self._entries.get(_id)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        stale = self._clock() >= entry.expires
+        if stale and not allow_stale:
+            self._drop(_id)
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(_id)
+        if not stale:
+            self.stats.hits += 1
+        return CachedDocument(self._codec.loads(entry.data), entry.rev, stale)
+
+    def set(self, _id: str, document: Json, rev: Optional[str]) -> None:
+        data = self._codec.dumps(document).encode()
+        self._drop(_id)
+        if len(data) > self.max_bytes:
+            return
+        self._entries[_id] = _Entry(data, rev, self._clock() + self.ttl)
+        self.stats.size += len(data)
+        self.stats.entries += 1
+        while self.stats.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._forget(evicted)
+            self.stats.evictions += 1
+
+    def revalidate(self, _id: str, rev: Optional[str]) -> bool:
+        self.stats.revalidations += 1
+        entry = self._entries.get(_id)
+        if entry is not None and rev is not None and entry.rev == rev:
+            entry.expires = self._clock() + self.ttl
+            self.stats.hits += 1
+            return True
+        self._drop(_id)
+        self.stats.misses += 1
+        return False
+
+    def invalidate(self, _id: str) -> None:
+        if self._drop(_id):
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.stats.entries = 0
+        self.stats.size = 0
+
+    def _drop(self, _id: str) -> bool:
+        entry = self._entries.pop(_id, None)
+        if entry is None:
+            return False
+        self._forget(entry)
+        return True
+
+    def _forget(self, entry: _Entry) -> None:
+        self.stats.size -= len(entry.data)
+        self.stats.entries -= 1
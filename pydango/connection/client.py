@@ -1,4 +1,4 @@
-from typing import Optional, Sequence, Union
+from typing import Any, Optional, Sequence, Union
 
 from aioarango import ArangoClient, HTTPClient
 from aioarango.connection import (
@@ -7,24 +7,72 @@ from aioarango.connection import (
     JwtConnection,
     JwtSuperuserConnection,
 )
+from aioarango.http import DefaultHTTPClient
+from aioarango.resolver import HostResolver
+
+from pydango.connection.codec import CodecType, get_codec
+from pydango.connection.http import PooledHTTPClient, PoolStats
+from pydango.connection.resolver import LatencyAwareHostResolver, _TrackedHTTPClient
 
 
 def make_connection(  # nosec: B107
     hosts: Union[str, Sequence[str]] = "http://127.0.0.1:8529",
-    host_resolver: str = "roundrobin",
+    host_resolver: Union[str, HostResolver] = "roundrobin",
     http_client: Optional[HTTPClient] = None,
     db_name: str = "_system",
     username: str = "root",
     password: str = "",
     auth_method: str = "basic",
     superuser_token: Optional[str] = None,
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+    connect_timeout: Optional[float] = None,
+    read_timeout: Optional[float] = None,
+    compression: Optional[bool] = None,
+    codec: Optional[CodecType] = None,
 ) -> Connection:
-    client = ArangoClient(hosts, host_resolver, http_client)
+    """
+    without `http_client`, the requests are sent by a `PooledHTTPClient` built with the given pool, timeout and
+    compression settings, the settings it does not get keep its defaults. without any of them aioarango's
+    `DefaultHTTPClient` is kept.
+
+    `host_resolver` is "roundrobin", "random", "latency" for a `LatencyAwareHostResolver` of the hosts, or a
+    `HostResolver` instance.
+
+    `codec` encodes the request bodies and decodes the response bodies, "auto" uses orjson when it is installed,
+    aioarango's stdlib serializer is kept by default.
+    """
+    settings: dict[str, Any] = dict(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        compression=compression,
+    )
+    settings = {name: value for name, value in settings.items() if value is not None}
+    if http_client is None:
+        http_client = PooledHTTPClient(**settings) if settings else DefaultHTTPClient()
+    elif settings:
+        raise ValueError(f"{', '.join(settings)} can not be combined with http_client, configure the client instead")
+    if host_resolver == "latency":
+        host_resolver = LatencyAwareHostResolver(hosts.split(",") if isinstance(hosts, str) else hosts)
+    if isinstance(host_resolver, LatencyAwareHostResolver):
+        http_client = host_resolver.track(http_client)
+    serialization = {}
+    if codec is not None:
+        json_codec = get_codec(codec)
+        serialization = dict(serializer=json_codec.dumps, deserializer=json_codec.loads)
+    client = ArangoClient(
+        hosts, host_resolver if isinstance(host_resolver, str) else "roundrobin", http_client, **serialization
+    )
+    resolver = client._host_resolver if isinstance(host_resolver, str) else host_resolver
 
     if superuser_token is not None:
         return JwtSuperuserConnection(
             hosts=client.hosts,
-            host_resolver=client._host_resolver,
+            host_resolver=resolver,
             sessions=client._sessions,
             db_name=db_name,
             http_client=client._http,
@@ -36,7 +84,7 @@ def make_connection(  # nosec: B107
     elif auth_method.lower() == "basic":
         return BasicConnection(
             hosts=client.hosts,
-            host_resolver=client._host_resolver,
+            host_resolver=resolver,
             sessions=client._sessions,
             db_name=db_name,
             username=username,
@@ -48,7 +96,7 @@ def make_connection(  # nosec: B107
     elif auth_method.lower() == "jwt":
         return JwtConnection(
             hosts=client.hosts,
-            host_resolver=client._host_resolver,
+            host_resolver=resolver,
             sessions=client._sessions,
             db_name=db_name,
             username=username,
@@ -60,3 +108,15 @@ def make_connection(  # nosec: B107
 
     else:
         raise ValueError(f"invalid auth_method: {auth_method}")
+
+
+def pool_stats(connection: Connection) -> dict[str, PoolStats]:
+    """
+    statistics of the connection pool of every host, by host url.
+    """
+    http_client = connection._http
+    if isinstance(http_client, _TrackedHTTPClient):
+        http_client = http_client.http_client
+    if not isinstance(http_client, PooledHTTPClient):
+        raise ValueError(f"the connection is not using a {PooledHTTPClient.__name__}")
+    return http_client.stats
@@ -0,0 +1,63 @@
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+if TYPE_CHECKING:
+    from aioarango.connection import BaseConnection
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True)
+class JSONCodec:
+    """
+    encodes the request bodies and decodes the response bodies of a connection, `dumps` returns a `str` as aioarango
+    expects.
+    """
+
+    name: str
+    dumps: Callable[[Any], str]
+    loads: Callable[[Union[str, bytes]], Any]
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _orjson_dumps(obj: Any) -> str:
+    return orjson.dumps(obj).decode()
+
+
+STDLIB_CODEC = JSONCodec("json", _stdlib_dumps, json.loads)
+ORJSON_CODEC = JSONCodec("orjson", _orjson_dumps, orjson.loads) if orjson is not None else None
+
+CodecType = Union[str, JSONCodec]
+
+
+def get_codec(codec: CodecType = "auto") -> JSONCodec:
+    """
+    `codec` is "json", "orjson", "auto" for orjson when it is installed and the standard library otherwise, or a
+    `JSONCodec`.
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec == "auto":
+        return ORJSON_CODEC or STDLIB_CODEC
+    if codec == "json":
+        return STDLIB_CODEC
+    if codec == "orjson":
+        if ORJSON_CODEC is None:
+            raise ValueError("the orjson codec requires the orjson package")
+        return ORJSON_CODEC
+    raise ValueError(f"unknown codec: {codec}, use json, orjson or auto")
+
+
+def use_codec(connection: "BaseConnection", codec: JSONCodec) -> None:
+    """
+    replaces the serializer and deserializer of a connection built by an `ArangoClient`.
+    """
+    connection._serializer = codec.dumps
+    connection._deserializer = codec.loads
@@ -0,0 +1,224 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
+
+from aioarango.cursor import Cursor
+from aioarango.request import Request
+
+if TYPE_CHECKING:
+    from aioarango.typings import Json
+
+    from pydango.query.query import PreparedQuery
+
+# keyword arguments of `AQL.execute` sent in the body of the cursor request and in its options
+_CURSOR_BODY = {
+    "count": "count",
+    "batch_size": "batchSize",
+    "ttl": "ttl",
+    "cache": "cache",
+    "memory_limit": "memoryLimit",
+}
+_CURSOR_OPTIONS = {
+    "full_count": "fullCount",
+    "max_plans": "maxNumberOfPlans",
+    "fail_on_warning": "failOnWarning",
+    "max_transaction_size": "maxTransactionSize",
+    "max_warning_count": "maxWarningCount",
+    "intermediate_commit_count": "intermediateCommitCount",
+    "intermediate_commit_size": "intermediateCommitSize",
+    "satellite_sync_wait": "satelliteSyncWait",
+    "stream": "stream",
+    "skip_inaccessible_cols": "skipInaccessibleCollections",
+    "max_runtime": "maxRuntime",
+}
+
+# profile level 2 returns the executed plan and the statistics of every node along with the phases timings
+PROFILE_LEVEL = 2
+
+
+@dataclass
+class PlanIndex:
+    id: str
+    type: str
+    fields: list[str]
+    name: Optional[str] = None
+    collection: Optional[str] = None
+    unique: bool = False
+    sparse: bool = False
+    selectivity: Optional[float] = None
+
+    @classmethod
+    def from_json(cls, data: "Json", collection: Optional[str] = None) -> "PlanIndex":
+        return cls(
+            id=str(data.get("id", "")),
+            type=data.get("type", ""),
+            fields=list(data.get("fields", ())),
+            name=data.get("name"),
+            collection=collection,
+            unique=data.get("unique", False),
+            sparse=data.get("sparse", False),
+            selectivity=data.get("selectivityEstimate"),
+        )
+
+
+@dataclass
+class PlanNodeStats:
+    calls: int
+    items: int
+    runtime: float
+    filtered: int = 0
+
+    @classmethod
+    def from_json(cls, data: "Json") -> "PlanNodeStats":
+        return cls(
+            calls=data.get("calls", 0),
+            items=data.get("items", 0),
+            runtime=data.get("runtime", 0.0),
+            filtered=data.get("filtered", 0),
+        )
+
+
+@dataclass
+class PlanNode:
+    id: int
+    type: str
+    dependencies: list[int]
+    estimated_cost: float
+    estimated_nr_items: int
+    collection: Optional[str] = None
+    indexes: list[PlanIndex] = field(default_factory=list)
+    stats: Optional[PlanNodeStats] = None
+    raw: "Json" = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_json(cls, data: "Json", stats: Optional["Json"] = None) -> "PlanNode":
+        collection = data.get("collection")
+        return cls(
+            id=data["id"],
+            type=data["type"],
+            dependencies=list(data.get("dependencies", ())),
+            estimated_cost=data.get("estimatedCost", 0.0),
+            estimated_nr_items=data.get("estimatedNrItems", 0),
+            collection=collection,
+            indexes=[PlanIndex.from_json(i, collection) for i in data.get("indexes", ())],
+            stats=PlanNodeStats.from_json(stats) if stats is not None else None,
+            raw=data,
+        )
+
+
+@dataclass
+class QueryPlan:
+    nodes: list[PlanNode]
+    rules: list[str]
+    collections: list[str]
+    estimated_cost: float
+    estimated_nr_items: int
+    cacheable: Optional[bool] = None
+    warnings: list["Json"] = field(default_factory=list)
+    raw: "Json" = field(default_factory=dict, repr=False)
+
+    @property
+    def indexes(self) -> list[PlanIndex]:
+        return [index for node in self.nodes for index in node.indexes]
+
+    def node(self, node_id: int) -> PlanNode:
+        for node in self.nodes:
+            if node.id == node_id:
+                return node
+        raise KeyError(node_id)
+
+    @classmethod
+    def from_json(
+        cls,
+        plan: "Json",
+        nodes_stats: Optional[list["Json"]] = None,
+        cacheable: Optional[bool] = None,
+        warnings: Optional[list["Json"]] = None,
+    ) -> "QueryPlan":
+        stats_by_id = {i["id"]: i for i in nodes_stats or ()}
+        return cls(
+            nodes=[PlanNode.from_json(node, stats_by_id.get(node["id"])) for node in plan.get("nodes", ())],
+            rules=list(plan.get("rules", ())),
+            collections=[i["name"] for i in plan.get("collections", ())],
+            estimated_cost=plan.get("estimatedCost", 0.0),
+            estimated_nr_items=plan.get("estimatedNrItems", 0),
+            cacheable=cacheable,
+            warnings=list(warnings or ()),
+            raw=plan,
+        )
+
+
+@dataclass
+class QueryProfile:
+    plan: QueryPlan
+    phases: dict[str, float]
+    stats: "Json"
+
+    @property
+    def execution_time(self) -> Optional[float]:
+        return self.stats.get("execution_time")
+
+
+class ProfiledCursor(Cursor):
+    """
+    cursor of a profiled query, `query_profile` is available once the query has finished, with the first batch unless
+    the query is streamed.
+    """
+
+    __slots__ = ["_plan"]
+
+    def __init__(self, connection, init_data: "Json", cursor_type: str = "cursor") -> None:
+        self._plan: Optional["Json"] = None
+        super().__init__(connection, init_data, cursor_type)
+
+    def _update(self, data: "Json") -> "Json":
+        plan = data.get("extra", {}).get("plan")
+        if plan is not None:
+            self._plan = plan
+        return super()._update(data)
+
+    def query_profile(self) -> Optional[QueryProfile]:
+        if self._plan is None:
+            return None
+        stats = self._stats or {}
+        return QueryProfile(
+            plan=QueryPlan.from_json(self._plan, stats.get("nodes"), warnings=self._warnings),
+            phases=dict(self._profile or {}),
+            stats=stats,
+        )
+
+
+def explain_request(query: "PreparedQuery", **options) -> Request:
+    explain_options: "Json" = {"allPlans": False}
+    max_plans = options.pop("max_plans", None)
+    if max_plans is not None:
+        explain_options["maxNumberOfPlans"] = max_plans
+    optimizer_rules = options.pop("optimizer_rules", None)
+    if optimizer_rules is not None:
+        explain_options["optimizer"] = {"rules": optimizer_rules}
+    if options:
+        raise TypeError(f"unexpected explain options: {', '.join(sorted(options))}")
+
+    data = {"query": query.query, "bindVars": query.bind_vars, "options": explain_options}
+    return Request(method="post", endpoint="/_api/explain", data=data)
+
+
+def cursor_request(query: "PreparedQuery", cursor_options: "Json", **options: Any) -> Request:
+    """
+    builds the cursor request `AQL.execute` would send, with server options it does not support.
+    """
+    data: "Json" = {"query": query.query, "bindVars": query.bind_vars}
+    cursor_options = dict(cursor_options)
+    optimizer_rules = options.pop("optimizer_rules", None)
+    if optimizer_rules is not None:
+        cursor_options["optimizer"] = {"rules": optimizer_rules}
+    for name, value in options.items():
+        if value is None:
+            continue
+        if name in _CURSOR_BODY:
+            data[_CURSOR_BODY[name]] = value
+        elif name in _CURSOR_OPTIONS:
+            cursor_options[_CURSOR_OPTIONS[name]] = value
+        else:
+            raise TypeError(f"unexpected execute option: {name}")
+    data["options"] = cursor_options
+    return Request(method="post", endpoint="/_api/cursor", data=data)
@@ -84,6 +84,7 @@ def db_traverse(
     model.id = v_obj[ID]
     model.key = v_obj[KEY]
     model.rev = v_obj[REV]
+    model._mark_persisted()
 
     relations = list(_group_by_relation(model))
     if not relations:
@@ -220,7 +221,7 @@ def _build_object_graph_mappings(
         if id(relation_doc) in (
             edge_vertex_index.setdefault(edge_cls, {})
             .setdefault(model_id, {})
-            .setdefault((model.__class__, relation_doc.__class__), [])
+            .setdefault((model.__class__, relation_doc.__class__), {})
         ):
             return False
 
@@ -232,8 +233,8 @@ def _build_object_graph_mappings(
         (
             edge_vertex_index.setdefault(edge_cls, {})
             .setdefault(model_id, {})
-            .setdefault((model.__class__, relation_doc.__class__), [])
-            .append(id(relation_doc))
+            .setdefault((model.__class__, relation_doc.__class__), {})
+            .setdefault(id(relation_doc), None)
         )
 
     if id(model) in visited:
@@ -0,0 +1,122 @@
+import gzip
+from dataclasses import dataclass
+from typing import MutableMapping, Optional, Tuple
+
+import httpx
+from aioarango.http import HTTPClient
+from aioarango.response import Response
+from aioarango.typings import Headers
+
+
+@dataclass
+class PoolStats:
+    """
+    requests sent to one host, `waiting` ones are over `max_connections` and wait for a pooled connection.
+    """
+
+    requests: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    waiting: int = 0
+    failures: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+
+class PooledHTTPClient(HTTPClient):
+    """
+    http client with one connection pool per host, bounded by `max_connections` and keeping up to
+    `max_keepalive_connections` (all of them by default) open for `keepalive_expiry` seconds between requests.
+
+    with `compression` the request bodies of at least `compression_threshold` bytes are sent gzipped and compressed
+    responses are accepted, the server has to support them.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = 30.0,
+        connect_timeout: Optional[float] = 5.0,
+        read_timeout: Optional[float] = 60.0,
+        pool_timeout: Optional[float] = None,
+        compression: bool = False,
+        compression_threshold: int = 1024,
+        retries: int = 3,
+    ) -> None:
+        if max_connections < 1:
+            raise ValueError("max_connections should be a positive integer")
+        if max_keepalive_connections is not None and not 0 <= max_keepalive_connections <= max_connections:
+            raise ValueError("max_keepalive_connections should be between 0 and max_connections")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=(
+                max_connections if max_keepalive_connections is None else max_keepalive_connections
+            ),
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(connect=connect_timeout, read=read_timeout, write=read_timeout, pool=pool_timeout)
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.retries = retries
+        self.stats: dict[str, PoolStats] = {}
+
+    def create_session(self, host: str) -> httpx.AsyncClient:
+        transport = httpx.AsyncHTTPTransport(limits=self.limits, retries=self.retries)
+        return httpx.AsyncClient(transport=transport, timeout=self.timeout)
+
+    async def send_request(
+        self,
+        session: httpx.AsyncClient,
+        method: str,
+        url: str,
+        headers: Optional[Headers] = None,
+        params: Optional[MutableMapping[str, str]] = None,
+        data: Optional[str] = None,
+        auth: Optional[Tuple[str, str]] = None,
+    ) -> Response:
+        headers = dict(headers or {})
+        # an empty body is sent like no body at all
+        content = (data or "").encode()
+        if self.compression:
+            headers["Accept-Encoding"] = "gzip, deflate"
+            if len(content) >= self.compression_threshold:
+                content = gzip.compress(content)
+                headers["Content-Encoding"] = "gzip"
+
+        stats = self.stats.setdefault(_origin(url), PoolStats())
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        stats.waiting = max(0, stats.in_flight - self.limits.max_connections)
+        stats.bytes_sent += len(content)
+        try:
+            response = await session.request(
+                method=method,
+                url=url,
+                params=params,
+                content=content,
+                headers=headers,
+                auth=auth,
+                timeout=self.timeout,
+            )
+        except httpx.HTTPError:
+            stats.failures += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            stats.waiting = max(0, stats.in_flight - self.limits.max_connections)
+        stats.bytes_received += response.num_bytes_downloaded
+        return Response(
+            method=method,
+            url=str(response.url),
+            headers=response.headers,
+            status_code=response.status_code,
+            status_text=response.reason_phrase,
+            raw_body=response.text,
+        )
+
+
+def _origin(url: str) -> str:
+    parsed = httpx.URL(url)
+    return f"{parsed.scheme}://{parsed.host}:{parsed.port}" if parsed.port else f"{parsed.scheme}://{parsed.host}"
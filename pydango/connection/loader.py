@@ -0,0 +1,116 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, Optional
+
+from aioarango.typings import Json
+
+from pydango.connection.codec import STDLIB_CODEC, JSONCodec
+
+Fetch = Callable[[list[str]], Awaitable[dict[str, Json]]]
+
+
+@dataclass
+class LoaderStats:
+    """
+    `calls` is the number of loaded documents, `documents` the number of distinct ones fetched by the `batches`.
+    latencies are in seconds.
+    """
+
+    calls: int = 0
+    batches: int = 0
+    documents: int = 0
+    max_batch_size: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.documents / self.batches if self.batches else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.batches if self.batches else 0.0
+
+
+class DocumentLoader:
+    """
+    batches the documents loaded in the same event loop iteration, or within `window` seconds of the first one, into
+    one `fetch` of their ids per batch key, at most `max_batch_size` ids at a time.
+
+    every caller decodes its own copy of the document.
+    """
+
+    def __init__(
+        self,
+        fetch: Fetch,
+        window: float = 0.0,
+        max_batch_size: int = 1000,
+        codec: JSONCodec = STDLIB_CODEC,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if window < 0:
+            raise ValueError("window should not be negative")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size should be a positive integer")
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.stats = LoaderStats()
+        self._fetch = fetch
+        self._codec = codec
+        self._clock = clock
+        self._batches: dict[Hashable, dict[str, list["asyncio.Future[Optional[str]]"]]] = {}
+        self._handles: dict[Hashable, asyncio.Handle] = {}
+        self._tasks: set["asyncio.Task[None]"] = set()
+
+    async def load(self, _id: str, batch_key: Hashable = None) -> Optional[Json]:
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(batch_key)
+        if batch is None:
+            batch = self._batches[batch_key] = {}
+            if self.window:
+                self._handles[batch_key] = loop.call_later(self.window, self._dispatch, batch_key)
+            else:
+                self._handles[batch_key] = loop.call_soon(self._dispatch, batch_key)
+
+        future: "asyncio.Future[Optional[str]]" = loop.create_future()
+        batch.setdefault(_id, []).append(future)
+        self.stats.calls += 1
+        if len(batch) >= self.max_batch_size:
+            self._handles[batch_key].cancel()
+            self._dispatch(batch_key)
+
+        encoded = await future
+        return None if encoded is None else self._codec.loads(encoded)
+
+    def _dispatch(self, batch_key: Hashable) -> None:
+        batch = self._batches.pop(batch_key)
+        del self._handles[batch_key]
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[str, list["asyncio.Future[Optional[str]]"]]) -> None:
+        start = self._clock()
+        try:
+            found = await self._fetch(list(batch))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        latency = self._clock() - start
+        stats = self.stats
+        stats.batches += 1
+        stats.documents += len(batch)
+        stats.max_batch_size = max(stats.max_batch_size, len(batch))
+        stats.total_latency += latency
+        stats.max_latency = max(stats.max_latency, latency)
+        for _id, futures in batch.items():
+            document = found.get(_id)
+            encoded = None if document is None else self._codec.dumps(document)
+            for future in futures:
+                if not future.done():
+                    future.set_result(encoded)
@@ -0,0 +1,97 @@
+import base64
+import json
+from typing import TYPE_CHECKING, Any, Type, Union, cast
+
+from pydango.indexes import PersistentIndex, SkipListIndex
+from pydango.orm.models.fields import ModelFieldExpression
+from pydango.query.consts import KEY
+from pydango.query.expressions import (
+    Expression,
+    FieldExpression,
+    SortDirection,
+    SortExpression,
+)
+
+if TYPE_CHECKING:
+    from pydango.orm.models.base import ArangoModel
+    from pydango.orm.models.vertex import VertexModel
+    from pydango.query.expressions import ConditionExpression
+
+SortKey = Union[str, FieldExpression, SortExpression]
+
+_SORTED_INDEXES = (PersistentIndex, SkipListIndex)
+
+
+def field_alias(model: Type["ArangoModel"], name: str) -> str:
+    field = model.__fields__.get(name)
+    return field.alias if field is not None else name
+
+
+def model_field(model: Type["ArangoModel"], alias: str) -> ModelFieldExpression:
+    # ModelFieldExpression is typed for vertices, it compiles the same for edges
+    return ModelFieldExpression(alias, cast(Type["VertexModel"], model))
+
+
+def _sorted_fields(model: Type["ArangoModel"]) -> set[str]:
+    """
+    leading fields of the sorted indexes of the model, the only ones an index can serve a keyset page on.
+    """
+    fields = set()
+    for index in model.Collection.indexes or ():
+        if isinstance(index, dict):
+            index_type, index_fields = index.get("type"), index.get("fields")
+        else:
+            index_type, index_fields = type(index), index.fields
+        if index_type in _SORTED_INDEXES and index_fields:
+            fields.add(index_fields[0])
+    return fields
+
+
+def sort_key(model: Type["ArangoModel"], order_by: SortKey) -> tuple[str, SortDirection]:
+    direction = SortDirection.ASC
+    field: Union[str, Expression] = order_by
+    if isinstance(field, SortExpression):
+        direction = field.direction or SortDirection.ASC
+        field = field.field
+    if isinstance(field, FieldExpression):
+        field = field.field
+
+    alias = field_alias(model, str(field))
+    if alias != KEY and alias not in _sorted_fields(model):
+        raise ValueError(
+            f"{model.__name__} can not be paginated by {alias}, sort by {KEY} or the first field of a persistent index"
+        )
+    return alias, direction
+
+
+def keyset_conditions(
+    model: Type["ArangoModel"], alias: str, direction: SortDirection, value: Any, key: str
+) -> list["ConditionExpression"]:
+    """
+    conditions of the documents after the (`value`, `key`) position, the first one is a plain range on the sort field
+    so the optimizer can use the index for it, the `_key` only breaks the ties of non unique values.
+    """
+    field = model_field(model, alias)
+    after = field.__gt__ if direction == SortDirection.ASC else field.__lt__
+    if alias == KEY:
+        return [after(key)]
+
+    key_field = model_field(model, KEY)
+    key_after = key_field.__gt__ if direction == SortDirection.ASC else key_field.__lt__
+    from_value = field >= value if direction == SortDirection.ASC else field <= value
+    return [from_value, after(value) | ((model_field(model, alias) == value) & key_after(key))]
+
+
+def encode_token(alias: str, direction: SortDirection, value: Any, key: str) -> str:
+    payload = json.dumps([alias, direction.value, value, key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_token(token: str, alias: str, direction: SortDirection) -> tuple[Any, str]:
+    try:
+        token_alias, token_direction, value, key = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("invalid continuation token") from None
+    if (token_alias, token_direction) != (alias, direction.value):
+        raise ValueError(f"the continuation token was issued for another sort than {alias} {direction.value}")
+    return value, key
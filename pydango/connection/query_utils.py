@@ -82,6 +82,23 @@ def _build_upsert_query(
     return query
 
 
+def _build_save_many_query(
+    model: Type["BaseArangoModel"],
+    docs: list[Any],
+    strategy: UpdateStrategy,
+    options: Union[UpsertOptions, None] = None,
+):
+    i = IteratorExpression()
+    filter_ = _get_upsert_filter(i, model)
+    query = _make_upsert_query(filter_, i, model, for_(i, in_=docs), strategy, options)
+    return query.return_(new(debug=False))
+
+
+def _build_update_many_query(model: Type["BaseArangoModel"], docs: list[Any]):
+    i = IteratorExpression()
+    return for_(i, in_=docs).update(i, i, model.Collection.name).return_(new(debug=False))
+
+
 def _build_vertex_query(v, vertices_docs, strategy: UpdateStrategy):
     i = IteratorExpression()
     from_var = VariableExpression(v.Collection.name)
@@ -113,7 +130,7 @@ def _build_graph_query(
     for e, coll in edge_vertex_index.items():
         counter = 0
         edge_vars = []
-        for j, (instance, mapping) in enumerate(list(coll.items())):
+        for j, (instance, mapping) in enumerate(coll.items()):
             iterator = IteratorExpression()
             edge_ids.setdefault(e, {}).setdefault(instance, {}).update(
                 {id(doc): i + counter for i, doc in enumerate(edge_collections[e][instance])}
@@ -124,8 +141,9 @@ def _build_graph_query(
             from_model: Type["VertexModel"]
             to_model: Type["VertexModel"]
             for k, ((from_model, to_model), rels) in enumerate(mapping.items()):
-                from_ = vertex_collections[from_model].keys().index(instance)
-                new_rels = [vertex_collections[to_model].keys().index(x) for x in rels]
+                from_ = vertices_ids[from_model][instance]
+                to_ids = vertices_ids[to_model]
+                new_rels = [to_ids[x] for x in rels]
                 from_var = vertex_let_queries[from_model]
                 to_var = vertex_let_queries[to_model]
                 ret = {FROM: from_var[from_]._id, TO: to_var[iterator]._id}
@@ -0,0 +1,146 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, MutableMapping, Optional, Sequence, Tuple
+
+import httpx
+from aioarango.http import HTTPClient
+from aioarango.resolver import HostResolver
+from aioarango.response import Response
+from aioarango.typings import Headers
+
+
+@dataclass
+class HostStats:
+    """
+    `latency` is the moving average of the response time in seconds, `None` until the host answered once.
+    """
+
+    host: str
+    latency: Optional[float] = None
+    in_flight: int = 0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ejected_until: Optional[float] = None
+
+
+class LatencyAwareHostResolver(HostResolver):
+    """
+    sends every request to the available host with the lowest moving average latency weighted by its requests in
+    flight, after probing the hosts that were not measured yet with one request. a host failing `max_failures` times
+    in a row, with a transport error or a 5xx response, is ejected for `ejection_time` seconds.
+
+    the resolver learns the outcome of the requests through the http client returned by `track`.
+    """
+
+    def __init__(
+        self,
+        hosts: Sequence[str],
+        alpha: float = 0.3,
+        max_failures: int = 3,
+        ejection_time: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not hosts:
+            raise ValueError("at least one host is required")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha should be between 0 and 1")
+        if max_failures < 1:
+            raise ValueError("max_failures should be a positive integer")
+        self.alpha = alpha
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.stats = [HostStats(host.strip("/")) for host in hosts]
+        self._clock = clock
+        self._next = 0
+
+    def get_host_index(self) -> int:
+        now = self._clock()
+        available = [
+            i for i, stats in enumerate(self.stats) if stats.ejected_until is None or stats.ejected_until <= now
+        ]
+        if not available:
+            # every host is ejected, the first one back is the most likely to have recovered
+            return min(range(len(self.stats)), key=lambda i: self.stats[i].ejected_until or 0.0)
+
+        # the ties are broken in turn so hosts with the same load share the traffic
+        count = len(self.stats)
+        available.sort(key=lambda i: (i - self._next) % count)
+        index = min(available, key=self._load)
+        self._next = (index + 1) % count
+        return index
+
+    def _load(self, index: int) -> tuple[int, float]:
+        stats = self.stats[index]
+        if stats.latency is not None:
+            return 1, stats.latency * (stats.in_flight + 1)
+        # a host is probed with one request, it gets more once it answered
+        return (0, 0.0) if stats.in_flight == 0 else (2, stats.in_flight)
+
+    def index_of(self, url: str) -> Optional[int]:
+        for index, stats in enumerate(self.stats):
+            if url == stats.host or url.startswith(f"{stats.host}/"):
+                return index
+        return None
+
+    def started(self, index: int) -> None:
+        self.stats[index].in_flight += 1
+
+    def succeeded(self, index: int, latency: float) -> None:
+        stats = self.stats[index]
+        stats.in_flight -= 1
+        stats.requests += 1
+        stats.consecutive_failures = 0
+        stats.ejected_until = None
+        stats.latency = latency if stats.latency is None else self.alpha * latency + (1 - self.alpha) * stats.latency
+
+    def failed(self, index: int) -> None:
+        stats = self.stats[index]
+        stats.in_flight -= 1
+        stats.requests += 1
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        if stats.consecutive_failures >= self.max_failures:
+            stats.ejected_until = self._clock() + self.ejection_time
+
+    def track(self, http_client: HTTPClient) -> HTTPClient:
+        return _TrackedHTTPClient(http_client, self)
+
+
+class _TrackedHTTPClient(HTTPClient):
+    def __init__(self, http_client: HTTPClient, resolver: LatencyAwareHostResolver) -> None:
+        self.http_client = http_client
+        self.resolver = resolver
+
+    def create_session(self, host: str) -> httpx.AsyncClient:
+        return self.http_client.create_session(host)
+
+    async def send_request(
+        self,
+        session: httpx.AsyncClient,
+        method: str,
+        url: str,
+        headers: Optional[Headers] = None,
+        params: Optional[MutableMapping[str, str]] = None,
+        data: Optional[str] = None,
+        auth: Optional[Tuple[str, str]] = None,
+    ) -> Response:
+        index = self.resolver.index_of(url)
+        if index is None:
+            return await self.http_client.send_request(session, method, url, headers, params, data, auth)
+
+        self.resolver.started(index)
+        start = self.resolver._clock()
+        try:
+            response = await self.http_client.send_request(session, method, url, headers, params, data, auth)
+        except Exception:
+            self.resolver.failed(index)
+            raise
+        except BaseException:
+            self.resolver.stats[index].in_flight -= 1
+            raise
+        if response.status_code >= 500:
+            self.resolver.failed(index)
+        else:
+            self.resolver.succeeded(index, self.resolver._clock() - start)
+        return response
@@ -1,9 +1,13 @@
 import asyncio
 import dataclasses
-import json
 import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import partial
 from typing import (
     TYPE_CHECKING,
+    Any,
+    AsyncIterator,
     Awaitable,
     Callable,
     MutableMapping,
@@ -14,26 +18,62 @@ from typing import (
     cast,
     overload,
 )
+from weakref import WeakValueDictionary
 
 from aioarango import ArangoClient
 from aioarango.collection import Collection, StandardCollection
-from aioarango.database import StandardDatabase
-from aioarango.exceptions import AQLQueryExecuteError
+from aioarango.cursor import Cursor
+from aioarango.database import Database, StandardDatabase, TransactionDatabase
+from aioarango.exceptions import AQLQueryExecuteError, AQLQueryExplainError
+from aioarango.response import Response
 from aioarango.result import Result
 from aioarango.typings import Json
 
+from pydango.connection.cache import DocumentCache
+from pydango.connection.codec import (
+    STDLIB_CODEC,
+    CodecType,
+    JSONCodec,
+    get_codec,
+    use_codec,
+)
 from pydango.connection.consts import PYDANGO_SESSION_KEY
 from pydango.connection.exceptions import (
     DocumentNotFoundError,
     SessionNotInitializedError,
 )
+from pydango.connection.explain import (
+    PROFILE_LEVEL,
+    ProfiledCursor,
+    QueryPlan,
+    cursor_request,
+    explain_request,
+)
 from pydango.connection.graph_utils import db_traverse, graph_to_document
+from pydango.connection.loader import DocumentLoader
+from pydango.connection.pagination import (
+    SortKey,
+    decode_token,
+    encode_token,
+    field_alias,
+    keyset_conditions,
+    model_field,
+    sort_key,
+)
 from pydango.connection.query_utils import (
     _build_graph_query,
+    _build_save_many_query,
+    _build_update_many_query,
     _get_upsert_filter,
     _make_upsert_query,
 )
-from pydango.connection.types import CollectionUpsertOptions, UpdateStrategy
+from pydango.connection.types import (
+    CollectionUpsertOptions,
+    ExecutionStats,
+    GetManyResult,
+    Page,
+    UpdateStrategy,
+)
 from pydango.connection.utils import get_or_create_db
 from pydango.indexes import (
     FullTextIndex,
@@ -45,19 +85,33 @@ from pydango.indexes import (
     TTLIndex,
 )
 from pydango.orm.models import BaseArangoModel, VertexModel
+from pydango.orm.models.utils import save_dict
 from pydango.orm.query import ORMQuery
-from pydango.query import AQLQuery
-from pydango.query.expressions import IteratorExpression, VariableExpression
+from pydango.query import AQLQuery, Param
+from pydango.query.cache import template_cache
+from pydango.query.consts import ID, KEY, REV
+from pydango.query.expressions import (
+    IteratorExpression,
+    LiteralExpression,
+    SortExpression,
+    VariableExpression,
+)
 from pydango.query.functions import Document
 from pydango.query.operations import TraversalDirection
-from pydango.query.query import TraverseIterators
+from pydango.query.options import RemoveOptions, UpsertOptions
+from pydango.query.query import PreparedQuery, TraverseIterators
 
 if TYPE_CHECKING:
     from pydango.orm.models.base import ArangoModel
     from pydango.orm.models.vertex import TVertexModel
+    from pydango.query.expressions import ConditionExpression
     from pydango.query.types import Range
 
 logger = logging.getLogger(__name__)
+
+GET_MANY_CHUNK_SIZE = 1000
+GET_MANY_EDGES_CHUNK_SIZE = 100
+
 _INDEX_MAPPING: dict[Type[Indexes], Callable[..., Awaitable["Result[Json]"]]] = {
     GeoIndex: Collection.add_geo_index,
     HashIndex: Collection.add_hash_index,
@@ -68,17 +122,139 @@ _INDEX_MAPPING: dict[Type[Indexes], Callable[..., Awaitable["Result[Json]"]]] =
 }
 
 
-def _collection_from_model(database: StandardDatabase, model: Type[BaseArangoModel]) -> StandardCollection:
-    return database.collection(model.Collection.name)
+def _upsert_options(
+    model: Type[BaseArangoModel], collection_options: Union[CollectionUpsertOptions, None]
+) -> Optional[UpsertOptions]:
+    return (
+        collection_options and (collection_options.get(model.Collection.name) or collection_options.get(model)) or None
+    )
+
+
+def _document_query() -> AQLQuery:
+    doc = VariableExpression()
+    return ORMQuery().let(doc, Document(Param("id"))).return_(doc)
+
+
+def _documents_query() -> AQLQuery:
+    docs = VariableExpression()
+    doc = IteratorExpression()
+    return ORMQuery().let(docs, Document(Param("ids"))).for_(doc, docs).return_(doc)
+
+
+def _revision_query() -> AQLQuery:
+    doc = VariableExpression()
+    return ORMQuery().let(doc, Document(Param("id"))).return_(getattr(doc, REV))
+
+
+def _traversal_query(
+    model: Type["ArangoModel"],
+    start: Union[str, VariableExpression],
+    fetch_edges: Union[set[str], bool],
+    fetch_path: bool,
+    depth: "Range",
+) -> ORMQuery:
+    edges: Sequence[str]
+    if isinstance(fetch_edges, set):
+        edges = cast(Sequence[str], tuple(fetch_edges))
+    else:
+        _edges = []
+        for i in model.__relationships__.values():
+            if i.via_model:
+                _edges.append(i.via_model.Collection.name)
+        edges = _edges
+
+    v = IteratorExpression("v")
+    iterators = [v]
+    e = IteratorExpression("e")
+    iterators.append(e)
+
+    if fetch_path:
+        p = IteratorExpression("p")
+        iterators.append(p)
+
+    traversal_iterators: TraverseIterators = cast(TraverseIterators, tuple(iterators))
+    return (
+        ORMQuery()
+        .traverse(traversal_iterators, edges, start, depth, TraversalDirection.OUTBOUND)
+        .return_({"v": iterators[0], "e": iterators[1]})
+    )
+
+
+def _changes(document: "ArangoModel") -> Json:
+    return {KEY: document.key, **document.modified_save_dict()}
+
+
+def _partially_updated(document: "ArangoModel", strategy: UpdateStrategy) -> bool:
+    return (
+        strategy == UpdateStrategy.UPDATE
+        and document.__persisted__
+        and document.key is not None
+        and not _holds_relations(document)
+    )
+
+
+def _holds_relations(document: "ArangoModel") -> bool:
+    if not isinstance(document, VertexModel):
+        return False
+    for name in document.__relationships_fields__:
+        value = document.__dict__.get(name)
+        if isinstance(value, BaseArangoModel) or (isinstance(value, list) and value):
+            return True
+    return False
+
+
+def _collection_names(
+    collections: Union[str, Type["ArangoModel"], Sequence[Union[str, Type["ArangoModel"]]], None]
+) -> Optional[list[str]]:
+    if collections is None:
+        return None
+    if isinstance(collections, (str, type)):
+        collections = [collections]
+    return [i if isinstance(i, str) else i.Collection.name for i in collections]
+
+
+class _Flight:
+    """
+    a read of `single_flight`, the caller that started it gets the results and the callers that joined it decode
+    their encoding.
+    """
+
+    task: "asyncio.Task[list[Any]]"
+
+    def __init__(self) -> None:
+        self.joined = 0
+        self.encoded: Optional[str] = None
 
 
 class PydangoSession:
     @overload
-    def __init__(self, *, database: StandardDatabase): ...
+    def __init__(
+        self,
+        *,
+        database: StandardDatabase,
+        identity_map: bool = False,
+        cache: Optional[DocumentCache] = None,
+        max_concurrency: Optional[int] = None,
+        codec: Optional[CodecType] = None,
+        single_flight: bool = False,
+        batch_window: Optional[float] = None,
+    ): ...
 
     @overload
     def __init__(
-        self, *, client: ArangoClient, database: str, username: str = "", password: str = "", auth_method: str = "basic"
+        self,
+        *,
+        client: ArangoClient,
+        database: str,
+        username: str = "",
+        password: str = "",
+        auth_method: str = "basic",
+        identity_map: bool = False,
+        cache: Optional[DocumentCache] = None,
+        max_concurrency: Optional[int] = None,
+        codec: Optional[CodecType] = None,
+        single_flight: bool = False,
+        batch_window: Optional[float] = None,
     ): ...
 
     def __init__(
@@ -89,7 +265,55 @@ class PydangoSession:
         username: str = "root",
         password: str = "",
         auth_method: str = "basic",
+        identity_map: bool = False,
+        cache: Optional[DocumentCache] = None,
+        max_concurrency: Optional[int] = None,
+        codec: Optional[CodecType] = None,
+        single_flight: bool = False,
+        batch_window: Optional[float] = None,
     ):
+        """
+        with `identity_map` the documents loaded or saved by the session are held by weak reference under their `_id`,
+        loading a document that is still alive returns the same instance without fetching or validating it again.
+
+        `cache` serves the documents fetched by `get` and `get_many` without their edges, it is invalidated by the
+        writes and removals of the session and can be shared by several sessions.
+
+        `max_concurrency` bounds the queries the session runs at a time, the others wait for a slot in order.
+
+        `codec` ("json", "orjson", "auto" or a `JSONCodec`) replaces the serializer and deserializer of the connection
+        of the database, which keeps its own when not given.
+
+        with `single_flight` the concurrent reads of the same query and bind variables share one request, the callers
+        joining a read decode their own copy of the results. writes are never shared.
+
+        with `batch_window` the documents requested by `get` without their edges are fetched by a `DocumentLoader`,
+        with one `DOCUMENT(@ids)` query for the calls of the same event loop iteration (`0`) or of `batch_window`
+        seconds.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency should be a positive integer")
+        self.max_concurrency = max_concurrency
+        self.execution_stats = ExecutionStats()
+        # created on first use, in the event loop of the queries
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.codec: Optional[JSONCodec] = get_codec(codec) if codec is not None else None
+        self._in_flight: Optional[dict[tuple[Any, ...], _Flight]] = {} if single_flight else None
+        self.loader: Optional[DocumentLoader] = None
+        if batch_window is not None:
+            self.loader = DocumentLoader(
+                self._fetch_documents, batch_window, GET_MANY_CHUNK_SIZE, self.codec or STDLIB_CODEC
+            )
+        self.identity_map: Optional[WeakValueDictionary[str, BaseArangoModel]] = (
+            WeakValueDictionary() if identity_map else None
+        )
+        self.cache = cache
+        self._pending: dict[int, BaseArangoModel] = {}
+        self._transaction: ContextVar[Optional[TransactionDatabase]] = ContextVar(
+            f"pydango_transaction_{id(self)}", default=None
+        )
+        # ids of the documents written by the current transaction, invalidated again once it is committed
+        self._written: ContextVar[Optional[set[str]]] = ContextVar(f"pydango_written_{id(self)}", default=None)
         if isinstance(database, str):
             if client is None:
                 raise ValueError("client is required when database is a string")
@@ -101,6 +325,7 @@ class PydangoSession:
             self.auth_method = auth_method
         elif isinstance(database, StandardDatabase):
             self.database = database
+            self._use_codec()
         else:
             raise ValueError("database should be a string or a StandardDatabase instance")
 
@@ -109,6 +334,11 @@ class PydangoSession:
             self.database = await get_or_create_db(
                 self.client, self._db_name, user=self.username, password=self.password
             )
+            self._use_codec()
+
+    def _use_codec(self) -> None:
+        if self.codec is not None:
+            use_codec(cast(StandardDatabase, self.database).conn, self.codec)
 
     @property
     def initialized(self):
@@ -134,18 +364,22 @@ class PydangoSession:
         # todo: follow_links: bool = False,
         collection_options: Union[CollectionUpsertOptions, None] = None,
     ) -> Union["ArangoModel", "TVertexModel"]:
+        """
+        a document loaded or saved by a session is updated with the fields assigned since, and not written at all when
+        none was, unless the `REPLACE` strategy is used or the vertex holds related documents.
+        """
+        if _partially_updated(document, strategy):
+            if document.modified_fields:
+                await self._write_many([document], 1, partial(_build_update_many_query, document.__class__), _changes)
+            return document
+
         model_fields_mapping = None
         if isinstance(document, VertexModel):
             model_fields_mapping, vertices_ids, edge_ids, query = _build_graph_query(
-                document, collection_options=collection_options
+                document, strategy, collection_options=collection_options
             )
         else:
-            options = (
-                collection_options
-                and (collection_options.get(document.Collection.name) or collection_options.get(document.__class__))
-                or None
-            )
-
+            options = _upsert_options(document.__class__, collection_options)
             filter_ = _get_upsert_filter(document)
             query = _make_upsert_query(filter_, document, document, ORMQuery(), strategy, options)
 
@@ -159,8 +393,98 @@ class PydangoSession:
         if model_fields_mapping:
             db_traverse(cast(VertexModel, document), set(), result, model_fields_mapping, vertices_ids, edge_ids)
         logger.debug("cursor stats", extra=cursor.statistics())
+        self._forget(document.id)
+        if model_fields_mapping:
+            for saved in (*result["vertex"].values(), *result["edges"].values()):
+                self._forget(*(i[ID] for i in saved))
+        document._mark_persisted()
+        self._remember(document)
         return document
 
+    async def save_many(
+        self,
+        documents: Sequence["ArangoModel"],
+        strategy: UpdateStrategy = UpdateStrategy.UPDATE,
+        batch_size: int = 1000,
+        collection_options: Union[CollectionUpsertOptions, None] = None,
+    ) -> Sequence["ArangoModel"]:
+        """
+        upserts the documents with one query per model and chunk of `batch_size` documents, the `_id`, `_key` and
+        `_rev` of the saved documents are set on the instances. relationships are not followed, use `save` for graphs.
+
+        like `save`, the documents loaded or saved by a session are updated with their modified fields only, with one
+        `UPDATE` query per model and chunk, and skipped when unmodified.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size should be a positive integer")
+
+        groups: dict[Type["ArangoModel"], list["ArangoModel"]] = {}
+        for document in documents:
+            groups.setdefault(document.__class__, []).append(document)
+
+        for model, group in groups.items():
+            options = _upsert_options(model, collection_options)
+            upserts = []
+            updates = []
+            for document in group:
+                if _partially_updated(document, strategy):
+                    updates.append(document)
+                else:
+                    upserts.append(document)
+
+            await self._write_many(
+                upserts,
+                batch_size,
+                partial(_build_save_many_query, model, strategy=strategy, options=options),
+                save_dict,
+            )
+            await self._write_many(
+                [document for document in updates if document.modified_fields],
+                batch_size,
+                partial(_build_update_many_query, model),
+                _changes,
+            )
+
+        return documents
+
+    async def _write_many(
+        self,
+        documents: Sequence["ArangoModel"],
+        batch_size: int,
+        build_query: Callable[[list[Json]], ORMQuery],
+        payload: Callable[["ArangoModel"], Json],
+    ) -> None:
+        for start in range(0, len(documents), batch_size):
+            chunk = documents[start : start + batch_size]
+            query = build_query([payload(document) for document in chunk])
+            try:
+                cursor = await self.execute(query, batch_size=len(chunk))
+            except AQLQueryExecuteError as e:
+                logger.exception(query)
+                raise e
+            results = await self._drain(cursor)
+            for document, result in zip(chunk, results):
+                document.id = result[ID]
+                document.key = result[KEY]
+                document.rev = result[REV]
+                document._mark_persisted()
+                self._forget(document.id)
+                self._remember(document)
+
+    async def remove(self, document: "ArangoModel", options: Optional[RemoveOptions] = None) -> None:
+        if document.key is None:
+            raise ValueError("only documents with a key can be removed")
+        try:
+            await self.execute(ORMQuery().remove(document, options=options))
+        except AQLQueryExecuteError as e:
+            logger.exception(document)
+            raise e
+        _id = document.id or f"{document.Collection.name}/{document.key}"
+        self._forget(_id)
+        if self.identity_map is not None:
+            self.identity_map.pop(_id, None)
+        document.__persisted__ = False
+
     async def get(
         self,
         model: Type["ArangoModel"],
@@ -176,83 +500,550 @@ class PydangoSession:
     ) -> Optional[Union["TVertexModel", "ArangoModel"]]:
         collection = model.Collection.name
         _id = f"{collection}/{key}"
-        d = Document(_id)
-        doc = VariableExpression()
-        main_query = ORMQuery().let(doc, d)
-        return_: Union[VariableExpression, dict[str, VariableExpression]] = doc
-        edges: Sequence[str]
-        if fetch_edges:
-            if isinstance(fetch_edges, set):
-                edges = cast(Sequence[str], tuple(fetch_edges))
-            else:
-                _edges = []
-                for i in model.__relationships__.values():
-                    if i.via_model:
-                        _edges.append(i.via_model.Collection.name)
-                edges = _edges
-
-            v = IteratorExpression("v")
-            iterators = [v]
-            e = IteratorExpression("e")
-            iterators.append(e)
-
-            if fetch_path:
-                p = IteratorExpression("p")
-                iterators.append(p)
-            traversal_result = VariableExpression()
+        if not (fetch_edges or projection or return_raw):
+            mapped = self._mapped(model, _id)
+            if mapped is not None:
+                return mapped
+        if self._caching and not fetch_edges:
+            cached = await self._cached(_id)
+            if cached is not None:
+                return self._to_document(model, cached, projection, return_raw)
 
-            traversal_iterators: TraverseIterators = cast(TraverseIterators, tuple(iterators))
-            traversal = (
+        if self.loader is not None and not fetch_edges:
+            # the gets of different transactions are not batched together
+            result = await self.loader.load(_id, self._transaction.get())
+        elif fetch_edges:
+            doc = VariableExpression()
+            traversal_result = VariableExpression()
+            main_query = (
                 ORMQuery()
-                .traverse(traversal_iterators, edges, _id, depth, TraversalDirection.OUTBOUND)
-                .return_({"v": iterators[0], "e": iterators[1]})
+                .let(doc, Document(LiteralExpression(_id)))
+                .let(traversal_result, _traversal_query(model, _id, fetch_edges, fetch_path, depth))
+                .return_({"doc": doc, "edges": traversal_result})
             )
-            main_query.let(traversal_result, traversal)
-            return_ = {"doc": doc, "edges": traversal_result}
-
-        main_query.return_(return_)
-
-        cursor = await self.execute(main_query)
-        result = await cursor.next()
+            [result] = await self._fetch(main_query)
+        else:
+            [result] = await self._fetch(template_cache.prepare(_document_query, id=_id))
         if not result or (fetch_edges and not result.get("doc")):
             raise DocumentNotFoundError(_id)
 
-        if issubclass(model, VertexModel):
+        if self._caching and not fetch_edges:
+            cast(DocumentCache, self.cache).set(_id, result, result.get(REV))
+        return self._to_document(model, result, projection, return_raw, bool(fetch_edges))
+
+    async def get_many(
+        self,
+        model: Type["ArangoModel"],
+        keys: Sequence[str],
+        should_raise: bool = False,
+        fetch_edges: Union[set[str], bool] = False,
+        fetch_path: bool = False,
+        depth: "Range" = range(1, 1),
+        projection: Optional[Type["ArangoModel"]] = None,
+        return_raw: bool = False,
+        chunk_size: Optional[int] = None,
+    ) -> GetManyResult:
+        """
+        fetches the documents with one `DOCUMENT(@ids)` query per chunk of keys, `chunk_size` defaults to
+        `GET_MANY_CHUNK_SIZE`, or `GET_MANY_EDGES_CHUNK_SIZE` when the edges are fetched as every document brings its
+        traversal.
+        """
+        if chunk_size is None:
+            chunk_size = GET_MANY_EDGES_CHUNK_SIZE if fetch_edges else GET_MANY_CHUNK_SIZE
+        if chunk_size < 1:
+            raise ValueError("chunk_size should be a positive integer")
+
+        collection = model.Collection.name
+        ids = list(dict.fromkeys(f"{collection}/{key}" for key in keys))
+        mapped: dict[str, "ArangoModel"] = {}
+        if self.identity_map is not None and not (fetch_edges or projection or return_raw):
+            for _id in ids:
+                mapped_document = self._mapped(model, _id)
+                if mapped_document is not None:
+                    mapped[_id] = mapped_document
+            ids = [_id for _id in ids if _id not in mapped]
+
+        found: dict[str, Any] = {}
+        if self._caching and not fetch_edges:
+            # stale entries are fetched along with the missing ones rather than revalidated one by one
+            for _id in ids:
+                cached = cast(DocumentCache, self.cache).get(_id, allow_stale=False)
+                if cached is not None:
+                    found[_id] = cached.document
+            ids = [_id for _id in ids if _id not in found]
+
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start : start + chunk_size]
+            main_query: Union[AQLQuery, PreparedQuery]
+            if fetch_edges:
+                docs = VariableExpression()
+                doc = IteratorExpression()
+                traversal_result = VariableExpression()
+                main_query = (
+                    ORMQuery()
+                    .let(docs, Document(chunk))
+                    .for_(doc, docs)
+                    .let(traversal_result, _traversal_query(model, doc, fetch_edges, fetch_path, depth))
+                    .return_({"doc": doc, "edges": traversal_result})
+                )
+            else:
+                main_query = template_cache.prepare(_documents_query, ids=chunk)
+
+            for result in await self._fetch(main_query, batch_size=len(chunk)):
+                if fetch_edges:
+                    found[result["doc"][ID]] = result
+                else:
+                    found[result[ID]] = result
+                    if self._caching:
+                        cast(DocumentCache, self.cache).set(result[ID], result, result.get(REV))
+
+        documents: list[Optional["ArangoModel"]] = []
+        missing = []
+        for key in keys:
+            _id = f"{collection}/{key}"
+            result = found.get(_id)
+            if _id in mapped:
+                documents.append(mapped[_id])
+            elif result is None:
+                missing.append(key)
+                documents.append(None)
+            else:
+                document = self._to_document(model, result, projection, return_raw, bool(fetch_edges))
+                # a key requested twice is decoded once
+                if not (projection or return_raw):
+                    mapped[_id] = document
+                documents.append(document)
+
+        if missing and should_raise:
+            raise DocumentNotFoundError(*(f"{collection}/{key}" for key in missing))
+
+        return GetManyResult(documents, missing)
+
+    async def _fetch_documents(self, ids: list[str]) -> dict[str, Json]:
+        query = template_cache.prepare(_documents_query, ids=ids)
+        return {result[ID]: result for result in await self._fetch(query, batch_size=len(ids))}
+
+    def _to_document(
+        self,
+        model: Type["ArangoModel"],
+        result: dict,
+        projection: Optional[Type["ArangoModel"]],
+        return_raw: bool,
+        fetch_edges: bool = False,
+    ):
+        if fetch_edges and issubclass(model, VertexModel):
             result, recursive = graph_to_document(result, model)
 
         if return_raw:
             return result
 
         result[PYDANGO_SESSION_KEY] = self
-        if result is None and should_raise:
-            raise DocumentNotFoundError()
-
         if projection:
-            document = projection.from_orm(result, session=self)
-        else:
-            document = model.from_orm(result, session=self)
+            return projection.from_orm(result, session=self)
+        if fetch_edges:
+            # the mapped instance may not hold the edges, documents fetched with their edges are not mapped
+            return model.from_orm(result, session=self)
+        return self._load(model, result)
+
+    def _mapped(self, model: Type["ArangoModel"], _id: Optional[str]) -> Optional["ArangoModel"]:
+        if self.identity_map is None or _id is None:
+            return None
+        document = self.identity_map.get(_id)
+        return document if isinstance(document, model) else None
 
+    def _load(self, model: Type["ArangoModel"], result: dict) -> "ArangoModel":
+        document = self._mapped(model, result.get(ID))
+        if document is None:
+            document = model.from_orm(result, session=self)
+            self._remember(document)
         return document
 
-    async def find(self, model: Type[BaseArangoModel], filters=None, skip=None, limit=None):
-        if self.database is None:
-            raise SessionNotInitializedError(
-                "you should call `await session.initialize()` before using the session or initialize it in the"
-                " constructor with `StandardDatabase`"
-            )
-        collection = _collection_from_model(self.database, model)
-        return await collection.find(filters, skip, limit)
+    def _remember(self, document: "ArangoModel") -> None:
+        if self.identity_map is not None and document.id is not None:
+            self.identity_map[document.id] = document
 
-    async def execute(self, query: "AQLQuery", **options):
+    @property
+    def _caching(self) -> bool:
+        # documents read in a transaction may hold its uncommitted writes
+        return self.cache is not None and self._transaction.get() is None
+
+    async def _cached(self, _id: str) -> Optional[Json]:
+        cache = cast(DocumentCache, self.cache)
+        cached = cache.get(_id)
+        if cached is None:
+            return None
+        if cached.stale:
+            [rev] = await self._fetch(template_cache.prepare(_revision_query, id=_id))
+            if not cache.revalidate(_id, rev):
+                return None
+        return cached.document
+
+    def _forget(self, *ids: Optional[str]) -> None:
+        if self.cache is not None:
+            # a read outside the transaction may cache the document again before the write is committed
+            written = self._written.get()
+            for _id in ids:
+                if _id is not None:
+                    self.cache.invalidate(_id)
+                    if written is not None:
+                        written.add(_id)
+
+    def add(self, document: "ArangoModel") -> None:
+        """
+        adds a new or modified document to the unit of work, it is saved by the next `flush`.
+        """
+        self._pending[id(document)] = document
+
+    async def flush(
+        self,
+        strategy: UpdateStrategy = UpdateStrategy.UPDATE,
+        batch_size: int = 1000,
+        collection_options: Union[CollectionUpsertOptions, None] = None,
+    ) -> None:
+        """
+        saves the documents of the unit of work and the modified documents of the identity map, with one `save_many`
+        query per model and chunk of documents, vertices holding related documents are saved with their graph by
+        `save`. documents stay pending if the flush fails.
+        """
+        pending = dict(self._pending)
+        if self.identity_map is not None:
+            for document in list(self.identity_map.values()):
+                if document.modified_fields:
+                    pending.setdefault(id(document), document)
+
+        graphs = [document for document in pending.values() if _holds_relations(document)]
+        documents = [document for document in pending.values() if not _holds_relations(document)]
+        if documents:
+            await self.save_many(documents, strategy, batch_size, collection_options)
+        for document in graphs:
+            await self.save(document, strategy, collection_options)
+        for key in pending:
+            self._pending.pop(key, None)
+
+    async def find(
+        self,
+        model: Type["ArangoModel"],
+        filters: Union["ConditionExpression", dict[str, Any], None] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        *,
+        order_by: SortKey = KEY,
+        after: Optional[str] = None,
+    ) -> Page:
+        """
+        `filters` is an orm condition (`Model.field == x`) or a mapping of fields to values.
+
+        the documents are sorted by `order_by`, `_key` or the first field of a persistent index, and `_key` for the
+        ties. `after` is the `next_token` of the previous page, pages are then read with a range on the index and cost
+        the same at any depth, unlike `skip`.
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit should be a positive integer")
+        if skip and limit is None:
+            raise ValueError("skip requires a limit")
+        if skip and after is not None:
+            raise ValueError("skip can not be combined with a continuation token")
+
+        alias, direction = sort_key(model, order_by)
+        query = ORMQuery().for_(model)
+        if isinstance(filters, dict):
+            for name, value in filters.items():
+                query.filter(model_field(model, field_alias(model, name)) == value)
+        elif filters is not None:
+            query.filter(filters)
+        if after is not None:
+            for condition in keyset_conditions(model, alias, direction, *decode_token(after, alias, direction)):
+                query.filter(condition)
+
+        sort = [SortExpression(model_field(model, alias), direction)]
+        if alias != KEY:
+            sort.append(SortExpression(model_field(model, KEY), direction))
+        query.sort(*sort)
+        # one more document tells whether there is a next page
+        if limit is not None:
+            query.limit(limit + 1, skip)
+        query.return_(model)
+
+        results = await self._fetch(query, batch_size=limit + 1 if limit is not None else None)
+        next_token = None
+        if limit is not None and len(results) > limit:
+            results = results[:limit]
+            next_token = encode_token(alias, direction, results[-1].get(alias), results[-1][KEY])
+
+        return Page([self._load(model, result) for result in results], next_token)
+
+    @asynccontextmanager
+    async def transaction(
+        self,
+        write: Union[str, Type["ArangoModel"], Sequence[Union[str, Type["ArangoModel"]]], None] = None,
+        read: Union[str, Type["ArangoModel"], Sequence[Union[str, Type["ArangoModel"]]], None] = None,
+        exclusive: Union[str, Type["ArangoModel"], Sequence[Union[str, Type["ArangoModel"]]], None] = None,
+        sync: Optional[bool] = None,
+        allow_implicit: Optional[bool] = None,
+        lock_timeout: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ) -> AsyncIterator[TransactionDatabase]:
+        """
+        runs the operations of the session in the block, and in the tasks it starts, in one stream transaction on the
+        collections (names or models) given, committed when the block exits and aborted when it raises.
+
+        the documents written in the block are invalidated from the cache again once the transaction is committed.
+        an aborted transaction does not roll back the instances, their `_rev` and tracked fields are those of the
+        writes that were aborted.
+        """
+        if self._transaction.get() is not None:
+            raise ValueError("transactions can not be nested")
+        database = cast(StandardDatabase, self._database())
+        transaction = await database.begin_transaction(
+            read=_collection_names(read),
+            write=_collection_names(write),
+            exclusive=_collection_names(exclusive),
+            sync=sync,
+            allow_implicit=allow_implicit,
+            lock_timeout=lock_timeout,
+            max_size=max_size,
+        )
+        token = self._transaction.set(transaction)
+        written: set[str] = set()
+        written_token = self._written.set(written)
+        try:
+            yield transaction
+        except BaseException:
+            try:
+                await transaction.abort_transaction()
+            except Exception:
+                logger.exception("aborting transaction %s failed", transaction.transaction_id)
+            raise
+        else:
+            await transaction.commit_transaction()
+        finally:
+            self._written.reset(written_token)
+            self._transaction.reset(token)
+        self._forget(*written)
+
+    def _database(self) -> Database:
         if self.database is None:
             raise SessionNotInitializedError(
                 f"you should call `await {self.initialize.__name__}` before using the session or initialize it in the"
                 " constructor with `StandardDatabase`"
             )
-        prepared_query = query.prepare()
-        logger.debug(
-            "executing query", extra={"query": prepared_query.query, "bind_vars": json.dumps(prepared_query.bind_vars)}
-        )
-        return await self.database.aql.execute(
-            prepared_query.query, bind_vars=cast(MutableMapping, prepared_query.bind_vars), **options
+        return self._transaction.get() or self.database
+
+    def _prepare(self, query: Union["AQLQuery", PreparedQuery]) -> PreparedQuery:
+        prepared_query = query if isinstance(query, PreparedQuery) else query.prepare()
+        if prepared_query.params:
+            raise ValueError(f"unbound parameters: {', '.join(sorted(prepared_query.params))}, call `bind` first")
+        return prepared_query
+
+    async def execute(
+        self,
+        query: Union["AQLQuery", PreparedQuery],
+        profile: bool = False,
+        use_plan_cache: Optional[bool] = None,
+        **options,
+    ):
+        """
+        `use_plan_cache` defaults to whether the query was compiled in deterministic mode.
+        """
+        database = self._database()
+        prepared_query = self._prepare(query)
+        if logger.isEnabledFor(logging.DEBUG):
+            bind_vars = (self.codec or STDLIB_CODEC).dumps(prepared_query.bind_vars)
+            logger.debug("executing query", extra={"query": prepared_query.query, "bind_vars": bind_vars})
+        cursor_options = {}
+        if profile:
+            cursor_options["profile"] = PROFILE_LEVEL
+        if use_plan_cache is None:
+            use_plan_cache = prepared_query.deterministic
+        if use_plan_cache:
+            cursor_options["usePlanCache"] = True
+
+        async with self._slot():
+            if cursor_options:
+                request = cursor_request(prepared_query, cursor_options, **options)
+                cursor_class = ProfiledCursor if profile else Cursor
+
+                def response_handler(resp: Response) -> Cursor:
+                    if not resp.is_success:
+                        raise AQLQueryExecuteError(resp, request)
+                    return cursor_class(database.conn, resp.body)
+
+                return await database.aql._execute(request, response_handler)
+
+            return await database.aql.execute(
+                prepared_query.query, bind_vars=cast(MutableMapping, prepared_query.bind_vars), **options
+            )
+
+    async def _fetch(self, query: Union["AQLQuery", PreparedQuery], **options) -> list[Any]:
+        """
+        executes a query and returns all its results, joining the identical read in flight with `single_flight`.
+        """
+        prepared_query = self._prepare(query)
+        if self._in_flight is None or prepared_query.modification:
+            return await self._drain(await self.execute(prepared_query, **options))
+
+        codec = self.codec or STDLIB_CODEC
+        transaction = self._transaction.get()
+        key = (
+            prepared_query.query,
+            codec.dumps(prepared_query.bind_vars),
+            repr(sorted(options.items())),
+            transaction and transaction.transaction_id,
         )
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self.execution_stats.coalesced += 1
+            flight.joined += 1
+            # a cancelled caller does not cancel the read of the others
+            await asyncio.shield(flight.task)
+            return codec.loads(cast(str, flight.encoded))
+
+        flight = self._in_flight[key] = _Flight()
+        flight.task = asyncio.ensure_future(self._fly(key, flight, prepared_query, codec, **options))
+        flight.task.add_done_callback(partial(self._landed, key, flight))
+        return await asyncio.shield(flight.task)
+
+    async def _fly(
+        self, key: tuple[Any, ...], flight: "_Flight", query: PreparedQuery, codec: JSONCodec, **options
+    ) -> list[Any]:
+        try:
+            results = await self._drain(await self.execute(query, **options))
+        finally:
+            # no caller joins the read after this point
+            self._close(key, flight)
+        # encoded before any caller gets to change them
+        if flight.joined:
+            flight.encoded = codec.dumps(results)
+        return results
+
+    def _landed(self, key: tuple[Any, ...], flight: "_Flight", task: "asyncio.Task[list[Any]]") -> None:
+        self._close(key, flight)
+        # the callers may all have been cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def _close(self, key: tuple[Any, ...], flight: "_Flight") -> None:
+        in_flight = cast(dict, self._in_flight)
+        if in_flight.get(key) is flight:
+            del in_flight[key]
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        stats = self.execution_stats
+        stats.queued += 1
+        try:
+            await self._acquire()
+        finally:
+            stats.queued -= 1
+
+        stats.in_flight += 1
+        try:
+            yield
+        except BaseException:
+            stats.failed += 1
+            raise
+        else:
+            stats.completed += 1
+        finally:
+            stats.in_flight -= 1
+            if self._slots is not None:
+                self._slots.release()
+
+    async def _acquire(self) -> None:
+        if self.max_concurrency is not None:
+            if self._slots is None:
+                self._slots = asyncio.Semaphore(self.max_concurrency)
+            await self._slots.acquire()
+
+    async def _fetch_batch(self, cursor: Cursor) -> None:
+        # the requests of the next batches count against `max_concurrency` like the one that opened the cursor
+        await self._acquire()
+        try:
+            await cursor.fetch()
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    async def _drain(self, cursor: Cursor) -> list[Any]:
+        results = []
+        while True:
+            while not cursor.empty():
+                results.append(cursor.pop())
+            if not cursor.has_more():
+                return results
+            await self._fetch_batch(cursor)
+
+    async def execute_many(
+        self,
+        queries: Sequence[Union["AQLQuery", PreparedQuery]],
+        concurrency: Optional[int] = None,
+        **options,
+    ) -> list[Union[list[Any], Exception]]:
+        """
+        runs the queries with at most `concurrency` of them at a time, within the `max_concurrency` of the session, and
+        returns the results of every query in their order. a failing query does not stop the others, its exception
+        takes the place of its results.
+        """
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("concurrency should be a positive integer")
+
+        results: list[Union[list[Any], Exception]] = [[] for _ in queries]
+        pending = iter(enumerate(queries))
+        self.execution_stats.queued += len(queries)
+
+        async def worker() -> None:
+            for index, query in pending:
+                self.execution_stats.queued -= 1
+                try:
+                    results[index] = await self._fetch(query, **options)
+                except Exception as e:
+                    results[index] = e
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(concurrency or len(queries), len(queries)))))
+        finally:
+            # the queries left when cancelled
+            self.execution_stats.queued -= sum(1 for _ in pending)
+        return results
+
+    async def stream(
+        self,
+        query: Union["AQLQuery", PreparedQuery],
+        model: Optional[Type["ArangoModel"]] = None,
+        batch_size: int = 1000,
+        **options,
+    ) -> AsyncIterator[Any]:
+        """
+        yields the results of a streaming cursor, decoded as `model` instances when given, one server batch of
+        `batch_size` results is held at a time.
+
+        the server cursor is closed when the generator is closed or cancelled before the results are exhausted, use
+        `aclose` (or `contextlib.aclosing`) after breaking out of the loop to release it deterministically.
+        """
+        options.setdefault("stream", True)
+        cursor = await self.execute(query, batch_size=batch_size, **options)
+        try:
+            while True:
+                while not cursor.empty():
+                    result = cursor.pop()
+                    yield result if model is None else self._load(model, result)
+                if not cursor.has_more():
+                    break
+                await self._fetch_batch(cursor)
+        finally:
+            if cursor.has_more():
+                await cursor.close(ignore_missing=True)
+
+    async def explain(self, query: Union["AQLQuery", PreparedQuery], **options) -> QueryPlan:
+        database = self._database()
+        prepared_query = self._prepare(query)
+        request = explain_request(prepared_query, **options)
+
+        def response_handler(resp: Response) -> QueryPlan:
+            if not resp.is_success:
+                raise AQLQueryExplainError(resp, request)
+            return QueryPlan.from_json(
+                resp.body["plan"], cacheable=resp.body.get("cacheable"), warnings=resp.body.get("warnings")
+            )
+
+        return await database.aql._execute(request, response_handler)
@@ -1,7 +1,8 @@
 import sys
 from collections import defaultdict, namedtuple
+from dataclasses import dataclass
 from enum import Enum
-from typing import Type, Union
+from typing import Generic, Iterator, Optional, Type, TypeVar, Union
 
 from indexed import IndexedOrderedDict
 
@@ -20,8 +21,9 @@ VerticesIdsMapping: TypeAlias = dict[Type[VertexModel], dict[int, int]]
 EdgesIdsMapping: TypeAlias = dict[Type[EdgeModel], dict[int, dict[int, int]]]
 
 EdgeCollectionsMapping: TypeAlias = dict[Type[EdgeModel], IndexedOrderedDict[list[EdgeModel]]]
+# the related vertices ids of every vertex are an insertion ordered set
 EdgeVerticesIndexMapping = dict[
-    Type[EdgeModel], dict[int, dict[tuple[Type[VertexModel], Type[VertexModel]], list[int]]]
+    Type[EdgeModel], dict[int, dict[tuple[Type[VertexModel], Type[VertexModel]], dict[int, None]]]
 ]
 
 VertexCollectionsMapping = dict[Type[VertexModel], IndexedOrderedDict[BaseArangoModel]]
@@ -29,6 +31,61 @@ VertexCollectionsMapping = dict[Type[VertexModel], IndexedOrderedDict[BaseArango
 RelationGroup = namedtuple("RelationGroup", ["collection", "field", "model", "via_model"])
 
 
+@dataclass
+class ExecutionStats:
+    """
+    `queued` queries wait for a slot of the session or of `execute_many`, `completed` and `failed` count the queries
+    whose cursor was created or not. `coalesced` reads joined an identical read in flight.
+    """
+
+    in_flight: int = 0
+    queued: int = 0
+    completed: int = 0
+    failed: int = 0
+    coalesced: int = 0
+
+
 class UpdateStrategy(str, Enum):
     UPDATE = "update"
     REPLACE = "replace"
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class GetManyResult(Generic[T]):
+    """
+    `documents` follows the order of the requested keys, with `None` in place of the keys listed in `missing`.
+    """
+
+    documents: list[Optional[T]]
+    missing: list[str]
+
+    def __iter__(self) -> Iterator[Optional[T]]:
+        return iter(self.documents)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __getitem__(self, index: int) -> Optional[T]:
+        return self.documents[index]
+
+
+@dataclass
+class Page(Generic[T]):
+    """
+    `next_token` continues after the last document of the page, `None` on the last page.
+    """
+
+    documents: list[T]
+    next_token: Optional[str]
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.documents)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __getitem__(self, index: int) -> T:
+        return self.documents[index]
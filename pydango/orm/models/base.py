@@ -27,7 +27,7 @@ from pydantic.v1.typing import resolve_annotations
 from pydango.connection.consts import PYDANGO_SESSION_KEY
 from pydango.indexes import Indexes
 from pydango.orm.consts import EDGES
-from pydango.orm.encoders import jsonable_encoder
+from pydango.orm.encoders import SetIntStr, jsonable_encoder
 from pydango.orm.models.fields import (
     ModelFieldExpression,
     RelationModelField,
@@ -349,6 +349,11 @@ class BaseArangoModel(BaseModel, metaclass=ArangoModelMeta):
     rev: Optional[str] = Field(None, alias=REV)
 
     __session__: Optional["PydangoSession"] = PrivateAttr()
+    # names of the fields assigned since the document was loaded or saved
+    __modified__: set[str] = PrivateAttr(default_factory=set)
+    __persisted__: bool = PrivateAttr(default=False)
+    # instances can be held by the session's identity map
+    __slots__ = ("__weakref__",)
 
     if TYPE_CHECKING:
         __relationships__: Relationships = {}
@@ -366,6 +371,32 @@ class BaseArangoModel(BaseModel, metaclass=ArangoModelMeta):
         super().__init__(**data)
         object.__setattr__(self, PYDANGO_SESSION_KEY, data.get(PYDANGO_SESSION_KEY))
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in self.__fields__ and name not in OPERATIONAL_FIELDS and name not in self.__relationships_fields__:
+            self.__modified__.add(name)
+
+    @property
+    def modified_fields(self) -> frozenset[str]:
+        return frozenset(self.__modified__)
+
+    def mark_modified(self, *fields: str) -> None:
+        """
+        assignments are tracked, fields mutated in place (`doc.tags.append(tag)`) have to be marked.
+        """
+        unknown = set(fields) - self.__fields__.keys()
+        if unknown:
+            raise ValueError(f"{self.__class__.__name__} has no fields {', '.join(sorted(unknown))}")
+        self.__modified__.update(fields)
+
+    def modified_save_dict(self) -> "DictStrAny":
+        include: SetIntStr = set(self.__modified__)
+        return jsonable_encoder(self, by_alias=True, include=include, exclude=set(self.__relationships_fields__))
+
+    def _mark_persisted(self) -> None:
+        self.__persisted__ = True
+        self.__modified__.clear()
+
     @classmethod
     def _decompose_class(cls: Type["Model"], obj: Any) -> Union["GetterDict", dict]:  # type: ignore[override]
         if isinstance(obj, dict):
@@ -388,7 +419,8 @@ class BaseArangoModel(BaseModel, metaclass=ArangoModelMeta):
             if not exclude:
                 exclude = _exclude
             else:
-                exclude.update(_exclude)  # type: ignore[attr-defined]
+                # the given mapping may be the model's `__exclude_fields__`, it must not be mutated
+                exclude = {**exclude, **_exclude}
 
         return super()._calculate_keys(include, exclude, exclude_unset, update)
 
@@ -417,6 +449,8 @@ class BaseArangoModel(BaseModel, metaclass=ArangoModelMeta):
         except ConfigError as e:
             raise e
 
+        obj._mark_persisted()
+
         # for field_name, field in cls.__relationships_fields__.items():
         #     setattr( getattr(obj,field_name),'__dali_session__',session)
         # object_setattr(obj, DALI_SESSION_KW, session)
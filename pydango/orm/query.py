@@ -5,16 +5,18 @@ from typing import TYPE_CHECKING, Optional, Sequence, Type, Union, cast, overloa
 from pydantic.v1 import BaseModel
 from pydantic.v1.utils import lenient_issubclass
 
-from pydango.orm.encoders import jsonable_encoder
 from pydango.orm.models.base import Aliased, BaseArangoModel, LazyProxy
 from pydango.orm.models.fields import ModelFieldExpression
 from pydango.orm.models.utils import save_dict
 from pydango.query.expressions import (
     BinaryExpression,
+    BinaryLogicalExpression,
     CollectionExpression,
     FieldExpression,
     IteratorExpression,
+    ListExpression,
     LiteralExpression,
+    Param,
     ReturnableExpression,
     SortExpression,
 )
@@ -24,7 +26,7 @@ from pydango.query.options import (
     UpdateOptions,
     UpsertOptions,
 )
-from pydango.query.query import AQLQuery, TraverseIterators
+from pydango.query.query import AQLQuery, TraverseIterators, _encode_bind_vars
 
 if sys.version_info >= (3, 11):
     from typing import Self, TypeAlias
@@ -34,7 +36,6 @@ else:
 if TYPE_CHECKING:
     from pydango.orm.models.base import ArangoModel
     from pydango.query.expressions import (
-        BinaryLogicalExpression,
         ConditionExpression,
         Expression,
         IterableExpression,
@@ -65,21 +66,25 @@ def _find_models_and_bind(condition: Union["ConditionExpression", "BinaryLogical
     stack: list[Union[BinaryExpression, "Expression"]] = [condition]
     while stack:
         current = stack.pop()
-        if isinstance(current, (LiteralExpression, FieldExpression)):
+        if isinstance(current, (LiteralExpression, Param, FieldExpression)):
             continue
-        if isinstance(current, BinaryExpression):
-            if isinstance(current.left, (FieldExpression, AQLQuery)):
-                _bind(query, current.left)
-            else:
-                stack.append(current.left)
-
-            if isinstance(current.right, (FieldExpression, AQLQuery)):
-                _bind(query, current.right)
-            else:
-                stack.append(current.right)
+        operands: Sequence["Expression"]
+        if isinstance(current, BinaryLogicalExpression):
+            operands = current.operands
+        elif isinstance(current, BinaryExpression):
+            operands = (current.left, current.right)
+        elif isinstance(current, ListExpression):
+            # literal only lists have no items to bind
+            operands = current._copy
         else:
             raise Exception("need to check this error")
 
+        for operand in operands:
+            if isinstance(operand, (FieldExpression, AQLQuery)):
+                _bind(query, operand)
+            else:
+                stack.append(operand)
+
 
 class ORMQuery(AQLQuery):
     def __init__(self, parent: Optional[AQLQuery] = None):
@@ -364,8 +369,9 @@ class ORMQuery(AQLQuery):
         super().return_(return_expr)
         return self
 
-    def _serialize_vars(self):
-        return jsonable_encoder(self.bind_vars, by_alias=True, custom_encoder={BaseArangoModel: save_dict})
+    @staticmethod
+    def _encode_vars(bind_vars):
+        return _encode_bind_vars(bind_vars, custom_encoder={BaseArangoModel: save_dict})
 
     def traverse(
         self,
@@ -1,4 +1,4 @@
-from .expressions import IteratorExpression, VariableExpression
+from .expressions import IteratorExpression, Param, VariableExpression
 from .operations import SortDirection, TraversalDirection, TraversalOperation
 from .options import (
     CollectMethod,
@@ -9,10 +9,12 @@ from .options import (
     UpdateOptions,
     UpsertOptions,
 )
-from .query import AQLQuery
+from .query import AQLQuery, PreparedQuery
 
 __all__ = [
     "AQLQuery",
+    "PreparedQuery",
+    "Param",
     "VariableExpression",
     "RemoveOptions",
     "ReplaceOptions",
@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from pydango.query.query import AQLQuery, PreparedQuery
+
+QueryBuilder = Callable[..., AQLQuery]
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class TemplateCache:
+    """
+    process-wide LRU cache of the templates prepared from the same query shape.
+
+    a shape is a query builder along with the structural arguments it is called with, everything else that varies
+    between the queries has to be a `Param` placeholder of the built query. keying on the builder rather than on a
+    fingerprint of the built tree spares the walk of the tree, which costs about as much as compiling it.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("maxsize should be a positive integer")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._templates: OrderedDict[tuple[Hashable, ...], PreparedQuery] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def prepare(self, build: QueryBuilder, *shape: Hashable, **values: Any) -> PreparedQuery:
+        """
+        binds `values` to the template of `build(*shape)`, the query is only built and compiled on a miss.
+        """
+        key = (build, *shape)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+        if template is None:
+            # built outside the lock, two threads missing the same shape both compile it
+            template = build(*shape).prepare()
+            with self._lock:
+                self.misses += 1
+                self._templates[key] = template
+                if len(self._templates) > self.maxsize:
+                    self._templates.popitem(last=False)
+        return template.bind(**values)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._templates))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+template_cache = TemplateCache()
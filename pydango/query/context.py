@@ -0,0 +1,185 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+T = TypeVar("T")
+
+_current: ContextVar[Optional["CompileContext"]] = ContextVar("pydango_compile_context", default=None)
+
+
+_CONTAINERS = {dict, list, tuple}
+
+# distinct values sharing a digest are only compared against the first ones, a lookup stays O(1) when many of them
+# are bound, like the vertices and edges of a large graph
+_MAX_CANDIDATES = 8
+
+
+def _strict_equal(left: Any, right: Any) -> bool:
+    """
+    Compares the types of the nested values of two equal values, `[1]` and `[True]` are bound as different json
+    values.
+    """
+    if type(left) is not type(right):
+        return False
+    stack = [(left, right)]
+    while stack:
+        left, right = stack.pop()
+        if isinstance(left, dict):
+            left, right = list(left.values()), list(map(right.__getitem__, left))
+        if list(map(type, left)) != list(map(type, right)):
+            return False
+        for i, j in zip(left, right):
+            if i is not j and type(i) in _CONTAINERS:
+                stack.append((i, j))
+    return True
+
+
+class ParameterTable(Generic[T]):
+    """
+    Deduplication table of bound values.
+
+    hashable scalars are looked up by type and value, containers by identity and then by a cheap digest (type and
+    length) whose first candidates are confirmed with a type strict equality check, large payloads are never
+    stringified nor hashed.
+    `structural=False` disables the digest lookup, equal but distinct unhashable values are then bound separately.
+    """
+
+    def __init__(self, structural: bool = True) -> None:
+        self.structural = structural
+        self._values: dict[Any, T] = {}
+        self._identities: dict[int, tuple[Any, T]] = {}
+        self._digests: dict[tuple[type, int], list[tuple[Any, T]]] = {}
+
+    def get(self, value: Any) -> Optional[T]:
+        if not isinstance(value, tuple):
+            try:
+                return self._values.get((type(value), value))
+            except TypeError:
+                pass
+        identity = self._identities.get(id(value))
+        if identity is not None:
+            return identity[1]
+        if self.structural:
+            for candidate, item in self._digests.get(self._digest(value), ()):
+                if candidate == value and _strict_equal(candidate, value):
+                    return item
+        return None
+
+    def add(self, value: Any, item: T) -> None:
+        if not isinstance(value, tuple):
+            try:
+                self._values[(type(value), value)] = item
+                return
+            except TypeError:
+                pass
+        # the value is kept alive so its id can not be reused while the table is in use
+        self._identities[id(value)] = (value, item)
+        if self.structural:
+            candidates = self._digests.setdefault(self._digest(value), [])
+            if len(candidates) < _MAX_CANDIDATES:
+                candidates.append((value, item))
+
+    @staticmethod
+    def _digest(value: Any) -> tuple[type, int]:
+        try:
+            return type(value), len(value)
+        except TypeError:
+            return type(value), -1
+
+
+@dataclass
+class CompileStats:
+    """
+    `nodes_visited` counts the compiled operations and memoized expressions, leaves are accounted for by the number
+    of bound variables and parameters.
+    """
+
+    nodes_visited: int = 0
+    variables_bound: int = 0
+    params_bound: int = 0
+    memo_hits: int = 0
+    elapsed: float = 0.0
+
+
+class CompileContext:
+    """
+    State of a single compilation of a root query.
+
+    allocates variable and parameter names, memoizes compiled nodes and collects statistics, subqueries compiled while
+    the context is active share it with the root query.
+    """
+
+    def __init__(self, deduplicate: bool = True, deterministic: bool = False) -> None:
+        self.deterministic = deterministic
+        self.bind_vars: dict[str, Any] = {}
+        self.parameters: ParameterTable[str] = ParameterTable(structural=deduplicate)
+        self.placeholders: set[str] = set()
+        self.stats = CompileStats()
+        # an insert, update, replace, upsert or remove was compiled, in the root query or in one of its subqueries
+        self.modification = False
+        self._memo: dict[int, tuple[Any, str]] = {}
+        self._param_counter = 0
+
+    def __enter__(self) -> "CompileContext":
+        self._token = _current.set(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stats.elapsed += time.perf_counter() - self._started
+        _current.reset(self._token)
+
+    def bind_variable(self) -> str:
+        self.stats.variables_bound += 1
+        return f"var{self.stats.variables_bound}"
+
+    def bind_parameter(self, value: Any, override_var_name: Optional[str] = None) -> str:
+        # in deterministic mode every occurrence is bound on its own, equal values would otherwise change the text
+        var = None if self.deterministic else self.parameters.get(value)
+        if var is None:
+            if override_var_name is None:
+                self._param_counter += 1
+                var = f"@param{self._param_counter}"
+            else:
+                var = override_var_name
+            self.bind_vars[var[1:]] = value
+            self.parameters.add(value, var)
+            self.stats.params_bound += 1
+        return var
+
+    def bind_placeholder(self, name: str) -> str:
+        self.placeholders.add(name)
+        return f"@{name}"
+
+    def memoize(self, node: Any, compile_func: Callable[[Any, Any], str], query_ref: Any) -> str:
+        memo = self._memo.get(id(node))
+        if memo is not None:
+            self.stats.memo_hits += 1
+            return memo[1]
+        self.stats.nodes_visited += 1
+        compiled = compile_func(node, query_ref)
+        # the node is kept alive so its id can not be reused during this compilation
+        self._memo[id(node)] = (node, compiled)
+        return compiled
+
+
+def current_context() -> Optional[CompileContext]:
+    return _current.get()
+
+
+def memoized(compile_func: F) -> F:
+    """
+    Memoizes the compiled node for the lifetime of the active compilation.
+    """
+
+    @wraps(compile_func)
+    def compile(self, query_ref):
+        context = _current.get()
+        if context is None:
+            return compile_func(self, query_ref)
+        return context.memoize(self, compile_func, query_ref)
+
+    return compile  # type: ignore[return-value]
@@ -1,12 +1,22 @@
-import datetime
+import json
 import sys
 from abc import ABC, abstractmethod
-from copy import deepcopy
 from enum import Enum
-from functools import lru_cache
-from typing import Any, Mapping, Optional, Sequence, Type, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+    cast,
+)
 
 from pydango.query.consts import DYNAMIC_ALIAS
+from pydango.query.context import memoized
 
 if sys.version_info >= (3, 10):
     from typing import TypeAlias
@@ -50,6 +60,24 @@ class LiteralExpression(BindableExpression):
         return "?"
 
 
+class Param(BindableExpression):
+    """
+    named placeholder, its value is provided when binding the prepared query
+    """
+
+    def __init__(self, name: str) -> None:
+        if not name.isidentifier():
+            raise ValueError(f"invalid parameter name: {name!r}")
+        super().__init__(None)
+        self.name = name
+
+    def compile(self, query_ref: "QueryExpression") -> str:
+        return query_ref.bind_placeholder(self)
+
+    def __repr__(self):
+        return f"@{self.name}"
+
+
 class VariableExpression(Expression, ReturnableExpression):
     def __init__(self, var_name: Optional[str] = None):
         self.var_name = var_name
@@ -235,6 +263,12 @@ class QueryExpression(Expression, ABC):
     @abstractmethod
     def bind_parameter(self, parameter: "BindableExpression", override_var_name: Optional[str] = None) -> str: ...
 
+    @abstractmethod
+    def bind_placeholder(self, parameter: "Param") -> str: ...
+
+    @abstractmethod
+    def bind_literal(self, value: Any, inline: Callable[[Any], str] = json.dumps) -> str: ...
+
 
 class RangeExpression(IterableExpression):
     def __init__(self, start, end):
@@ -246,11 +280,11 @@ class RangeExpression(IterableExpression):
         if isinstance(self.start, Expression):
             start = self.start.compile(query_ref)
         else:
-            start = self.start
+            start = query_ref.bind_literal(self.start, str)
         if isinstance(self.end, Expression):
             end = self.end.compile(query_ref)
         else:
-            end = self.end
+            end = query_ref.bind_literal(self.end, str)
 
         return f"{start}..{end}"
 
@@ -300,7 +334,7 @@ class BinaryExpression(Expression, ReturnableExpression):
         self.op = op
         self.right = right
 
-    @lru_cache(maxsize=1)
+    @memoized
     def compile(self, query_ref: "QueryExpression") -> str:
         left_compile = self.left.compile(query_ref)
         right_compile = self.right.compile(query_ref)
@@ -337,33 +371,83 @@ class ConditionExpression(BinaryExpression, LogicalExpression):
 
 class BinaryLogicalExpression(ConditionExpression):
     """
-    Expression class for binary logical operations
+    Expression class for n-ary logical operations
     valid operators &&, AND, ||, OR
+
+    operands with the same operator are flattened on construction, `a & b & c` is a single node with three operands.
     """
 
-    @lru_cache(maxsize=1)
+    def __init__(self, op: str, *operands: Expression) -> None:
+        if not operands:
+            raise ValueError("logical expression requires at least one operand")
+        self.op = op
+        self.operands = self._flatten(operands)
+
+    def _flatten(self, operands: Iterable[Expression]) -> list[Expression]:
+        flat: list[Expression] = []
+        for operand in operands:
+            if isinstance(operand, BinaryLogicalExpression) and operand.op == self.op:
+                flat.extend(operand.operands)
+            else:
+                flat.append(operand)
+        return flat
+
+    @property
+    def left(self) -> Expression:
+        return self.operands[0]
+
+    @left.setter
+    def left(self, value: Expression) -> None:
+        self.operands = self._flatten([value, *self.operands[1:]])
+
+    @property
+    def right(self) -> Expression:
+        if len(self.operands) == 2:
+            return self.operands[1]
+        return BinaryLogicalExpression(self.op, *self.operands[1:])
+
+    @right.setter
+    def right(self, value: Expression) -> None:
+        self.operands = self._flatten([self.operands[0], value])
+
+    @memoized
     def compile(self, query_ref: "QueryExpression") -> str:
-        return f"({self.left.compile(query_ref)} {self.op} {self.right.compile(query_ref)})"
+        # nested logical nodes are compiled with an explicit stack, large filters do not hit the recursion limit
+        stack: list[tuple[BinaryLogicalExpression, Iterator[Expression], list[str]]] = [(self, iter(self.operands), [])]
+        while True:
+            node, operands, compiled = stack[-1]
+            for operand in operands:
+                if isinstance(operand, BinaryLogicalExpression):
+                    stack.append((operand, iter(operand.operands), []))
+                    break
+                compiled.append(operand.compile(query_ref))
+            else:
+                stack.pop()
+                result = f"({f' {node.op} '.join(compiled)})"
+                if not stack:
+                    return result
+                stack[-1][2].append(result)
+
+    def __repr__(self):
+        return f" {self.op} ".join(str(operand) for operand in self.operands)
 
 
 class AndExpression(BinaryLogicalExpression):
     """
-    Expression class for binary logical operations
-    valid operators &&, AND, ||, OR
+    Expression class for logical conjunction
     """
 
-    def __init__(self, left: Expression, right: Expression):
-        super().__init__("&&", left, right)
+    def __init__(self, *operands: Expression):
+        super().__init__("&&", *operands)
 
 
 class OrExpression(BinaryLogicalExpression):
     """
-    Expression class for binary logical operations
-    valid operators &&, AND, ||, OR
+    Expression class for logical disjunction
     """
 
-    def __init__(self, left: Expression, right: Expression):
-        super().__init__("||", left, right)
+    def __init__(self, *operands: Expression):
+        super().__init__("||", *operands)
 
 
 class In(ConditionExpression):
@@ -473,32 +557,27 @@ class ListExpression(
     IterableExpression,
 ):
     def __init__(self, value: ListValues, iterator: Optional[Union[IteratorExpression, str]] = None, brackets=True):
-        if isinstance(value, list):
-            value = tuple(value)
-
         super().__init__(value)
         super(BindableExpression, self).__init__(iterator)
         self._copy: list[Expression] = []
-        self._need_compile = False
         self._brackets = brackets
+        # a literal only array, at any depth, is bound as a single parameter
+        self._need_compile = not _is_literal(value)
+        if not self._need_compile:
+            return
+
+        self.value = tuple(value)
         for i in self.value:
             if isinstance(i, QueryExpression):
                 self._copy.append(SubQueryExpression(i))
-                self._need_compile = True
-            elif isinstance(i, (VariableExpression, FieldExpression)):
+            elif isinstance(i, Expression) or hasattr(type(i), "compile"):
                 self._copy.append(i)
-                self._need_compile = True
-            elif isinstance(i, Expression):
-                self._copy.append(i)
-            elif isinstance(i, list):  # todo review this
-                self._copy.append(ListExpression(i))
-                self._need_compile = True
+            elif not isinstance(i, (dict, list, tuple)) or _is_literal(i):
+                self._copy.append(LiteralExpression(i))
             elif isinstance(i, dict):
-                expression = ObjectExpression(i)
-                self._copy.append(expression)
-                self._need_compile = not expression.__all_literals__ or self._need_compile
+                self._copy.append(ObjectExpression(i))
             else:
-                self._copy.append(LiteralExpression(i))
+                self._copy.append(ListExpression(i))
 
     def compile(self, query_ref: "QueryExpression", **kwargs) -> str:
         if self._need_compile:
@@ -536,35 +615,71 @@ ObjectParams: TypeAlias = Mapping[
 ]
 
 
+_SCALARS = {str, int, float, bool, type(None)}
+
+
+def _is_literal(value: Any) -> bool:
+    """
+    Returns whether the value holds no expression at any depth, such a value can be bound as a single parameter.
+    """
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if type(value) in _SCALARS:
+            continue
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, Expression) or hasattr(type(value), "compile"):
+            return False
+    return True
+
+
 class ObjectExpression(BindableExpression, ReturnableExpression):
-    def __init__(self, value: ObjectParams, parent: Optional[Union[VariableExpression, CollectionExpression]] = None):
+    """
+    literal only objects, at any depth, are bound as a single parameter, `inline=True` compiles them field by field,
+    as required by the search expression of an `UPSERT`.
+    """
+
+    def __init__(
+        self,
+        value: ObjectParams,
+        parent: Optional[Union[VariableExpression, CollectionExpression]] = None,
+        inline: bool = False,
+    ):
         super().__init__(value)
         self.parent = parent
+        self.inline = inline
         self._bind = {}
-        self.__all_literals__ = True
-        if isinstance(value, dict):
-            self.value = deepcopy(value)
-            for field, mapped_field in self.value.items():
-                if isinstance(mapped_field, list):
-                    self.value[field] = ListExpression(mapped_field)
-                    self.__all_literals__ = self.__all_literals__ or not self.value[field]._need_compile
-                elif isinstance(mapped_field, dict):
-                    self.value[field] = ObjectExpression(mapped_field, self.parent)
-                    self.__all_literals__ = self.__all_literals__ or self.value[field].__all_literals__
-                elif isinstance(mapped_field, QueryExpression):
+        self.__all_literals__ = isinstance(value, dict) and _is_literal(value)
+        if isinstance(value, dict) and not (self.__all_literals__ and not inline):
+            # the given dict is never copied nor mutated, literal only branches are bound as they are
+            self.value = {}
+            for field, mapped_field in value.items():
+                if isinstance(mapped_field, QueryExpression):
                     subquery = SubQueryExpression(mapped_field)
                     self.value[field] = subquery
                     self._bind[mapped_field] = subquery
-                    self.__all_literals__ = False
-                elif isinstance(mapped_field, (VariableExpression, FieldExpression)):
-                    self.__all_literals__ = False
-                elif (
-                    isinstance(mapped_field, (int, float, str, bool, datetime.datetime, datetime.date))
-                    or mapped_field is None
-                ):
+                elif isinstance(mapped_field, Expression) or hasattr(type(mapped_field), "compile"):
+                    self.value[field] = mapped_field
+                elif isinstance(mapped_field, (dict, list, tuple)) and not _is_literal(mapped_field):
+                    if isinstance(mapped_field, dict):
+                        self.value[field] = ObjectExpression(mapped_field, self.parent)
+                    else:
+                        self.value[field] = ListExpression(mapped_field)
+                else:
                     self.value[field] = LiteralExpression(mapped_field)
 
+    @property
+    def _bound(self) -> bool:
+        return self.__all_literals__ and not self.inline
+
     def compile(self, query_ref: "QueryExpression") -> str:
+        if self._bound:
+            return super().compile(query_ref)
+
         for bind in self._bind.values():
             bind.query.parent = query_ref
 
@@ -579,6 +694,8 @@ class ObjectExpression(BindableExpression, ReturnableExpression):
         return f"{{{', '.join(pairs)}}}"
 
     def __repr__(self):
+        if self._bound:
+            return "?"
         pairs = []
         # if isinstance(self.value, list):
         #     for field in self.value:
@@ -1,4 +1,3 @@
-import json
 from abc import ABC
 from typing import TYPE_CHECKING, Optional, Union
 
@@ -38,7 +37,7 @@ class BaseFunctionExpression(Expression):
             if isinstance(arg, Expression):
                 value = arg.compile(query_ref)
             elif isinstance(arg, (int, float, str, bool)):
-                value = json.dumps(arg)
+                value = query_ref.bind_literal(arg)
             else:
                 value = arg
             arguments.append(value)
@@ -63,7 +62,7 @@ class FunctionExpression(BaseFunctionExpression, ReturnableExpression):
 class Document(FunctionExpression):
     name = "DOCUMENT"
 
-    def __init__(self, _id: str):
+    def __init__(self, _id: Union[str, list[str], Expression]):
         super().__init__(_id)
 
 
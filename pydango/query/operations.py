@@ -13,6 +13,7 @@ from typing import (
 )
 
 from pydango.query.consts import KEY
+from pydango.query.context import current_context
 from pydango.query.expressions import (
     AssignmentExpression,
     CollectionExpression,
@@ -61,6 +62,12 @@ class Operation(Compilable):
         raise NotImplementedError
 
 
+def _modifies() -> None:
+    context = current_context()
+    if context is not None:
+        context.modification = True
+
+
 ForParams = Union[str, IteratorExpression, IterableExpression, "AQLQuery"]
 
 MANUAL_TYPES = (str, IteratorExpression)
@@ -143,15 +150,15 @@ class ForOperation(Operation):
     def compile(self) -> str:
         compiled = f"FOR {self.variable.compile(self.query_ref)} IN {self.in_.compile(self.query_ref)}"
         if self.options:
-            options_compile = self.options.compile()
-            compiled += options_compile and f"OPTIONS {options_compile}"
+            options_compile = self.options.compile(self.query_ref)
+            compiled += options_compile and f" OPTIONS {options_compile}"
         return compiled
 
     def __repr__(self):
         _repr = f"FOR {self.variable} IN {self.in_}"
         if self.options:
             options_compile = self.options.compile()
-            _repr += options_compile and f"OPTIONS {options_compile}"
+            _repr += options_compile and f" OPTIONS {options_compile}"
         return _repr
 
 
@@ -352,10 +359,13 @@ class LimitOperation(Operation):
         self.limit = limit
 
     def compile(self, *args, **kwargs):
-        if self.offset:
-            return f"LIMIT {self.offset},{self.limit}"
+        # an offset of 0 keeps the shape of the query, deterministic queries with any offset compile the same
+        if self.offset is not None:
+            return (
+                f"LIMIT {self.query_ref.bind_literal(self.offset, str)},{self.query_ref.bind_literal(self.limit, str)}"
+            )
         else:
-            return f"LIMIT {self.limit}"
+            return f"LIMIT {self.query_ref.bind_literal(self.limit, str)}"
 
     def __repr__(self):
         return f"LIMIT {self.limit}"
@@ -377,6 +387,7 @@ class InsertOperation(Operation):
         self.doc = doc
 
     def compile(self, *args, **kwargs):
+        _modifies()
         return f"INSERT {self.doc.compile(self.query_ref)} INTO {self.collection.compile(self.query_ref)}"
 
     def __repr__(self):
@@ -408,17 +419,18 @@ class RemoveOperation(Operation):
         self.collection = collection
 
     def compile(self, *args, **kwargs):
+        _modifies()
         compiled = f"REMOVE {self.expression.compile(self.query_ref)} IN {self.collection.compile(self.query_ref)}"
         if self.options:
-            options_compile = self.options.compile()
-            compiled += options_compile and f"OPTIONS {options_compile}"
+            options_compile = self.options.compile(self.query_ref)
+            compiled += options_compile and f" OPTIONS {options_compile}"
         return compiled
 
     def __repr__(self):
         _repr = f"REMOVE {repr(self.expression)} IN {repr(self.collection)}"
         if self.options:
             options_compile = self.options.compile()
-            _repr += options_compile and f"OPTIONS {options_compile}"
+            _repr += options_compile and f" OPTIONS {options_compile}"
         return _repr
 
 
@@ -447,17 +459,18 @@ class BaseChangeOperation(Operation, ABC):
         self.collection = collection
 
     def compile(self, *args, **kwargs):
+        _modifies()
         compiled = f"{self._keyword} {self.obj.compile(self.query_ref)} IN {self.collection.compile(self.query_ref)}"
         if self.options:
-            options_compile = self.options.compile()
-            compiled += options_compile and f"OPTIONS {options_compile}"
+            options_compile = self.options.compile(self.query_ref)
+            compiled += options_compile and f" OPTIONS {options_compile}"
         return compiled
 
     def __repr__(self):
         _repr = f"{self._keyword} {repr(self.obj)} IN {repr(self.collection)}"
         if self.options:
             options_compile = self.options.compile()
-            _repr += options_compile and f"OPTIONS {options_compile}"
+            _repr += options_compile and f" OPTIONS {options_compile}"
         return _repr
 
 
@@ -544,8 +557,11 @@ class UpsertOperation(Operation):
         if isinstance(collection, str):
             collection = CollectionExpression(collection)
 
+        # the search expression must be an object literal, it is never bound as a single parameter
+        if isinstance(filter_, ObjectExpression) and filter_._bound:
+            filter_ = filter_.value
         if isinstance(filter_, dict):
-            filter_ = ObjectExpression(filter_)
+            filter_ = ObjectExpression(filter_, inline=True)
 
         self.replace = replace
         self.filter = filter_
@@ -554,6 +570,7 @@ class UpsertOperation(Operation):
         self.insert = insert
 
     def compile(self, *args, **kwargs):
+        _modifies()
         if self.update:
             modification = f"UPDATE {self.update.compile(self.query_ref)}"
         else:
@@ -563,8 +580,8 @@ class UpsertOperation(Operation):
             f"{modification} IN {self.collection.compile(self.query_ref)}"
         )
         if self.options:
-            options_compile = self.options.compile()
-            compiled += options_compile and f"OPTIONS {options_compile}"
+            options_compile = self.options.compile(self.query_ref)
+            compiled += options_compile and f" OPTIONS {options_compile}"
         return compiled
 
     def __repr__(self):
@@ -576,7 +593,7 @@ class UpsertOperation(Operation):
 
         if self.options:
             options_compile = self.options.compile()
-            _repr += options_compile and f"OPTIONS {options_compile}"
+            _repr += options_compile and f" OPTIONS {options_compile}"
         return _repr
 
 
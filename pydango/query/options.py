@@ -2,21 +2,25 @@ import json
 from abc import ABC
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 from pydango.query.utils import Compilable
 
+if TYPE_CHECKING:
+    from pydango.query.expressions import QueryExpression
+
 
 class Options(Compilable):
     _map: dict = {}
 
-    def compile(self):
+    def compile(self, query_ref: Optional["QueryExpression"] = None):
         pairs = []
 
         for field, value in self._map.items():
             if value is None:
                 continue
-            pairs.append(f"{field}: {json.dumps(value)}")
+            compiled = json.dumps(value) if query_ref is None else query_ref.bind_literal(value)
+            pairs.append(f"{field}: {compiled}")
         if pairs:
             return f"{{{', '.join(pairs)}}}"
 
@@ -1,9 +1,27 @@
+import json
 import logging
 import sys
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union, overload
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+    overload,
+)
 
 from pydango.orm.encoders import jsonable_encoder
+from pydango.query.context import (
+    CompileContext,
+    CompileStats,
+    ParameterTable,
+    current_context,
+)
 from pydango.query.expressions import (
     In,
     QueryExpression,
@@ -39,6 +57,7 @@ if TYPE_CHECKING:
         IteratorExpression,
         LiteralExpression,
         ObjectExpression,
+        Param,
         RangeExpression,
         ReturnableExpression,
         VariableExpression,
@@ -74,14 +93,83 @@ TraverseIterators: TypeAlias = Union[
 ]
 
 
+_JSON_SCALARS = {str, int, float, bool, type(None)}
+
+
+def _is_json(value: Any) -> bool:
+    """
+    Returns whether the value is made of plain dicts, lists and json scalars only, `jsonable_encoder` would return an
+    equal copy of it.
+    """
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type in _JSON_SCALARS:
+            continue
+        if value_type is list:
+            stack.extend(value)
+        elif value_type is dict:
+            for key in value:
+                # `_sa` keys are dropped by the encoder
+                if not isinstance(key, str) or key.startswith("_sa"):
+                    return False
+            stack.extend(value.values())
+        else:
+            return False
+    return True
+
+
+def _encode_bind_vars(bind_vars: dict[str, Any], **options: Any) -> JsonType:
+    """
+    Encodes the bound values with `jsonable_encoder`, json values like the documents of save dicts are bound as they
+    are, a large document is not copied.
+    """
+    return {
+        name: value if _is_json(value) else jsonable_encoder(value, by_alias=True, **options)
+        for name, value in bind_vars.items()
+    }
+
+
 @dataclass
 class PreparedQuery:
     query: str
     bind_vars: JsonType
+    params: frozenset[str] = frozenset()
+    encoder: Callable[[dict[str, Any]], JsonType] = field(default=_encode_bind_vars, repr=False, compare=False)
+    # compiled without inlined literals, the text is shared by every query of the same shape
+    deterministic: bool = False
+    # inserts, updates, replaces, upserts or removes documents, in the query itself or in a subquery
+    modification: bool = False
+
+    def bind(self, **values: Any) -> "PreparedQuery":
+        """
+        Returns a new prepared query with the placeholders bound to `values`, the statement itself is left untouched.
+        """
+        missing = self.params.difference(values)
+        if missing:
+            raise ValueError(f"missing values for parameters: {', '.join(sorted(missing))}")
+        unexpected = values.keys() - self.params
+        if unexpected:
+            raise ValueError(f"unexpected parameters: {', '.join(sorted(unexpected))}")
+
+        bind_vars = dict(cast(dict, self.bind_vars))
+        bind_vars.update(cast(dict, self.encoder(values)))
+        return PreparedQuery(
+            self.query,
+            bind_vars,
+            encoder=self.encoder,
+            deterministic=self.deterministic,
+            modification=self.modification,
+        )
 
 
 class AQLQuery(QueryExpression):
     sep = " "
+    # equal but distinct lists and dicts are bound once, set to False to skip the equality checks on large payloads
+    deduplicate_parameters = True
+    # never inline literal values and bind every value on its own, queries of the same shape compile to the same text
+    deterministic = False
 
     def __init__(self, parent: Optional["AQLQuery"] = None):
         super().__init__()
@@ -89,9 +177,11 @@ class AQLQuery(QueryExpression):
         self.bind_vars: dict[str, Union[bool, str, int, float, dict, list]] = {}
         self.__dynamic_vars__: list[VariableExpression] = []
         self.__used_vars__: set[str] = set()
-        self._parameters: dict[Any, str] = {}
-        self._var_counter = 0
-        self._param_counter = 0
+        self._parameters: ParameterTable[str] = ParameterTable()
+        self._placeholders: set[str] = set()
+        self.compile_stats: Optional[CompileStats] = None
+        # set by the compilation, unlike `__is_modification_query__` it also accounts for the subqueries
+        self._modification = False
         self.parent: Optional[AQLQuery] = parent
         self._ops: list["Operation"] = []
         self._compiled = ""
@@ -111,18 +201,6 @@ class AQLQuery(QueryExpression):
             aql.append(repr(i))
         return self.sep.join(aql)
 
-    def _get_var_name(self):
-        if self.parent:
-            return self.parent._get_var_name()
-        self._var_counter += 1
-        return f"var{self._var_counter}"
-
-    def _get_param_var(self):
-        if self.parent:
-            return self.parent._get_param_var()
-        self._param_counter += 1
-        return f"@param{self._param_counter}"
-
     def for_(
         self,
         collection_or_variable: "ForParams",
@@ -197,43 +275,54 @@ class AQLQuery(QueryExpression):
     def compile(self, *args, **kwargs) -> str:
         if self._compiled:
             return self._compiled
-        aql = []
 
+        if current_context() is not None:
+            # a subquery, compiled as part of the outer query
+            self._compiled = self._compile_ops()
+            return self._compiled
+
+        with CompileContext(self.deduplicate_parameters, self.deterministic) as context:
+            self._compiled = self._compile_ops()
+
+        self.bind_vars = context.bind_vars
+        self._parameters = context.parameters
+        self._placeholders = context.placeholders
+        self.compile_stats = context.stats
+        self._modification = context.modification
+        return self._compiled
+
+    def _compile_ops(self) -> str:
+        self._context().stats.nodes_visited += len(self._ops)
+        aql = []
         for i in self._ops:
             aql.append(i.compile())
+        return self.sep.join(aql)
 
-        self._compiled = self.sep.join(aql)
-        return self._compiled
+    @staticmethod
+    def _context() -> CompileContext:
+        context = current_context()
+        if context is None:
+            raise RuntimeError("variables and parameters can only be bound while a query is compiled")
+        return context
 
     def bind_variable(self) -> str:
-        return self._get_var_name()
+        return self._context().bind_variable()
 
     def bind_parameter(self, parameter: "BindableExpression", override_var_name: Optional[str] = None) -> str:
-        if self.parent:
-            return self.parent.bind_parameter(parameter)
-        is_hashable = False
-        try:
-            hash(parameter.value)
-            is_hashable = True
-            if parameter.value in self._parameters or parameter.value in self.bind_vars.keys():
-                return self._parameters[parameter.value]
-        except TypeError:
-            if str(parameter.value) in self._parameters:
-                return self._parameters[str(parameter.value)]
-
-        var = override_var_name or self._get_param_var()
-
-        self.bind_vars[var[1:]] = parameter.value
-
-        if is_hashable:
-            self._parameters[parameter.value] = var
-        else:
-            self._parameters[str(parameter.value)] = var
-
-        return var
-
-    def limit(self, limit) -> Self:
-        self._ops.append(LimitOperation(limit, self))  # type: ignore[arg-type]
+        return self._context().bind_parameter(parameter.value, override_var_name)
+
+    def bind_literal(self, value: Any, inline: Callable[[Any], str] = json.dumps) -> str:
+        """
+        renders a value of the query structure (function arguments, ranges, limits and options), inlined unless the
+        query is deterministic.
+        """
+        context = self._context()
+        if context.deterministic:
+            return context.bind_parameter(value)
+        return inline(value)
+
+    def limit(self, limit, offset=None) -> Self:
+        self._ops.append(LimitOperation(limit, self, offset))  # type: ignore[arg-type]
         return self
 
     def insert(
@@ -394,8 +483,24 @@ class AQLQuery(QueryExpression):
         )
         return self
 
+    _encode_vars = staticmethod(_encode_bind_vars)
+
     def _serialize_vars(self):
-        return jsonable_encoder(self.bind_vars, by_alias=True)
+        return self._encode_vars(self.bind_vars)
+
+    def bind_placeholder(self, parameter: "Param") -> str:
+        return self._context().bind_placeholder(parameter.name)
 
     def prepare(self) -> PreparedQuery:
-        return PreparedQuery(self.compile(), self._serialize_vars())
+        compiled = self.compile()
+        conflicts = self._placeholders.intersection(self.bind_vars)
+        if conflicts:
+            raise ValueError(f"parameter names conflict with generated bind variables: {', '.join(sorted(conflicts))}")
+        return PreparedQuery(
+            compiled,
+            self._serialize_vars(),
+            frozenset(self._placeholders),
+            self._encode_vars,
+            self.deterministic,
+            self._modification,
+        )
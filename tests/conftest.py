@@ -1,13 +1,15 @@
 import asyncio
 import logging
 import sys
-from typing import AsyncGenerator, TypeVar
+from typing import Any, AsyncGenerator, TypeVar
 
 import pytest
 from aioarango import ArangoClient
 from aioarango.database import StandardDatabase
 
+from pydango.connection.session import PydangoSession
 from pydango.connection.utils import get_or_create_db
+from tests.stand_in import StandInServer, stand_in_session
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -85,3 +87,22 @@ async def database(client: ArangoClient) -> AsyncFixture[StandardDatabase]:
     db = await get_or_create_db(client, "pydango")
     yield db
     # await (await client.db("_system")).delete_database("pydango")
+
+
+@pytest.fixture
+def server() -> StandInServer:
+    return StandInServer()
+
+
+@pytest.fixture
+def session_options() -> dict[str, Any]:
+    """
+    keyword arguments of the stand-in `session`, modules override it for their sessions.
+    """
+    return {}
+
+
+@pytest.fixture
+async def session(server: StandInServer, session_options: dict[str, Any]) -> AsyncFixture[PydangoSession]:
+    async with stand_in_session(server, **session_options) as session:
+        yield session
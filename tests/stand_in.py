@@ -0,0 +1,200 @@
+import asyncio
+import inspect
+import itertools
+import json
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, NamedTuple, Optional
+
+import httpx
+from aioarango import ArangoClient
+from aioarango.http import DefaultHTTPClient
+
+from pydango.connection.session import PydangoSession
+
+Handler = Callable[[str, Any], Any]
+Document = dict[str, Any]
+Lookup = Callable[[str], Optional[Document]]
+
+# the queries are recognized by their structure, not by the names of their variables and parameters
+_LOOKUP = re.compile(r"LET (\w+) = DOCUMENT\(@(\w+)\)")
+_BULK_WRITE = re.compile(r"FOR \w+ IN @(\w+) (?:UPSERT|UPDATE|REPLACE|INSERT) .* IN `([^`]+)`")
+
+
+class RecordedRequest(NamedTuple):
+    method: str
+    path: str
+    body: Any
+    transaction_id: Optional[str]
+
+
+class StandInServer(DefaultHTTPClient):
+    """
+    local stand-in for the responses of an ArangoDB server, the requests are recorded and answered by the handler
+    registered for their path, handlers may be coroutine functions.
+
+    between `hold` and `release` the arriving requests are recorded and counted in flight but not answered, tests
+    synchronize on them with `wait_for` rather than on timings.
+    """
+
+    def __init__(self) -> None:
+        self.recorded: list[RecordedRequest] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._handlers: dict[str, Handler] = {}
+        self._gate: Optional["asyncio.Future[None]"] = None
+        self._waiters: list[tuple[int, "asyncio.Future[None]"]] = []
+
+    @property
+    def requests(self) -> list[tuple[str, Any]]:
+        return [(request.path, request.body) for request in self.recorded]
+
+    @property
+    def transaction_ids(self) -> list[Optional[str]]:
+        return [request.transaction_id for request in self.recorded]
+
+    def methods(self, path: str) -> list[str]:
+        return [request.method for request in self.recorded if request.path == path]
+
+    def route(self, path: str, handler: Handler) -> None:
+        self._handlers[path] = handler
+
+    def hold(self) -> None:
+        if self._gate is None:
+            self._gate = asyncio.get_running_loop().create_future()
+
+    def release(self) -> None:
+        if self._gate is not None:
+            self._gate.set_result(None)
+            self._gate = None
+
+    async def wait_for(self, count: int) -> None:
+        """
+        waits until `count` requests arrived since the server was created.
+        """
+        if len(self.recorded) < count:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append((count, waiter))
+            await waiter
+
+    def create_session(self, host: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self._handle))
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        path = "/" + request.url.path.split("/_db/", 1)[-1].split("/", 1)[-1]
+        body = json.loads(request.content) if request.content else None
+        self.recorded.append(RecordedRequest(request.method, path, body, request.headers.get("x-arango-trx-id")))
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        for count, waiter in list(self._waiters):
+            if len(self.recorded) >= count:
+                self._waiters.remove((count, waiter))
+                waiter.set_result(None)
+        try:
+            if self._gate is not None:
+                await asyncio.shield(self._gate)
+            return await self._respond(request.method, path, body)
+        finally:
+            self.in_flight -= 1
+
+    async def _respond(self, method: str, path: str, body: Any) -> httpx.Response:
+        handler: Optional[Handler] = self._handlers.get(path)
+        if handler is None:
+            return httpx.Response(404, json={"error": True, "errorNum": 404, "errorMessage": "not found"})
+        result = handler(method, body)
+        if inspect.isawaitable(result):
+            result = await result
+        if isinstance(result, httpx.Response):
+            return result
+        return httpx.Response(200, json=result)
+
+
+@asynccontextmanager
+async def stand_in_session(
+    server: StandInServer, database: str = "pydango", **kwargs: Any
+) -> AsyncIterator[PydangoSession]:
+    client = ArangoClient("http://stand-in:8529", http_client=server)
+    try:
+        yield PydangoSession(database=await client.db(database), **kwargs)
+    finally:
+        await client.close()
+
+
+def echo(method: str, body: Any) -> Any:
+    """
+    cursor handler answering a query over a single bound list, like `FOR i IN @values RETURN i`, with its items.
+    """
+    [values] = body["bindVars"].values()
+    return {"result": values, "hasMore": False}
+
+
+def user(key: str, rev: str = "1", **fields: Any) -> Document:
+    """
+    a stored document of `tests.test_orm_query.User`.
+    """
+    return {"_id": f"users/{key}", "_key": key, "_rev": rev, "name": f"user {key}", "age": 30, **fields}
+
+
+def stored(_id: str) -> Optional[Document]:
+    """
+    the documents of the stand-in by default, every user and city exists unless its key is `missing`.
+    """
+    collection, key = _id.split("/", 1)
+    if key == "missing":
+        return None
+    if collection == "users":
+        return user(key)
+    if collection == "cities":
+        return {"_id": _id, "_key": key, "_rev": "1", "name": f"city {key}"}
+    return None
+
+
+class DocumentRoutes:
+    """
+    cursor handler of the queries the session sends for documents.
+
+    `DOCUMENT(@ids)` lookups (`get`, `get_many`, the loader and revision checks) are answered from `lookup`, in reverse
+    order since the server does not guarantee any. bulk writes (`save`, `save_many` and `flush`) are answered with the
+    id, key and revision `rev` of every written document, new documents get the keys `new1`, `new2`... other queries
+    are answered by `fallback`.
+    """
+
+    def __init__(self, lookup: Lookup = stored, rev: str = "2", fallback: Optional[Handler] = None) -> None:
+        self.lookup = lookup
+        self.rev = rev
+        self.fallback = fallback
+        self._keys = itertools.count(1)
+
+    def __call__(self, method: str, body: Any) -> Any:
+        query, bind_vars = body["query"], body.get("bindVars", {})
+        lookup = _LOOKUP.match(query)
+        if lookup:
+            variable, parameter = lookup.groups()
+            return {"result": self._find(query[lookup.end() :], variable, bind_vars[parameter]), "hasMore": False}
+        write = _BULK_WRITE.search(query)
+        if write:
+            parameter, collection = write.groups()
+            result = [self._written(collection, document) for document in bind_vars[parameter]]
+            if "RETURN {vertex: " in query:
+                result = [{"vertex": {collection: result}, "edges": {}}]
+            return {"result": result, "hasMore": False}
+        if self.fallback is None:
+            return httpx.Response(404, json={"error": True, "errorNum": 404, "errorMessage": f"unexpected {query}"})
+        return self.fallback(method, body)
+
+    def _find(self, rest: str, variable: str, ids: Any) -> list[Any]:
+        if isinstance(ids, str):
+            document = self.lookup(ids)
+            if rest == f" RETURN {variable}._rev":
+                return [document and document["_rev"]]
+            if rest == f" RETURN {variable}":
+                return [document]
+            return [{"doc": document, "edges": []}]
+        documents = [document for document in map(self.lookup, reversed(ids)) if document is not None]
+        if " OUTBOUND " in rest:
+            return [{"doc": document, "edges": []} for document in documents]
+        return documents
+
+    def _written(self, collection: str, document: Document) -> Document:
+        key = document.get("_key") or f"new{next(self._keys)}"
+        return {"_id": f"{collection}/{key}", "_key": key, "_rev": self.rev}
@@ -1,18 +1,405 @@
-# @pytest.mark.skip
-# async def test_benchmark(database: Database):
-#     query, _ = simple_query(10)
-#
-#     times = 1
-#     # result = await deplete_cursor(cursor)
-#     winner = {1: 0, 2: 0}
-#
-#     for i in range(1000):
-#         cursor = await query.execute(database)
-#         execution_time_function1 = timeit.timeit(lambda: deplete_cursor(cursor), number=times)
-#         cursor = await query.execute(database)
-#         execution_time_function2 = timeit.timeit(lambda: iterate_cursor(cursor), number=times)
-#         if execution_time_function1 > execution_time_function2:
-#             winner[1] += 1
-#         else:
-#             winner[2] += 1
-#     print(winner)
+"""
+query building and compilation benchmarks, no database is needed. they are skipped unless `PYDANGO_BENCHMARK` is set.
+
+every measurement is attached to the junit report (`--junitxml`) as a test property, setting
+`PYDANGO_BENCHMARK_OUTPUT` to a path also writes all of them to a json file.
+"""
+
+import datetime
+import json
+import os
+import platform
+import time
+import tracemalloc
+from typing import Annotated, Optional, cast
+
+import pytest
+
+from pydango.connection.query_utils import _build_graph_query
+from pydango.orm.models import EdgeModel, VertexModel
+from pydango.orm.models.base import Aliased, Relation
+from pydango.orm.models.edge import EdgeCollectionConfig
+from pydango.orm.models.vertex import VertexCollectionConfig
+from pydango.orm.query import ORMQuery
+from pydango.query.expressions import (
+    NEW,
+    OLD,
+    AssignmentExpression,
+    CollectionExpression,
+    In,
+    IteratorExpression,
+    ListExpression,
+    LiteralExpression,
+    OrExpression,
+    VariableExpression,
+)
+from pydango.query.functions import Sum
+from pydango.query.query import AQLQuery
+from tests import queries
+from tests.test_orm_query import Post, User
+from tests.test_queries import ecommerce_queries
+
+BENCHMARK = "PYDANGO_BENCHMARK"
+BENCHMARK_OUTPUT = "PYDANGO_BENCHMARK_OUTPUT"
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(not os.environ.get(BENCHMARK), reason=f"set {BENCHMARK} to run the benchmarks"),
+]
+
+
+class Member(VertexModel):
+    name: str
+    follows: Annotated[Optional[list["Member"]], Relation["Follows"]] = None
+
+    class Collection(VertexCollectionConfig):
+        name = "members"
+
+
+class Follows(EdgeModel):
+    since: int
+
+    class Collection(EdgeCollectionConfig):
+        name = "follows"
+
+
+Member.update_forward_refs()
+
+
+def _measure(func, repeat=5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+@pytest.fixture(scope="module")
+def benchmark_results():
+    results = []
+    yield results
+    output = os.environ.get(BENCHMARK_OUTPUT)
+    if output:
+        with open(output, "w") as f:
+            json.dump({"python": platform.python_version(), "benchmarks": results}, f, indent=2)
+
+
+@pytest.fixture
+def record(request, record_property, benchmark_results):
+    def record_(name, value):
+        record_property(name, value)
+        benchmark_results.append({"test": request.node.nodeid, "name": name, "value": value})
+
+    return record_
+
+
+def _query(result):
+    return result[0] if isinstance(result, tuple) else result
+
+
+def _orm_simple():
+    return ORMQuery().for_(User).filter(User.age > 10).sort(+User.age).return_(User)
+
+
+def _orm_named_aliased():
+    user = Aliased(User, "u")
+    return ORMQuery().for_(user).filter(user.age > 10).sort(-user.age).return_(user)
+
+
+def _orm_upsert():
+    user = User(name="john", age=36)
+    return ORMQuery().upsert(User(name="john", age=35), insert=user, update=user).return_(NEW())
+
+
+def _orm_collect(**kwargs):
+    groups, name, ages = VariableExpression(), VariableExpression(), VariableExpression()
+    collect = AssignmentExpression(name, User.name)
+    options = {"aggregate": AssignmentExpression(ages, Sum(User.age))} if kwargs.pop("aggregate", False) else {}
+    if kwargs.pop("into", False):
+        options["into"] = groups
+    if kwargs.pop("count", False):
+        options["with_count_into"] = VariableExpression()
+    return ORMQuery().for_(User).collect(collect=collect, **options).return_({"names": name, "groups": groups})
+
+
+def _orm_sub_query():
+    iterator = IteratorExpression()
+    subquery = ORMQuery().for_(User).filter(User.age > 10).return_(User)
+    return ORMQuery().for_(iterator, in_=subquery).filter(iterator.likes > 1000).return_(iterator)
+
+
+def _orm_projection():
+    user1, user2 = Aliased(User), Aliased(User, "u1")
+    return (
+        ORMQuery()
+        .for_(user1)
+        .for_(user2)
+        .filter(user1.age > user2.age)
+        .return_({"user1": user1.age, "user2": user2.age})
+    )
+
+
+def _orm_binary_expression():
+    delta = datetime.datetime(2023, 1, 1)
+    return (
+        ORMQuery()
+        .for_(User)
+        .for_(Post)
+        .filter((Post.user == User.id) & (Post.created_date > delta))
+        .sort(+Post.likes, -User.age)
+        .return_(User)
+    )
+
+
+def _keys(size):
+    return [str(i) for i in range(size)]
+
+
+def _documents(size):
+    return [{"_key": str(i), "name": f"user {i}", "age": i % 90, "tags": ["a", "b"]} for i in range(size)]
+
+
+_DOC = {"name": "john", "age": 35}
+
+# point queries of tests/queries.py, the ecommerce queries and the orm queries of tests/test_orm_query.py
+SMALL_QUERIES = {
+    "simple": lambda: queries.simple_query(29),
+    "multiple_filters": lambda: queries.multiple_filters_query(25, "Female"),
+    "projection_complex": lambda: queries.projection_complex_query("Jane Smith", 25),
+    "sort_filter": lambda: queries.sort_filter_query(28),
+    "insert": lambda: queries.insert_query("users", _DOC),
+    "remove": lambda: queries.delete_query("users", "1"),
+    "insert_return_new": lambda: queries.insert_return_new_query("users", _DOC, NEW()),
+    "update": lambda: queries.update_query("users", "1", _DOC),
+    "replace": lambda: queries.replace_query("users", "1", _DOC),
+    "upsert_update": lambda: queries.upsert_query("users", {"_key": "1"}, insert=_DOC, update=_DOC),
+    "upsert_replace": lambda: queries.upsert_query("users", {"_key": "1"}, insert=_DOC, replace=_DOC),
+    "ecommerce_user_orders": lambda: ecommerce_queries.get_user_orders_query("1"),
+    "ecommerce_product_reviews": lambda: ecommerce_queries.get_product_reviews_query("1"),
+    "ecommerce_user_reviews": lambda: ecommerce_queries.get_user_reviews_query("1"),
+    "ecommerce_product_orders_reviews": lambda: ecommerce_queries.get_product_orders_reviews_query("1"),
+    "ecommerce_ordered_products_with_reviews": ecommerce_queries.get_ordered_products_with_reviews_query,
+    "orm_simple": _orm_simple,
+    "orm_named_aliased": _orm_named_aliased,
+    "orm_projected_object": _orm_projection,
+    "orm_binary_expression": _orm_binary_expression,
+    "orm_sub_query": _orm_sub_query,
+    "orm_insert": lambda: ORMQuery().insert(User(name="john", age=35)).return_(NEW()),
+    "orm_remove": lambda: ORMQuery().remove(User(key="user/123", name="john", age=35)).return_(OLD()),
+    "orm_replace": lambda: ORMQuery().replace(User(name="john", age=35), User(name="john", age=36)).return_(NEW()),
+    "orm_update": lambda: ORMQuery().update(User(name="john", age=35), User(name="john", age=36)).return_(NEW()),
+    "orm_upsert": _orm_upsert,
+    "orm_collect": _orm_collect,
+    "orm_collect_into": lambda: _orm_collect(into=True),
+    "orm_collect_with_count": lambda: _orm_collect(count=True),
+    "orm_collect_aggregate": lambda: _orm_collect(aggregate=True),
+    "orm_collect_aggregate_into": lambda: _orm_collect(aggregate=True, into=True),
+}
+
+
+def _in_list_query(keys):
+    u = IteratorExpression("u")
+    return AQLQuery().for_(u, CollectionExpression("users")).filter(In(u._key, ListExpression(keys))).return_(u)
+
+
+def _orm_in_list_query(keys):
+    return ORMQuery().for_(User).filter(In(User.key, ListExpression(keys))).return_(User)
+
+
+def _upsert_many_query(docs):
+    d = IteratorExpression("d")
+    return (
+        AQLQuery()
+        .for_(d, ListExpression(docs))
+        .upsert({"_key": d._key}, insert=d, update=d, collection=CollectionExpression("users"))
+    )
+
+
+def _orm_upsert_many_query(docs):
+    d = IteratorExpression("d")
+    return ORMQuery().for_(d, ListExpression(docs)).upsert({"_key": d._key}, d, "users", update=d)
+
+
+# the data is generated once per size, only the building and compilation are timed
+SIZED_QUERIES = {
+    "in_list": (_keys, _in_list_query),
+    "orm_in_list": (_keys, _orm_in_list_query),
+    "upsert_many": (_documents, _upsert_many_query),
+    "orm_upsert_many": (_documents, _orm_upsert_many_query),
+}
+
+
+@pytest.mark.parametrize("method", ["compile", "prepare"])
+@pytest.mark.parametrize("name", list(SMALL_QUERIES))
+def test_query_benchmark(name, method, record):
+    build = SMALL_QUERIES[name]
+    build_time, _ = _measure(build, repeat=20)
+    total_time, result = _measure(lambda: getattr(_query(build()), method)(), repeat=20)
+
+    assert result
+
+    record("build", build_time)
+    record(f"build_and_{method}", total_time)
+
+
+@pytest.mark.parametrize("method", ["compile", "prepare"])
+@pytest.mark.parametrize("size", [1, 1_000, 10_000])
+@pytest.mark.parametrize("name", list(SIZED_QUERIES))
+def test_sized_query_benchmark(name, size, method, record):
+    make_data, build = SIZED_QUERIES[name]
+    data = make_data(size)
+    build_time, _ = _measure(lambda: build(data), repeat=3)
+    total_time, result = _measure(lambda: getattr(build(data), method)(), repeat=3)
+
+    assert result
+
+    record("build", build_time)
+    record(f"build_and_{method}", total_time)
+
+
+@pytest.mark.parametrize("predicates", [10, 100, 1000])
+def test_filter_benchmark(predicates, record):
+    def build():
+        user = IteratorExpression("u")
+        condition = user.age == 0
+        for i in range(1, predicates):
+            condition = condition | (user.age == i)
+        return AQLQuery().for_(user, CollectionExpression("users")).filter(condition).return_(user)
+
+    build_time, query = _measure(build)
+    compile_time, compiled = _measure(lambda: build().compile())
+
+    assert isinstance(query._ops[1].condition, OrExpression)
+    assert len(query._ops[1].condition.operands) == predicates
+    assert compiled.count("||") == predicates - 1
+
+    record("build", build_time)
+    record("build_and_compile", compile_time)
+
+
+@pytest.mark.parametrize("predicates", [10, 100, 1000])
+def test_orm_filter_benchmark(predicates, record):
+    def build():
+        condition = User.age == 0
+        for i in range(1, predicates):
+            condition = condition | (User.age == i)
+        return ORMQuery().for_(User).filter(condition).return_(User)
+
+    build_time, _ = _measure(build)
+    compile_time, compiled = _measure(lambda: build().compile())
+
+    assert compiled.count("var1.age ==") == predicates
+
+    record("build", build_time)
+    record("build_and_compile", compile_time)
+
+
+@pytest.mark.parametrize("deduplicate", [True, False])
+def test_bind_large_arrays_benchmark(deduplicate, record):
+    size = 50_000
+    docs = [{"_key": str(i), "name": f"user {i}", "tags": ["a", "b"]} for i in range(size)]
+    keys = [str(i) for i in range(size)]
+
+    def build():
+        d = IteratorExpression("d")
+        query = AQLQuery()
+        query.deduplicate_parameters = deduplicate
+        return (
+            query.for_(d, ListExpression(keys))
+            .filter(In(d, ListExpression(list(keys))))
+            .return_({"key": d, "docs": LiteralExpression(docs), "same_docs": LiteralExpression(list(docs))})
+        )
+
+    queries = [build() for _ in range(5)]
+    compile_time, _ = _measure(lambda: queries.pop().compile())
+    query = build()
+    query.compile()
+
+    assert len(query.bind_vars) == (2 if deduplicate else 4)
+    record("compile", compile_time)
+
+
+def test_upsert_large_document_memory_benchmark(record):
+    tracemalloc.start()
+    try:
+        doc = {
+            "_key": "key",
+            "items": [
+                {"sku": f"sku-{i}", "qty": i, "tags": ["a", "b"], "meta": {"weight": i / 2}} for i in range(20000)
+            ],
+            "blob": "x" * 1_000_000,
+        }
+        doc_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+
+        query = AQLQuery().upsert({"_key": "key"}, insert=doc, update=doc, collection=CollectionExpression("docs"))
+        # what `PydangoSession.execute` sends, the encoded bind variables included
+        statement = query.prepare()
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    assert any(value is doc for value in cast(dict, statement.bind_vars).values())
+    assert peak < doc_size / 10
+
+    record("document_size", doc_size)
+    record("peak", peak)
+
+
+@pytest.mark.parametrize("size", [100, 10_000])
+def test_bulk_insert_benchmark(size, record):
+    docs = [{"_key": str(i), "name": f"user {i}", "address": {"city": "x", "tags": ["a", "b"]}} for i in range(size)]
+
+    def build():
+        d = IteratorExpression("d")
+        return AQLQuery().for_(d, ListExpression(docs)).insert(d, CollectionExpression("users"))
+
+    compile_time, compiled = _measure(lambda: build().compile())
+    query = build()
+    query.compile()
+
+    assert compiled == "FOR d IN @param1 INSERT d INTO `users`"
+    assert len(query.bind_vars) == 1
+
+    record("build_and_compile", compile_time)
+    record("query_size", len(compiled))
+
+
+MAX_TRACED_GRAPH_SIZE = 10_000
+
+
+def _member_tree(size, fanout=10):
+    members = [Member(name=f"member {i}") for i in range(size)]
+    for i, member in enumerate(members):
+        follows = members[i * fanout + 1 : (i + 1) * fanout + 1]
+        if follows:
+            member.follows = follows
+            member.edges = {Member.follows: [Follows(since=i * fanout + j) for j in range(len(follows))]}
+    return members[0]
+
+
+@pytest.mark.parametrize("size", [1_000, 10_000, 100_000])
+def test_graph_save_benchmark(size, record):
+    root = _member_tree(size)
+
+    build_time, (_, vertices_ids, edges_ids, query) = _measure(lambda: _build_graph_query(root), repeat=1)
+    compile_time, _ = _measure(query.compile, repeat=1)
+
+    assert len(vertices_ids[Member]) == size
+    assert sum(len(edges) for edges in edges_ids[Follows].values()) == size - 1
+
+    record("build", build_time)
+    record("compile", compile_time)
+    # tracing the allocations of the largest graph takes longer than the rest of the benchmark
+    if size <= MAX_TRACED_GRAPH_SIZE:
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            _build_graph_query(root)
+            peak = tracemalloc.get_traced_memory()[1] - before
+        finally:
+            tracemalloc.stop()
+        record("build_peak", peak)
@@ -0,0 +1,83 @@
+import json
+import logging
+
+import pytest
+
+from pydango.connection.client import make_connection
+from pydango.connection.codec import ORJSON_CODEC, STDLIB_CODEC, JSONCodec, get_codec
+from pydango.query import AQLQuery
+from pydango.query.expressions import IteratorExpression
+from tests.stand_in import echo, stand_in_session
+
+
+class CountingCodec(JSONCodec):
+    def __init__(self):
+        super().__init__("counting", self._dumps, json.loads)
+        object.__setattr__(self, "calls", [])
+
+    def _dumps(self, obj):
+        self.calls.append(obj)
+        return json.dumps(obj)
+
+
+requires_orjson = pytest.mark.skipif(ORJSON_CODEC is None, reason="orjson is not installed")
+
+
+def _query():
+    i = IteratorExpression()
+    return AQLQuery().for_(i, [{"name": "john"}]).return_(i)
+
+
+@pytest.fixture(autouse=True)
+def routes(server):
+    server.route("/_api/cursor", echo)
+
+
+def test_get_codec():
+    assert get_codec("json") is STDLIB_CODEC
+    assert get_codec("auto") is (ORJSON_CODEC or STDLIB_CODEC)
+    assert get_codec(STDLIB_CODEC) is STDLIB_CODEC
+
+    with pytest.raises(ValueError, match="unknown codec: yaml"):
+        get_codec("yaml")
+
+
+@requires_orjson
+def test_orjson_codec():
+    assert get_codec("orjson") is ORJSON_CODEC
+    assert ORJSON_CODEC.dumps({"a": [1, "b"]}) == STDLIB_CODEC.dumps({"a": [1, "b"]}) == '{"a":[1,"b"]}'
+    assert ORJSON_CODEC.loads('{"a":[1,"b"]}') == {"a": [1, "b"]}
+
+
+@requires_orjson
+def test_make_connection_codec():
+    connection = make_connection("http://db:8529", codec="orjson")
+
+    assert connection.serialize({"a": 1}) == '{"a":1}'
+    assert connection._serializer is ORJSON_CODEC.dumps
+    assert connection._deserializer is ORJSON_CODEC.loads
+
+
+@requires_orjson
+async def test_session_codec(server):
+    async with stand_in_session(server, codec="orjson") as session:
+        cursor = await session.execute(_query())
+
+        assert await cursor.next() == {"name": "john"}
+        assert session.database.conn._serializer is ORJSON_CODEC.dumps
+
+
+async def test_bind_vars_are_encoded_for_debug_logs_only(server, caplog):
+    codec = CountingCodec()
+    caplog.set_level(logging.INFO, logger="pydango")
+    async with stand_in_session(server, codec=codec) as session:
+        await session.execute(_query())
+        # the request body only
+        assert len(codec.calls) == 1
+
+        caplog.set_level(logging.DEBUG, logger="pydango.connection.session")
+        await session.execute(_query())
+
+        assert codec.calls[1] == {"param1": [{"name": "john"}]}
+        assert len(codec.calls) == 3
+        assert caplog.records[-1].bind_vars == '{"param1": [{"name": "john"}]}'
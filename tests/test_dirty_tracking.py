@@ -0,0 +1,100 @@
+import pytest
+
+from pydango.connection.types import UpdateStrategy
+from tests.stand_in import DocumentRoutes
+from tests.test_orm_query import User
+
+
+def _loaded(key, **fields):
+    return User.from_orm({"_id": f"users/{key}", "_key": key, "_rev": "1", "name": "john", "age": 35, **fields})
+
+
+def test_assigned_fields_are_tracked():
+    user = _loaded("1")
+    assert user.modified_fields == frozenset()
+
+    user.age = 36
+    user.rev = "2"
+
+    assert user.modified_fields == {"age"}
+    assert user.modified_save_dict() == {"age": 36}
+
+    user.mark_modified("name")
+    assert user.modified_save_dict() == {"name": "john", "age": 36}
+
+    with pytest.raises(ValueError, match="User has no fields nickname"):
+        user.mark_modified("nickname")
+
+
+@pytest.fixture(autouse=True)
+def routes(server):
+    server.route("/_api/cursor", DocumentRoutes())
+
+
+@pytest.fixture
+def session_options():
+    return {"identity_map": True}
+
+
+async def test_save_sends_the_modified_fields(server, session):
+    user = _loaded("1")
+
+    await session.save(user)
+    assert server.requests == []
+
+    user.age = 36
+    await session.save(user)
+
+    [(_, body)] = server.requests
+    assert (
+        body["query"]
+        == "FOR var1 IN @param1 UPDATE var1 IN `users` RETURN {_id: NEW._id, _key: NEW._key, _rev: NEW._rev}"
+    )
+    assert body["bindVars"] == {"param1": [{"_key": "1", "age": 36}]}
+    assert user.rev == "2"
+    assert user.modified_fields == frozenset()
+
+    await session.save(user)
+    assert len(server.requests) == 1
+
+
+async def test_save_replace_sends_the_document(server, session):
+    user = _loaded("1")
+
+    await session.save(user, strategy=UpdateStrategy.REPLACE)
+
+    assert len(server.requests) == 1
+    assert "INSERT var1 REPLACE var1 IN `users`" in server.requests[0][1]["query"]
+
+
+async def test_save_many_splits_new_modified_and_unmodified_documents(server, session):
+    unmodified, modified, new = _loaded("1"), _loaded("2"), User(name="jane", age=30)
+    modified.name = "jim"
+
+    await session.save_many([unmodified, modified, new])
+
+    (_, upsert), (_, update) = server.requests
+    assert " UPSERT " in upsert["query"]
+    assert upsert["bindVars"] == {"param1": [{"name": "jane", "age": 30}]}
+    assert " UPDATE var1 IN " in update["query"]
+    assert update["bindVars"] == {"param1": [{"_key": "2", "name": "jim"}]}
+    assert new.modified_fields == frozenset()
+
+    new.age = 31
+    await session.save_many([unmodified, modified, new])
+    assert server.requests[-1][1]["bindVars"] == {"param1": [{"_key": "new1", "age": 31}]}
+
+
+async def test_flush_writes_the_modified_mapped_documents(server, session):
+    user = session._load(User, {"_id": "users/1", "_key": "1", "_rev": "1", "name": "john", "age": 35})
+    other = session._load(User, {"_id": "users/2", "_key": "2", "_rev": "1", "name": "jane", "age": 30})
+
+    user.age = 36
+    await session.flush()
+
+    [(_, body)] = server.requests
+    assert body["bindVars"] == {"param1": [{"_key": "1", "age": 36}]}
+    assert other.modified_fields == frozenset()
+
+    await session.flush()
+    assert len(server.requests) == 1
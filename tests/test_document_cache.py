@@ -0,0 +1,129 @@
+import pytest
+
+from pydango.connection.cache import CacheStats, LRUDocumentCache
+from tests.stand_in import DocumentRoutes, user
+from tests.test_orm_query import User
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_cache_is_bounded_by_bytes():
+    size = len(b'{"_id":"users/1","_key":"1","_rev":"1","name":"user 1","age":30}')
+    cache = LRUDocumentCache(max_bytes=size * 2)
+    cache.set("users/1", user("1"), "1")
+    cache.set("users/2", user("2"), "1")
+    assert cache.get("users/1").document == user("1")
+
+    cache.set("users/3", user("3"), "1")
+
+    assert cache.get("users/2") is None
+    assert cache.get("users/1") is not None
+    assert cache.stats == CacheStats(hits=2, misses=1, evictions=1, entries=2, size=size * 2)
+
+    cache.set("users/big", user("big", blob="x" * size), "1")
+    assert cache.get("users/big") is None
+    assert cache.stats.entries == 2
+
+
+def test_lru_cache_ttl_and_revalidation():
+    clock = Clock()
+    cache = LRUDocumentCache(ttl=10, clock=clock)
+    cache.set("users/1", user("1"), "1")
+    cache.get("users/1").document["name"] = "changed"
+
+    clock.now = 10
+    cached = cache.get("users/1")
+    assert cached.stale and cached.rev == "1"
+    assert cached.document == user("1")
+    assert cache.revalidate("users/1", "1")
+    assert not cache.get("users/1").stale
+
+    clock.now = 20
+    assert not cache.revalidate("users/1", "2")
+    assert cache.get("users/1") is None
+
+    cache.set("users/1", user("1"), "1")
+    clock.now = 30
+    assert cache.get("users/1", allow_stale=False) is None
+
+    cache.set("users/1", user("1"), "1")
+    cache.invalidate("users/1")
+    cache.invalidate("users/1")
+    assert cache.stats.invalidations == 1
+    assert cache.stats.revalidations == 2
+
+
+@pytest.fixture(autouse=True)
+def revs(server):
+    revs = {}
+    documents = DocumentRoutes(
+        lambda _id: user(_id[6:], revs.get(_id, "1")),
+        # the removals
+        fallback=lambda method, body: {"result": [], "hasMore": False},
+    )
+    server.route("/_api/cursor", documents)
+    return revs
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def session_options(clock):
+    return {"cache": LRUDocumentCache(ttl=10, clock=clock)}
+
+
+async def test_get_is_served_from_the_cache(server, session, clock, revs):
+    user = await session.get(User, "1")
+    again = await session.get(User, "1")
+
+    assert again is not user and again == user
+    assert len(server.requests) == 1
+    assert session.cache.stats.hits == 1
+
+    clock.now = 10
+    await session.get(User, "1")
+    assert server.requests[-1][1]["query"] == "LET var1 = DOCUMENT(@id) RETURN var1._rev"
+    assert session.cache.stats.revalidations == 1
+
+    clock.now = 20
+    revs["users/1"] = "3"
+    assert (await session.get(User, "1")).rev == "3"
+    assert len(server.requests) == 4
+
+
+async def test_writes_and_removals_invalidate_the_cache(server, session):
+    user = await session.get(User, "1")
+    await session.get_many(User, ["2", "3"])
+
+    user.age = 31
+    await session.save(user)
+    await session.save_many([User(key="2", name="user 2", age=32)])
+    assert session.cache.stats.entries == 1
+
+    await session.remove(User(key="3", name="user 3", age=30))
+
+    assert session.cache.stats.entries == 0
+    assert session.cache.stats.invalidations == 3
+    assert server.requests[-1][1]["query"] == "REMOVE @param1 IN `users`"
+    assert server.requests[-1][1]["bindVars"] == {"param1": {"_key": "3"}}
+
+
+async def test_get_many_uses_the_cache(server, session):
+    await session.get(User, "1")
+
+    result = await session.get_many(User, ["1", "2"])
+
+    assert [user.key for user in result] == ["1", "2"]
+    assert server.requests[-1][1]["bindVars"] == {"ids": ["users/2"]}
+
+    await session.get(User, "2")
+    assert len(server.requests) == 2
@@ -0,0 +1,92 @@
+import asyncio
+
+import httpx
+import pytest
+from aioarango.exceptions import AQLQueryExecuteError
+
+from pydango.connection.types import ExecutionStats
+from pydango.query import AQLQuery
+from pydango.query.expressions import IteratorExpression
+from tests.stand_in import echo, stand_in_session
+
+
+def _query(value):
+    i = IteratorExpression()
+    return AQLQuery().for_(i, [value]).return_(i)
+
+
+@pytest.fixture(autouse=True)
+def routes(server):
+    def cursor(method, body):
+        response = echo(method, body)
+        if response["result"][0] < 0:
+            return httpx.Response(400, json={"error": True, "errorNum": 1501, "errorMessage": "syntax error"})
+        return response
+
+    server.route("/_api/cursor", cursor)
+
+
+async def test_execute_many_returns_the_results_in_order(server):
+    async with stand_in_session(server) as session:
+        server.hold()
+        task = asyncio.ensure_future(session.execute_many([_query(i) for i in range(10)], concurrency=3))
+        await server.wait_for(3)
+        assert server.in_flight == 3
+        server.release()
+
+        assert await task == [[i] for i in range(10)]
+        assert server.peak_in_flight == 3
+        assert session.execution_stats == ExecutionStats(completed=10)
+
+
+async def test_execute_many_isolates_the_failing_queries(server):
+    async with stand_in_session(server) as session:
+        first, failed, last = await session.execute_many([_query(1), _query(-1), _query(2)])
+
+        assert (first, last) == ([1], [2])
+        assert isinstance(failed, AQLQueryExecuteError)
+        assert session.execution_stats == ExecutionStats(completed=2, failed=1)
+
+
+async def test_session_concurrency_limit(server):
+    async with stand_in_session(server, max_concurrency=2) as session:
+        server.hold()
+        task = asyncio.ensure_future(session.execute_many([_query(i) for i in range(6)]))
+        await server.wait_for(2)
+
+        assert session.execution_stats == ExecutionStats(in_flight=2, queued=4)
+
+        server.release()
+        await asyncio.gather(task, session.execute(_query(7)))
+        assert server.peak_in_flight == 2
+        assert session.execution_stats.completed == 7
+
+
+async def test_concurrency_limit_covers_the_batches_of_a_cursor(server):
+    server.route("/_api/cursor", lambda method, body: {"id": "42", "result": [1], "hasMore": True})
+    server.route("/_api/cursor/42", lambda method, body: {"id": "42", "result": [2], "hasMore": False})
+
+    async with stand_in_session(server, max_concurrency=1) as session:
+        server.hold()
+        task = asyncio.ensure_future(session.execute_many([_query(1), _query(2)]))
+        for count in range(1, 5):
+            await server.wait_for(count)
+            for _ in range(20):
+                await asyncio.sleep(0)
+            assert server.in_flight == 1
+            server.release()
+            server.hold()
+        server.release()
+
+        assert await task == [[1, 2], [1, 2]]
+        assert server.peak_in_flight == 1
+
+
+async def test_concurrency_should_be_positive(server):
+    with pytest.raises(ValueError, match="max_concurrency should be a positive integer"):
+        async with stand_in_session(server, max_concurrency=0):
+            pass
+
+    async with stand_in_session(server) as session:
+        with pytest.raises(ValueError, match="concurrency should be a positive integer"):
+            await session.execute_many([_query(1)], concurrency=0)
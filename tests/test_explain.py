@@ -0,0 +1,144 @@
+import httpx
+import pytest
+from aioarango.exceptions import AQLQueryExplainError
+
+from pydango.connection.explain import PlanIndex, PlanNodeStats, ProfiledCursor
+from pydango.orm.query import ORMQuery
+from pydango.query.expressions import Param
+from tests.test_orm_query import User
+
+PLAN = {
+    "nodes": [
+        {"type": "SingletonNode", "dependencies": [], "id": 1, "estimatedCost": 1, "estimatedNrItems": 1},
+        {
+            "type": "IndexNode",
+            "dependencies": [1],
+            "id": 6,
+            "estimatedCost": 4.3,
+            "estimatedNrItems": 3,
+            "collection": "users",
+            "indexes": [
+                {
+                    "id": "42",
+                    "type": "persistent",
+                    "name": "idx_age",
+                    "fields": ["age"],
+                    "unique": False,
+                    "sparse": False,
+                    "selectivityEstimate": 0.5,
+                }
+            ],
+        },
+        {"type": "ReturnNode", "dependencies": [6], "id": 5, "estimatedCost": 7.3, "estimatedNrItems": 3},
+    ],
+    "rules": ["use-indexes", "remove-filter-covered-by-index"],
+    "collections": [{"name": "users", "type": "read"}],
+    "estimatedCost": 7.3,
+    "estimatedNrItems": 3,
+}
+
+
+async def test_explain_orm_query(server, session):
+    server.route("/_api/explain", lambda method, body: {"plan": PLAN, "cacheable": True, "warnings": [], "code": 200})
+
+    plan = await session.explain(ORMQuery().for_(User).filter(User.age > 10).return_(User))
+
+    assert [(i.id, i.type) for i in plan.nodes] == [(1, "SingletonNode"), (6, "IndexNode"), (5, "ReturnNode")]
+    assert plan.rules == ["use-indexes", "remove-filter-covered-by-index"]
+    assert plan.collections == ["users"]
+    assert plan.estimated_cost == 7.3
+    assert plan.cacheable is True
+    assert plan.indexes == [PlanIndex("42", "persistent", ["age"], "idx_age", "users", False, False, 0.5)]
+    assert plan.node(6).dependencies == [1]
+    assert plan.node(6).stats is None
+
+    [(path, body)] = server.requests
+    assert path == "/_api/explain"
+    assert body["query"] == "FOR var1 IN `users` FILTER var1.age > @param1 RETURN var1"
+    assert body["bindVars"] == {"param1": 10}
+
+
+async def test_explain_prepared_query_requires_bound_parameters(server, session):
+    prepared = ORMQuery().for_(User).filter(User.age > Param("age")).return_(User).prepare()
+
+    with pytest.raises(ValueError, match="unbound parameters: age"):
+        await session.explain(prepared)
+
+    server.route("/_api/explain", lambda method, body: {"plan": PLAN, "cacheable": False, "warnings": []})
+    await session.explain(prepared.bind(age=3), optimizer_rules=["-all"])
+    assert server.requests[0][1]["bindVars"] == {"age": 3}
+    assert server.requests[0][1]["options"]["optimizer"] == {"rules": ["-all"]}
+
+
+async def test_explain_error(server, session):
+    server.route(
+        "/_api/explain",
+        lambda method, body: httpx.Response(
+            400, json={"error": True, "code": 400, "errorNum": 1501, "errorMessage": "syntax error"}
+        ),
+    )
+
+    with pytest.raises(AQLQueryExplainError, match="syntax error"):
+        await session.explain(ORMQuery().for_(User).return_(User))
+
+
+async def test_execute_profile(server, session):
+    def cursor(method, body):
+        return {
+            "result": [{"name": "john", "age": 35}],
+            "hasMore": False,
+            "cached": False,
+            "extra": {
+                "plan": PLAN,
+                "stats": {
+                    "writesExecuted": 0,
+                    "scannedIndex": 3,
+                    "executionTime": 0.002,
+                    "nodes": [
+                        {"id": 1, "calls": 1, "items": 1, "runtime": 0.00001},
+                        {"id": 6, "calls": 1, "items": 3, "filtered": 2, "runtime": 0.0015},
+                        {"id": 5, "calls": 1, "items": 1, "runtime": 0.00002},
+                    ],
+                },
+                "profile": {"parsing": 0.0001, "optimizing plan": 0.0003, "executing": 0.0016},
+                "warnings": [],
+            },
+        }
+
+    server.route("/_api/cursor", cursor)
+
+    result = await session.execute(ORMQuery().for_(User).filter(User.age > 10).return_(User), profile=True, count=True)
+
+    assert isinstance(result, ProfiledCursor)
+    assert await result.next() == {"name": "john", "age": 35}
+    profile = result.query_profile()
+    assert profile.plan.node(6).stats == PlanNodeStats(calls=1, items=3, runtime=0.0015, filtered=2)
+    assert profile.plan.indexes[0].name == "idx_age"
+    assert profile.phases["executing"] == 0.0016
+    assert profile.execution_time == 0.002
+
+    [(_, body)] = server.requests
+    assert body["options"] == {"profile": 2}
+    assert body["count"] is True
+
+
+async def test_execute_profile_unknown_option(session):
+    with pytest.raises(TypeError, match="unexpected execute option: bogus"):
+        await session.execute(ORMQuery().for_(User).return_(User), profile=True, bogus=1)
+
+
+async def test_execute_deterministic_query_uses_plan_cache(server, session):
+    class DeterministicQuery(ORMQuery):
+        deterministic = True
+
+    server.route("/_api/cursor", lambda method, body: {"result": [], "hasMore": False})
+
+    cursor = await session.execute(DeterministicQuery().for_(User).limit(10).return_(User), batch_size=5)
+    assert not isinstance(cursor, ProfiledCursor)
+    await session.execute(DeterministicQuery().for_(User).return_(User), use_plan_cache=False)
+
+    (_, deterministic), (_, opted_out) = server.requests
+    assert deterministic["query"] == "FOR var1 IN `users` LIMIT @param1 RETURN var1"
+    assert deterministic["batchSize"] == 5
+    assert deterministic["options"] == {"usePlanCache": True}
+    assert "usePlanCache" not in opted_out.get("options", {})
@@ -0,0 +1,108 @@
+import pytest
+
+from pydango.indexes import PersistentIndex
+from pydango.orm.models import VertexModel
+from pydango.orm.models.vertex import VertexCollectionConfig
+from tests.test_orm_query import User
+
+
+class Person(VertexModel):
+    name: str
+    age: int
+
+    class Collection(VertexCollectionConfig):
+        name = "people"
+        indexes = [PersistentIndex(fields=["age", "name"])]
+
+
+def _doc(key, age):
+    return {"_id": f"people/{key}", "_key": key, "name": f"person {key}", "age": age}
+
+
+@pytest.fixture
+def pages(server):
+    pages = []
+    server.route("/_api/cursor", lambda method, body: {"result": pages.pop(0), "hasMore": False})
+    return pages
+
+
+async def test_find_keyset_pagination_by_key(server, session, pages):
+    pages[:] = [[_doc("a", 30), _doc("b", 20), _doc("c", 40)], [_doc("c", 40)]]
+
+    page = await session.find(User, User.age > 10, limit=2)
+
+    assert [user.key for user in page] == ["a", "b"]
+    assert all(isinstance(user, User) for user in page)
+    assert page.next_token is not None
+
+    last = await session.find(User, User.age > 10, limit=2, after=page.next_token)
+
+    assert [user.key for user in last] == ["c"]
+    assert last.next_token is None
+
+    (_, first), (_, second) = server.requests
+    assert first["query"] == "FOR var1 IN `users` FILTER var1.age > @param1 SORT var1._key ASC LIMIT 3 RETURN var1"
+    assert first["batchSize"] == 3
+    assert (
+        second["query"]
+        == "FOR var1 IN `users` FILTER var1.age > @param1 FILTER var1._key > @param2 SORT var1._key ASC LIMIT 3"
+        " RETURN var1"
+    )
+    assert second["bindVars"] == {"param1": 10, "param2": "b"}
+
+
+async def test_find_keyset_pagination_by_index_field(server, session, pages):
+    pages[:] = [[_doc("a", 40), _doc("b", 30), _doc("c", 30)], []]
+
+    page = await session.find(Person, limit=2, order_by=-Person.age)
+    await session.find(Person, limit=2, order_by=-Person.age, after=page.next_token)
+
+    (_, first), (_, second) = server.requests
+    assert first["query"] == "FOR var1 IN `people` SORT var1.age DESC, var1._key DESC LIMIT 3 RETURN var1"
+    assert (
+        second["query"]
+        == "FOR var1 IN `people` FILTER var1.age <= @param1 FILTER (var1.age < @param1 || (var1.age == @param1 &&"
+        " var1._key < @param2)) SORT var1.age DESC, var1._key DESC LIMIT 3 RETURN var1"
+    )
+    assert second["bindVars"] == {"param1": 30, "param2": "b"}
+
+
+async def test_find_without_limit(server, session, pages):
+    pages[:] = [[_doc("a", 40), _doc("b", 30)]]
+
+    page = await session.find(Person, {"name": "person a", "key": "a"}, order_by="age")
+
+    assert len(page) == 2
+    assert page.next_token is None
+    [(_, body)] = server.requests
+    assert (
+        body["query"]
+        == "FOR var1 IN `people` FILTER var1.name == @param1 FILTER var1._key == @param2 SORT var1.age ASC,"
+        " var1._key ASC RETURN var1"
+    )
+
+
+async def test_find_skip(server, session, pages):
+    pages[:] = [[]]
+
+    await session.find(User, skip=20, limit=10)
+
+    assert server.requests[0][1]["query"] == "FOR var1 IN `users` SORT var1._key ASC LIMIT 20,11 RETURN var1"
+
+
+async def test_find_invalid_arguments(server, session, pages):
+    with pytest.raises(ValueError, match="can not be paginated by name"):
+        await session.find(User, order_by=User.name)
+    with pytest.raises(ValueError, match="can not be paginated by name"):
+        await session.find(Person, order_by="name")
+    with pytest.raises(ValueError, match="invalid continuation token"):
+        await session.find(User, limit=2, after="not a token")
+    with pytest.raises(ValueError, match="skip requires a limit"):
+        await session.find(User, skip=2)
+
+    pages[:] = [[_doc("a", 40), _doc("b", 30)]]
+    token = (await session.find(Person, limit=1)).next_token
+    with pytest.raises(ValueError, match="another sort than _key DESC"):
+        await session.find(Person, limit=1, order_by=-Person.key, after=token)
+    with pytest.raises(ValueError, match="can not be combined"):
+        await session.find(Person, skip=1, limit=1, after=token)
@@ -0,0 +1,70 @@
+import pytest
+
+from pydango.connection.exceptions import DocumentNotFoundError
+from pydango.connection.session import GET_MANY_EDGES_CHUNK_SIZE
+from pydango.orm.models import VertexModel
+from pydango.orm.models.vertex import VertexCollectionConfig
+from tests.stand_in import DocumentRoutes
+from tests.test_orm_query import User
+
+STORED = {f"users/{i}": {"_id": f"users/{i}", "_key": str(i), "name": f"user {i}", "age": i} for i in range(1, 6)}
+
+
+class UserName(VertexModel):
+    name: str
+
+    class Collection(VertexCollectionConfig):
+        name = "users"
+
+
+@pytest.fixture(autouse=True)
+def routes(server):
+    server.route("/_api/cursor", DocumentRoutes(STORED.get))
+
+
+async def test_get_many_keeps_order_and_reports_missing(server, session):
+    result = await session.get_many(User, ["3", "404", "1", "3"])
+
+    assert [user and user.name for user in result] == ["user 3", None, "user 1", "user 3"]
+    assert result.missing == ["404"]
+    assert result[0].key == "3"
+
+    [(_, body)] = server.requests
+    assert body["query"] == "LET var1 = DOCUMENT(@ids) FOR var2 IN var1 RETURN var2"
+    assert body["bindVars"] == {"ids": ["users/3", "users/404", "users/1"]}
+    assert body["batchSize"] == 3
+
+
+async def test_get_many_chunks(server, session):
+    result = await session.get_many(User, [str(i) for i in range(1, 6)], chunk_size=2, projection=UserName)
+
+    assert [user.name for user in result] == [f"user {i}" for i in range(1, 6)]
+    assert all(isinstance(user, UserName) for user in result)
+    assert [body["bindVars"]["ids"] for _, body in server.requests] == [
+        ["users/1", "users/2"],
+        ["users/3", "users/4"],
+        ["users/5"],
+    ]
+
+
+async def test_get_many_fetch_edges(server, session):
+    keys = [str(i) for i in range(GET_MANY_EDGES_CHUNK_SIZE + 1)]
+
+    result = await session.get_many(User, keys, fetch_edges={"knows"}, return_raw=True)
+
+    assert result[1] == STORED["users/1"]
+    assert len(result.missing) == GET_MANY_EDGES_CHUNK_SIZE + 1 - len(STORED)
+    assert len(server.requests) == 2
+    assert (
+        server.requests[0][1]["query"]
+        == "LET var1 = DOCUMENT(@param1) FOR var2 IN var1 LET var3 = (FOR v, e IN 1..1 OUTBOUND var2 `knows`"
+        " RETURN {v: v, e: e}) RETURN {doc: var2, edges: var3}"
+    )
+
+
+async def test_get_many_should_raise(session):
+    with pytest.raises(DocumentNotFoundError, match="users/404"):
+        await session.get_many(User, ["1", "404"], should_raise=True)
+
+    with pytest.raises(ValueError, match="chunk_size"):
+        await session.get_many(User, ["1"], chunk_size=0)
@@ -0,0 +1,101 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+from aioarango.http import DefaultHTTPClient
+
+from pydango.connection.client import make_connection, pool_stats
+from pydango.connection.http import PooledHTTPClient, PoolStats
+
+
+def test_make_connection_settings():
+    connection = make_connection(
+        "http://db:8529", max_connections=8, keepalive_expiry=120, read_timeout=5, compression=True
+    )
+
+    http_client = connection._http
+    assert isinstance(http_client, PooledHTTPClient)
+    assert http_client.limits == httpx.Limits(max_connections=8, max_keepalive_connections=8, keepalive_expiry=120)
+    assert http_client.timeout == httpx.Timeout(connect=5.0, read=5, write=5, pool=None)
+    assert http_client.compression
+    assert pool_stats(connection) == {}
+
+    assert isinstance(make_connection("http://db:8529")._http, DefaultHTTPClient)
+    with pytest.raises(ValueError, match="max_connections can not be combined with http_client"):
+        make_connection("http://db:8529", http_client=DefaultHTTPClient(), max_connections=8)
+    with pytest.raises(ValueError, match="is not using a PooledHTTPClient"):
+        pool_stats(make_connection("http://db:8529", http_client=DefaultHTTPClient()))
+
+
+def test_pool_settings_are_validated():
+    with pytest.raises(ValueError, match="max_connections should be a positive integer"):
+        PooledHTTPClient(max_connections=0)
+    with pytest.raises(ValueError, match="max_keepalive_connections should be between 0 and max_connections"):
+        PooledHTTPClient(max_connections=2, max_keepalive_connections=3)
+
+
+async def test_requests_are_compressed():
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(request)
+        return httpx.Response(200, json={"result": []})
+
+    http_client = PooledHTTPClient(compression=True, compression_threshold=64)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+        small = json.dumps({"query": "RETURN 1"})
+        large = json.dumps({"query": "RETURN 1", "bindVars": {"keys": list(range(100))}})
+        await http_client.send_request(session, "post", "http://db:8529/_api/cursor", data=small)
+        response = await http_client.send_request(session, "post", "http://db:8529/_api/cursor", data=large)
+
+    assert response.status_code == 200
+    assert "content-encoding" not in received[0].headers
+    assert received[0].headers["accept-encoding"] == "gzip, deflate"
+    assert received[1].headers["content-encoding"] == "gzip"
+    assert gzip.decompress(received[1].content).decode() == large
+
+    stats = http_client.stats["http://db:8529"]
+    assert stats.requests == 2
+    assert stats.bytes_sent == len(small) + len(received[1].content)
+
+
+async def test_uncompressed_requests_keep_the_default_headers():
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(request)
+        return httpx.Response(200, json={"result": []})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+        await PooledHTTPClient().send_request(session, "get", "http://db:8529/_api/version")
+
+    assert received[0].headers["accept-encoding"] == session.headers["accept-encoding"]
+    assert "content-length" not in received[0].headers
+
+
+async def test_pool_stats():
+    released = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await released.wait()
+        if request.url.path == "/fail":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={})
+
+    http_client = PooledHTTPClient(max_connections=2)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+        requests = [http_client.send_request(session, "get", f"http://db:8529/{i}") for i in range(3)]
+        tasks = [asyncio.ensure_future(request) for request in requests]
+        await asyncio.sleep(0)
+        assert http_client.stats["http://db:8529"].waiting == 1
+        released.set()
+        await asyncio.gather(*tasks)
+
+        with pytest.raises(httpx.ConnectError):
+            await http_client.send_request(session, "get", "http://db:8529/fail")
+
+    assert http_client.stats["http://db:8529"] == PoolStats(
+        requests=4, peak_in_flight=3, failures=1, bytes_received=len(b"{}") * 3
+    )
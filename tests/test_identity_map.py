@@ -0,0 +1,81 @@
+import gc
+
+import pytest
+
+from pydango.orm.models import VertexModel
+from pydango.orm.models.vertex import VertexCollectionConfig
+from tests.stand_in import DocumentRoutes, stand_in_session, user
+from tests.test_orm_query import User
+
+
+class City(VertexModel):
+    name: str
+
+    class Collection(VertexCollectionConfig):
+        name = "cities"
+
+
+@pytest.fixture(autouse=True)
+def routes(server):
+    # the finds return the first users
+    server.route(
+        "/_api/cursor",
+        DocumentRoutes(fallback=lambda method, body: {"result": [user("1"), user("2")], "hasMore": False}),
+    )
+
+
+@pytest.fixture
+def session_options():
+    return {"identity_map": True}
+
+
+async def test_get_returns_the_mapped_instance(server, session):
+    user = await session.get(User, "1")
+
+    assert await session.get(User, "1") is user
+    assert len(server.requests) == 1
+    assert (await session.find(User)).documents[0] is user
+
+    many = await session.get_many(User, ["2", "1", "2"])
+
+    assert many[1] is user
+    assert many[0] is many[2]
+    assert server.requests[-1][1]["bindVars"]["ids"] == ["users/2"]
+
+    # fetching the edges or a projection bypasses the identity map
+    assert await session.get(User, "1", fetch_edges={"knows"}) is not user
+
+
+async def test_identity_map_holds_weak_references(server, session):
+    await session.get(User, "1")
+    gc.collect()
+
+    assert "users/1" not in session.identity_map
+    await session.get(User, "1")
+    assert len(server.requests) == 2
+
+
+async def test_identity_map_is_optional(server):
+    async with stand_in_session(server) as session:
+        assert session.identity_map is None
+        assert await session.get(User, "1") is not await session.get(User, "1")
+
+
+async def test_flush_unit_of_work(server, session):
+    john, jane, city = User(name="john", age=35), User(name="jane", age=30), City(name="tlv")
+    session.add(john)
+    session.add(city)
+    session.add(jane)
+    session.add(john)
+
+    await session.flush()
+
+    assert (john.id, jane.id, city.id) == ("users/new1", "users/new2", "cities/new3")
+    assert [body["bindVars"]["param1"] for _, body in server.requests] == [
+        [{"name": "john", "age": 35}, {"name": "jane", "age": 30}],
+        [{"name": "tlv"}],
+    ]
+    assert await session.get(User, "new2") is jane
+
+    await session.flush()
+    assert len(server.requests) == 2
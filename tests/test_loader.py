@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from pydango.connection.exceptions import DocumentNotFoundError
+from pydango.connection.loader import LoaderStats
+from tests.stand_in import DocumentRoutes, stand_in_session
+from tests.test_identity_map import City
+from tests.test_orm_query import User
+
+
+@pytest.fixture(autouse=True)
+def routes(server):
+    server.route("/_api/cursor", DocumentRoutes())
+
+
+async def test_gets_of_the_same_iteration_are_batched(server):
+    async with stand_in_session(server, batch_window=0) as session:
+        keys = ["1", "2", "1", "3"]
+        *users, city = await asyncio.gather(*(session.get(User, key) for key in keys), session.get(City, "tlv"))
+
+        assert [user.key for user in users] == keys
+        assert users[0] is not users[2] and users[0] == users[2]
+        assert city.name == "city tlv"
+
+        [(_, body)] = server.requests
+        assert body["query"] == "LET var1 = DOCUMENT(@ids) FOR var2 IN var1 RETURN var2"
+        assert body["bindVars"] == {"ids": ["users/1", "users/2", "users/3", "cities/tlv"]}
+
+        await session.get(User, "4")
+        stats = session.loader.stats
+        assert (stats.calls, stats.batches, stats.documents, stats.max_batch_size) == (6, 2, 5, 4)
+        assert stats.mean_batch_size == 2.5
+        assert 0 < stats.mean_latency <= stats.max_latency
+
+
+async def test_gets_within_the_window_are_batched(server):
+    async with stand_in_session(server, batch_window=60) as session:
+        # a full batch is sent without waiting for the end of the window
+        session.loader.max_batch_size = 2
+        first = asyncio.ensure_future(session.get(User, "1"))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert not server.requests
+
+        await asyncio.gather(first, session.get(User, "2"))
+
+        assert len(server.requests) == 1
+        assert server.requests[0][1]["bindVars"] == {"ids": ["users/1", "users/2"]}
+
+
+async def test_missing_documents_fail_their_callers_only(server):
+    async with stand_in_session(server, batch_window=0) as session:
+        found, missing = await asyncio.gather(
+            session.get(User, "1"), session.get(User, "missing"), return_exceptions=True
+        )
+
+        assert found.key == "1"
+        assert isinstance(missing, DocumentNotFoundError)
+        assert len(server.requests) == 1
+
+
+async def test_batches_are_bounded(server):
+    async with stand_in_session(server, batch_window=0) as session:
+        session.loader.max_batch_size = 2
+
+        await asyncio.gather(*(session.get(User, str(key)) for key in range(5)))
+
+        assert [len(body["bindVars"]["ids"]) for _, body in server.requests] == [2, 2, 1]
+
+
+async def test_loader_is_opt_in(server):
+    async with stand_in_session(server) as session:
+        assert session.loader is None
+        assert LoaderStats().mean_latency == 0
@@ -8,7 +8,9 @@ from pydango.query.expressions import (
     NEW,
     OLD,
     AssignmentExpression,
+    In,
     IteratorExpression,
+    ListExpression,
     VariableExpression,
 )
 from pydango.query.functions import Sum
@@ -163,32 +165,32 @@ def test_sub_query():
 
 def test_insert():
     aql = ORMQuery().insert(User(name="john", age=35)).return_(NEW())
-    expected_repr = "INSERT {name: ?, age: ?} INTO <CollectionExpression: users> RETURN NEW"
-    expected_compiled = "INSERT {name: @param1, age: @param2} INTO `users` RETURN NEW"
+    expected_repr = "INSERT ? INTO <CollectionExpression: users> RETURN NEW"
+    expected_compiled = "INSERT @param1 INTO `users` RETURN NEW"
     assert repr(aql) == expected_repr
     assert aql.compile() == expected_compiled
 
 
 def test_remove():
     aql = ORMQuery().remove(User(key="user/123", name="john", age=35)).return_(OLD())
-    expected_repr = "REMOVE {_key: ?} IN <CollectionExpression: users> RETURN OLD"
-    expected_compiled = "REMOVE {_key: @param1} IN `users` RETURN OLD"
+    expected_repr = "REMOVE ? IN <CollectionExpression: users> RETURN OLD"
+    expected_compiled = "REMOVE @param1 IN `users` RETURN OLD"
     assert repr(aql) == expected_repr
     assert aql.compile() == expected_compiled
 
 
 def test_replace():
     aql = ORMQuery().replace(User(name="john", age=35), User(name="john", age=36)).return_(NEW())
-    expected_repr = "REPLACE {name: ?, age: ?} IN <CollectionExpression: users> RETURN NEW"
-    expected_compiled = "REPLACE {name: @param1, age: @param2} IN `users` RETURN NEW"
+    expected_repr = "REPLACE ? IN <CollectionExpression: users> RETURN NEW"
+    expected_compiled = "REPLACE @param1 IN `users` RETURN NEW"
     assert repr(aql) == expected_repr
     assert aql.compile() == expected_compiled
 
 
 def test_update():
     aql = ORMQuery().update(User(name="john", age=35), User(name="john", age=36)).return_(NEW())
-    expected_repr = "UPDATE {name: ?, age: ?} IN <CollectionExpression: users> RETURN NEW"
-    expected_compiled = "UPDATE {name: @param1, age: @param2} IN `users` RETURN NEW"
+    expected_repr = "UPDATE ? IN <CollectionExpression: users> RETURN NEW"
+    expected_compiled = "UPDATE @param1 IN `users` RETURN NEW"
     assert repr(aql) == expected_repr
     assert aql.compile() == expected_compiled
 
@@ -196,14 +198,8 @@ def test_update():
 def test_upsert():
     user = User(name="john", age=36)
     aql = ORMQuery().upsert(User(name="john", age=35), insert=user, update=user).return_(NEW())
-    expected_repr = (
-        "UPSERT {name: ?, age: ?} INSERT {name: ?, age: ?} UPDATE {name: ?, age: ?} IN <CollectionExpression: users>"
-        " RETURN NEW"
-    )
-    expected_compiled = (
-        "UPSERT {name: @param1, age: @param3} INSERT {name: @param1, age: @param2} UPDATE {name: @param1, age: @param2}"
-        " IN `users` RETURN NEW"
-    )
+    expected_repr = "UPSERT {name: ?, age: ?} INSERT ? UPDATE ? IN <CollectionExpression: users> RETURN NEW"
+    expected_compiled = "UPSERT {name: @param2, age: @param3} INSERT @param1 UPDATE @param1 IN `users` RETURN NEW"
     assert repr(aql) == expected_repr
     assert aql.compile() == expected_compiled
 
@@ -368,3 +364,14 @@ def test_collect_aggregate_into():
 
     assert repr(aql) == expected_repr
     assert aql.compile() == expected_compiled
+
+
+def test_in_list_filter():
+    aql = ORMQuery().for_(User).filter(In(User.name, ListExpression(["a", "b"]))).return_(User)
+    assert aql.compile() == "FOR var1 IN `users` FILTER var1.name IN @param1 RETURN var1"
+    assert aql.bind_vars == {"param1": ["a", "b"]}
+
+
+def test_unset_operational_fields_do_not_leak_into_model_exclusions():
+    ORMQuery().update(User(name="john", age=35), User(name="john", age=36)).compile()
+    assert User(key="user/123", name="john", age=35).dict(include={"key"}, by_alias=True) == {"_key": "user/123"}
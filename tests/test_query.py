@@ -1,3 +1,6 @@
+import gc
+import weakref
+
 import pytest
 
 from pydango.query.consts import DYNAMIC_ALIAS, KEY
@@ -9,11 +12,15 @@ from pydango.query.expressions import (
     In,
     IteratorExpression,
     ListExpression,
+    LiteralExpression,
     ObjectExpression,
+    OrExpression,
+    Param,
     VariableExpression,
 )
-from pydango.query.functions import Sum
+from pydango.query.functions import Nth, Sum
 from pydango.query.operations import RangeExpression, TraversalDirection
+from pydango.query.options import RemoveOptions
 from pydango.query.query import AQLQuery
 from tests.queries import (  # multiple_collections_query,
     delete_query,
@@ -373,7 +380,7 @@ def test_nested_return_expression():
     repr_query = repr(aql_query)
     assert repr_query == expected_repr
     assert aql_query.compile() == expected_compiled
-    assert aql_query.bind_vars == {"param1": param1, "param2": param2, "param3": param3, "param4": tuple(param4)}
+    assert aql_query.bind_vars == {"param1": param1, "param2": param2, "param3": param3, "param4": param4}
 
 
 def test_filter_and_return():
@@ -542,8 +549,8 @@ def test_insert():
 
     repr_query = repr(aql_query)
     assert repr_query == f"INSERT {repr(obj)} INTO {repr(coll)}"
-    assert aql_query.compile() == "INSERT {a: @param1} INTO `test`"
-    assert aql_query.bind_vars == {"param1": param1}
+    assert aql_query.compile() == "INSERT @param1 INTO `test`"
+    assert aql_query.bind_vars == {"param1": doc}
 
 
 def test_insert_return_new():
@@ -554,8 +561,8 @@ def test_insert_return_new():
 
     repr_query = repr(aql_query)
     assert repr_query == f"INSERT {repr(obj)} INTO {repr(coll)} RETURN NEW"
-    assert aql_query.compile() == "INSERT {a: @param1} INTO `test` RETURN NEW"
-    assert aql_query.bind_vars == {"param1": 1}
+    assert aql_query.compile() == "INSERT @param1 INTO `test` RETURN NEW"
+    assert aql_query.bind_vars == {"param1": doc}
 
 
 def test_insert_return_new_a_b():
@@ -567,9 +574,9 @@ def test_insert_return_new_a_b():
     doc = {"a": param1, "b": param2}
     aql_query, coll_expr, obj_expr = insert_return_new_query(coll, doc, new_doc)
     repr_query = repr(aql_query)
-    assert aql_query.compile() == "INSERT {a: @param1, b: @param2} INTO `test` RETURN {a: NEW.a, b: NEW.b}"
+    assert aql_query.compile() == "INSERT @param1 INTO `test` RETURN {a: NEW.a, b: NEW.b}"
     assert repr_query == f"INSERT {repr(obj_expr)} INTO {repr(coll_expr)} RETURN {{a: NEW.a, b: NEW.b}}"
-    assert aql_query.bind_vars == {"param1": param1, "param2": param2}
+    assert aql_query.bind_vars == {"param1": doc}
 
 
 def test_insert_return_new_a_b2():
@@ -581,9 +588,9 @@ def test_insert_return_new_a_b2():
     doc = {"a": param1, "b": param2}
     aql_query, coll_expr, obj_expr = insert_return_new_query(coll, doc, new_doc)
     repr_query = repr(aql_query)
-    assert aql_query.compile() == "INSERT {a: @param1, b: @param2} INTO `test` RETURN {a: NEW.a, b: NEW.b}"
+    assert aql_query.compile() == "INSERT @param1 INTO `test` RETURN {a: NEW.a, b: NEW.b}"
     assert repr_query == f"INSERT {repr(obj_expr)} INTO {repr(coll_expr)} RETURN {{a: NEW.a, b: NEW.b}}"
-    assert aql_query.bind_vars == {"param1": param1, "param2": param2}
+    assert aql_query.bind_vars == {"param1": doc}
 
 
 def test_no_modification_query():
@@ -602,8 +609,8 @@ def test_remove():
 
     repr_query = repr(aql_query)
     assert repr_query == f"REMOVE {repr(ObjectExpression({KEY:key}))} IN {repr(coll)}"
-    assert aql_query.compile() == "REMOVE {_key: @param1} IN `test`"
-    assert aql_query.bind_vars == {"param1": key}
+    assert aql_query.compile() == "REMOVE @param1 IN `test`"
+    assert aql_query.bind_vars == {"param1": {"_key": key}}
 
 
 def test_update():
@@ -614,8 +621,8 @@ def test_update():
 
     repr_query = repr(aql_query)
     assert repr_query == f"UPDATE {repr(ObjectExpression(doc))} IN {repr(coll)}"
-    assert aql_query.compile() == "UPDATE {a: @param1} IN `test`"
-    assert aql_query.bind_vars == {"param1": param1}
+    assert aql_query.compile() == "UPDATE @param1 IN `test`"
+    assert aql_query.bind_vars == {"param1": doc}
 
 
 def test_replace():
@@ -626,8 +633,8 @@ def test_replace():
 
     repr_query = repr(aql_query)
     assert repr_query == f"REPLACE {repr(ObjectExpression(doc))} IN {repr(coll)}"
-    assert aql_query.compile() == "REPLACE {a: @param1} IN `test`"
-    assert aql_query.bind_vars == {"param1": param1}
+    assert aql_query.compile() == "REPLACE @param1 IN `test`"
+    assert aql_query.bind_vars == {"param1": doc}
 
 
 def test_upsert_update():
@@ -637,10 +644,10 @@ def test_upsert_update():
     aql_query, coll = upsert_query(coll, {"_key": param2}, insert={"name": param2}, update={"food": param1})
 
     repr_query = repr(aql_query)
-    assert repr_query == f"UPSERT {{_key: ?}} INSERT {{name: ?}} UPDATE {{food: ?}} IN {repr(coll)}"
-    assert aql_query.compile() == "UPSERT {_key: @param2} INSERT {name: @param2} UPDATE {food: @param1} IN `test`"
+    assert repr_query == f"UPSERT {{_key: ?}} INSERT ? UPDATE ? IN {repr(coll)}"
+    assert aql_query.compile() == "UPSERT {_key: @param2} INSERT @param3 UPDATE @param1 IN `test`"
 
-    assert aql_query.bind_vars == {"param1": param1, "param2": param2}
+    assert aql_query.bind_vars == {"param1": {"food": param1}, "param2": param2, "param3": {"name": param2}}
 
 
 def test_upsert_replace():
@@ -650,10 +657,10 @@ def test_upsert_replace():
     aql_query, coll = upsert_query(coll, {"_key": param2}, insert={"name": param2}, replace={"food": param1})
 
     repr_query = repr(aql_query)
-    assert repr_query == f"UPSERT {{_key: ?}} INSERT {{name: ?}} REPLACE {{food: ?}} IN {repr(coll)}"
-    assert aql_query.compile() == "UPSERT {_key: @param2} INSERT {name: @param2} REPLACE {food: @param1} IN `test`"
+    assert repr_query == f"UPSERT {{_key: ?}} INSERT ? REPLACE ? IN {repr(coll)}"
+    assert aql_query.compile() == "UPSERT {_key: @param2} INSERT @param3 REPLACE @param1 IN `test`"
 
-    assert aql_query.bind_vars == {"param1": param1, "param2": param2}
+    assert aql_query.bind_vars == {"param1": {"food": param1}, "param2": param2, "param3": {"name": param2}}
 
 
 def test_traverse_v():
@@ -937,3 +944,306 @@ def test_with_count():
 
     assert repr(aql) == expected_repr
     assert aql.compile() == expected_compiled
+
+
+def test_prepared_query_placeholders():
+    user = IteratorExpression("u")
+    aql = (
+        AQLQuery()
+        .for_(user, CollectionExpression("users"))
+        .filter((user.age > Param("min_age")) & (user.city == "tlv"))
+        .return_({"name": user.name, "tags": [Param("tag"), "x"]})
+    )
+    expected_compiled = (
+        "FOR u IN `users` FILTER (u.age > @min_age && u.city == @param1) RETURN {name: u.name, tags: [@tag, @param2]}"
+    )
+    statement = aql.prepare()
+
+    r = repr(user)
+    assert (
+        repr(aql)
+        == f"FOR {r} IN <CollectionExpression: users> FILTER {r}.age > @min_age && {r}.city == ? "
+        f"RETURN {{name: {r}.name, tags: [@tag, ?]}}"
+    )
+    assert statement.query == expected_compiled
+    assert statement.params == {"min_age", "tag"}
+
+    first = statement.bind(min_age=18, tag="a")
+    second = statement.bind(min_age=30, tag="b")
+    assert first.query == second.query == expected_compiled
+    assert first.bind_vars == {"param1": "tlv", "param2": "x", "min_age": 18, "tag": "a"}
+    assert second.bind_vars == {"param1": "tlv", "param2": "x", "min_age": 30, "tag": "b"}
+    assert first.params == frozenset()
+    assert statement.bind_vars == {"param1": "tlv", "param2": "x"}
+
+
+def test_prepared_query_bind_errors():
+    user = IteratorExpression("u")
+    statement = AQLQuery().for_(user, CollectionExpression("users")).filter(user.age > Param("age")).return_(user)
+    statement = statement.prepare()
+
+    with pytest.raises(ValueError, match="missing values for parameters: age"):
+        statement.bind()
+    with pytest.raises(ValueError, match="unexpected parameters: name"):
+        statement.bind(age=1, name="x")
+    with pytest.raises(ValueError):
+        Param("not valid")
+
+
+def test_prepared_query_name_conflict():
+    user = IteratorExpression("u")
+    aql = AQLQuery().for_(user, CollectionExpression("users")).filter(user.age > Param("param1")).return_(user.name)
+    aql.filter(user.name == "x")
+
+    with pytest.raises(ValueError, match="conflict"):
+        aql.prepare()
+
+
+def test_prepared_query_modification():
+    user = IteratorExpression("u")
+    read = AQLQuery().for_(user, CollectionExpression("users")).return_(user)
+    created = VariableExpression("created")
+    write_in_subquery = (
+        AQLQuery().let(created, AQLQuery().insert({"name": "john"}, "users").return_(NEW())).return_(created)
+    )
+
+    assert not read.prepare().modification
+    assert AQLQuery().insert({"name": "john"}, "users").prepare().modification
+    statement = write_in_subquery.prepare()
+    assert statement.query == "LET created = (INSERT @param1 INTO `users` RETURN NEW) RETURN created"
+    assert statement.modification
+    assert statement.bind().modification
+
+
+def test_prepared_query_binds_json_values_as_they_are():
+    doc = {"name": "john", "tags": ["a", "b"], "address": {"city": "tlv", "zip": None}}
+    user = IteratorExpression("u")
+    aql = (
+        AQLQuery()
+        .for_(user, CollectionExpression("users"))
+        .filter(
+            (user.tags == LiteralExpression(("a", "b"))) & (user.meta == LiteralExpression({"_sa_state": 1, "x": 1}))
+        )
+        .insert(doc, "archive")
+    )
+
+    bind_vars = aql.prepare().bind_vars
+    assert bind_vars == {"param1": ["a", "b"], "param2": {"x": 1}, "param3": doc}
+    assert bind_vars["param3"] is doc
+
+
+def test_compile_stats():
+    user = IteratorExpression("u")
+    aql = AQLQuery().for_(user, CollectionExpression("users")).filter((user.age > 10) & (user.age < 20)).return_(user)
+    assert aql.compile_stats is None
+    aql.compile()
+
+    stats = aql.compile_stats
+    assert stats is not None
+    assert stats.params_bound == 2
+    assert stats.variables_bound == 0
+    assert stats.nodes_visited == 6
+    assert stats.elapsed > 0
+
+
+def test_shared_node_is_compiled_once():
+    user = IteratorExpression("u")
+    condition = user.age > 10
+    aql = AQLQuery().for_(user, CollectionExpression("users")).filter(condition).filter(condition).return_(user)
+
+    assert aql.compile() == "FOR u IN `users` FILTER u.age > @param1 FILTER u.age > @param1 RETURN u"
+    assert aql.compile_stats.memo_hits == 1
+
+
+def test_node_shared_between_queries():
+    user = IteratorExpression("u")
+    condition = user.age > 10
+    first = AQLQuery().for_(user, CollectionExpression("users")).filter(condition).return_(user)
+    second = (
+        AQLQuery().for_(user, CollectionExpression("users")).filter(user.name == "x").filter(condition).return_(user)
+    )
+
+    assert first.compile() == "FOR u IN `users` FILTER u.age > @param1 RETURN u"
+    assert second.compile() == "FOR u IN `users` FILTER u.name == @param1 FILTER u.age > @param2 RETURN u"
+    assert second.bind_vars == {"param1": "x", "param2": 10}
+
+
+def test_compilation_does_not_retain_the_tree():
+    user = IteratorExpression("u")
+    aql = AQLQuery().for_(user, CollectionExpression("users")).filter(user.age > 10).return_(user)
+    aql.compile()
+    ref = weakref.ref(aql._ops[1])
+    del aql, user
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_bind_outside_compilation():
+    with pytest.raises(RuntimeError):
+        LiteralExpression(1).compile(AQLQuery())
+
+
+def test_logical_expressions_are_flattened():
+    user = IteratorExpression("u")
+    condition = (user.age > 10) & (user.age < 20) & (user.name == "x") | (user.admin == True)  # noqa: E712
+
+    assert isinstance(condition, OrExpression)
+    assert len(condition.operands) == 2
+    assert isinstance(condition.operands[0], AndExpression)
+    assert len(condition.operands[0].operands) == 3
+
+    aql = AQLQuery().for_(user, CollectionExpression("users")).filter(condition).return_(user)
+    expected_compiled = (
+        "FOR u IN `users` FILTER ((u.age > @param1 && u.age < @param2 && u.name == @param3) || u.admin == @param4)"
+        " RETURN u"
+    )
+    assert aql.compile() == expected_compiled
+    assert aql.bind_vars == {"param1": 10, "param2": 20, "param3": "x", "param4": True}
+
+
+def test_logical_expression_operands_can_be_replaced():
+    user = IteratorExpression("u")
+    condition = (user.age > 10) & (user.age < 20) & (user.name == "x")
+
+    name = user.name == "y"
+    condition.right = name
+    assert condition.operands[1] is name and condition.right is name
+
+    condition.left = (user.age > 1) & (user.age < 2)
+    assert len(condition.operands) == 3
+
+    aql = AQLQuery().for_(user, CollectionExpression("users")).filter(condition).return_(user)
+    assert aql.compile() == "FOR u IN `users` FILTER (u.age > @param1 && u.age < @param2 && u.name == @param3) RETURN u"
+    assert aql.bind_vars == {"param1": 1, "param2": 2, "param3": "y"}
+
+
+def test_large_filter_does_not_recurse():
+    user = IteratorExpression("u")
+    condition = user.age == 0
+    for i in range(1, 5000):
+        condition = (condition | (user.age == i)) & (user.name > str(i))
+
+    aql = AQLQuery().for_(user, CollectionExpression("users")).filter(condition).return_(user)
+    compiled = aql.compile()
+
+    assert compiled.startswith("FOR u IN `users` FILTER " + "(" * 9998 + "u.age == @param1 || u.age == @param2)")
+    assert len(aql.bind_vars) == 9999
+
+
+class _NoStr(list):
+    def __str__(self):
+        raise AssertionError("bound values should not be stringified")
+
+    __repr__ = __str__
+
+
+def test_bind_parameter_deduplication():
+    docs = _NoStr({"i": i} for i in range(100))
+    same_docs = _NoStr({"i": i} for i in range(100))
+    d = IteratorExpression("d")
+    aql = (
+        AQLQuery()
+        .for_(d, ListExpression(docs))
+        .filter(In(d, ListExpression(same_docs)))
+        .filter(In(d.flags, ListExpression([1, 2])))
+        .filter(In(d.flags, ListExpression([True, 2])))
+        .filter((d.a == 1) & (d.b == True) & (d.c == 1.0))  # noqa: E712
+        .return_(d)
+    )
+
+    assert (
+        aql.compile()
+        == "FOR d IN @param1 FILTER d IN @param1 FILTER d.flags IN @param2 FILTER d.flags IN @param3"
+        " FILTER (d.a == @param4 && d.b == @param5 && d.c == @param6) RETURN d"
+    )
+    assert aql.bind_vars == {
+        "param1": docs,
+        "param2": [1, 2],
+        "param3": [True, 2],
+        "param4": 1,
+        "param5": True,
+        "param6": 1.0,
+    }
+
+
+def test_bind_parameter_structural_deduplication_opt_out():
+    class Query(AQLQuery):
+        deduplicate_parameters = False
+
+    docs = [{"i": i} for i in range(10)]
+    d = IteratorExpression("d")
+    aql = Query().for_(d, ListExpression(docs)).filter(In(d, ListExpression(list(docs)))).return_(d)
+
+    assert aql.compile() == "FOR d IN @param1 FILTER d IN @param2 RETURN d"
+
+
+def test_literal_objects_and_lists_are_bound_as_a_single_parameter():
+    docs = [{"name": f"user {i}", "tags": ["a", "b"], "address": {"city": "x", "zip": [i]}} for i in range(3)]
+    d = IteratorExpression("d")
+    aql = AQLQuery().for_(d, ListExpression(docs)).insert(d, "users")
+
+    assert aql.compile() == "FOR d IN @param1 INSERT d INTO `users`"
+    assert aql.bind_vars["param1"] is docs
+
+    obj = ObjectExpression({"a": {"b": [1, {"c": None}]}, "d": "e"})
+    assert obj.__all_literals__
+    assert repr(obj) == "?"
+
+
+def test_objects_and_lists_with_nested_expressions_are_compiled():
+    d = IteratorExpression("d")
+    obj = ObjectExpression({"a": {"b": [1, {"c": d.c}]}, "d": "e", "f": {"g": 1}})
+    assert not obj.__all_literals__
+
+    aql = AQLQuery().for_(d, CollectionExpression("users")).return_(obj)
+    assert aql.compile() == "FOR d IN `users` RETURN {a: {b: [@param1, {c: d.c}]}, d: @param2, f: @param3}"
+    assert aql.bind_vars == {"param1": 1, "param2": "e", "param3": {"g": 1}}
+
+    aql = AQLQuery().for_(d, CollectionExpression("users")).return_(ListExpression([[1, 2], [d.a], {"b": d.b}]))
+    assert aql.compile() == "FOR d IN `users` RETURN [@param1, [d.a], {b: d.b}]"
+    assert aql.bind_vars == {"param1": [1, 2]}
+
+
+def test_upsert_search_expression_is_an_object_literal():
+    search = ObjectExpression({"_key": "a"})
+    aql = AQLQuery().upsert(search, insert={"_key": "a"}, update={"n": 1}, collection="test")
+
+    assert aql.compile() == "UPSERT {_key: @param2} INSERT @param3 UPDATE @param1 IN `test`"
+    assert aql.bind_vars == {"param1": {"n": 1}, "param2": "a", "param3": {"_key": "a"}}
+
+
+def test_deterministic_compilation():
+    class Query(AQLQuery):
+        deterministic = True
+
+    def build(age, depth, index, limit, offset, wait_for_sync):
+        u = IteratorExpression("u")
+        v = IteratorExpression("v")
+        return (
+            Query()
+            .for_(u, CollectionExpression("users"))
+            .filter((u.age > age) & (u.score > age))
+            .traverse(v, "knows", u, RangeExpression(1, depth), TraversalDirection.OUTBOUND)
+            .limit(limit, offset)
+            .remove(Nth(v.tags, index), "users", options=RemoveOptions(wait_for_sync=wait_for_sync))
+        )
+
+    first = build(10, 2, 0, 5, 0, True)
+    second = build(20, 3, 1, 10, 20, False)
+    compiled = first.compile()
+
+    assert (
+        compiled
+        == "FOR u IN `users` FILTER (u.age > @param1 && u.score > @param2)"
+        " FOR v IN @param3..@param4 OUTBOUND u `knows` LIMIT @param5,@param6"
+        " REMOVE NTH(v.tags, @param7) IN `users` OPTIONS {waitForSync: @param8}"
+    )
+    assert second.compile() == compiled
+    assert list(first.bind_vars.values()) == [10, 10, 1, 2, 0, 5, 0, True]
+    assert list(second.bind_vars.values()) == [20, 20, 1, 3, 20, 10, 1, False]
+    assert first.prepare().deterministic
+
+    inlined = AQLQuery().for_(IteratorExpression("i"), RangeExpression(1, 2)).limit(5).return_(Nth([1], 0))
+    assert inlined.compile() == "FOR i IN 1..2 LIMIT 5 RETURN NTH(@param1, 0)"
+    assert not inlined.prepare().deterministic
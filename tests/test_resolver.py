@@ -0,0 +1,160 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from aioarango.request import Request
+
+from pydango.connection.client import make_connection, pool_stats
+from pydango.connection.http import PooledHTTPClient
+from pydango.connection.resolver import LatencyAwareHostResolver
+
+
+class FakeCoordinator:
+    """
+    local http server answering every request after `delay` seconds with `status`.
+    """
+
+    def __init__(self, delay: float = 0.0, status: int = 200) -> None:
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+        self.url = ""
+
+    async def start(self) -> "FakeCoordinator":
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.url = "http://127.0.0.1:{}".format(self.server.sockets[0].getsockname()[1])
+        return self
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        await reader.readexactly(int(line.split(":", 1)[1]))
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                body = json.dumps({"server": "arango", "version": "3.11.0"}).encode()
+                writer.write(b"HTTP/1.1 %d X\r\nContent-Type: application/json\r\n" % self.status)
+                writer.write(b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+async def coordinators():
+    started = []
+
+    async def start(*delays, status=200):
+        for delay in delays:
+            started.append(await FakeCoordinator(delay, status).start())
+        return started[-len(delays) :]
+
+    yield start
+    for coordinator in started:
+        await coordinator.stop()
+
+
+@pytest.fixture
+async def connect():
+    connections = []
+
+    def connect(*coordinators, **kwargs):
+        connection = make_connection([c.url for c in coordinators], host_resolver="latency", **kwargs)
+        connections.append(connection)
+        return connection
+
+    yield connect
+    for connection in connections:
+        for session in connection._sessions:
+            await session.aclose()
+
+
+def _version():
+    return Request(method="get", endpoint="/_api/version")
+
+
+async def test_requests_go_to_the_fastest_coordinator(coordinators, connect):
+    fast, slow = await coordinators(0.0, 0.05)
+    connection = connect(slow, fast, max_connections=10)
+
+    for _ in range(20):
+        assert (await connection.send_request(_version())).status_code == 200
+
+    # each coordinator is probed once
+    assert (slow.requests, fast.requests) == (1, 19)
+    slow_stats, fast_stats = connection._host_resolver.stats
+    assert slow_stats.latency > fast_stats.latency
+    assert sum(stats.requests for stats in pool_stats(connection).values()) == 20
+
+
+async def test_requests_in_flight_are_spread(coordinators, connect):
+    first, second = await coordinators(0.02, 0.02)
+    connection = connect(first, second)
+
+    await asyncio.gather(*(connection.send_request(_version()) for _ in range(10)))
+    await asyncio.gather(*(connection.send_request(_version()) for _ in range(10)))
+
+    assert first.requests >= 5 and second.requests >= 5
+    assert [stats.in_flight for stats in connection._host_resolver.stats] == [0, 0]
+
+
+async def test_failing_coordinators_are_ejected(coordinators, connect):
+    [healthy] = await coordinators(0.0)
+    [overloaded] = await coordinators(0.0, status=503)
+    [down] = await coordinators(0.0)
+    await down.stop()
+    connection = connect(overloaded, down, healthy, http_client=PooledHTTPClient(retries=0))
+    resolver = connection._host_resolver
+    resolver.max_failures = 2
+
+    for _ in range(10):
+        try:
+            await connection.send_request(_version())
+        except httpx.ConnectError:
+            pass
+
+    assert overloaded.requests == 2
+    assert healthy.requests == 6
+    assert [stats.failures for stats in resolver.stats] == [2, 2, 0]
+    assert resolver.stats[0].ejected_until is not None and resolver.stats[1].ejected_until is not None
+
+
+def test_ejected_hosts_come_back():
+    clock = Clock()
+    resolver = LatencyAwareHostResolver(
+        ["http://a:8529", "http://b:8529"], max_failures=1, ejection_time=10, clock=clock
+    )
+
+    index = resolver.get_host_index()
+    resolver.started(index)
+    resolver.failed(index)
+    other = resolver.get_host_index()
+    assert other != index
+    resolver.started(other)
+    resolver.failed(other)
+
+    # every host is ejected, the first one ejected comes back first
+    assert resolver.get_host_index() == index
+    clock.now = 10
+    assert resolver.get_host_index() == index
+    resolver.started(index)
+    resolver.succeeded(index, 0.01)
+    assert resolver.stats[index].ejected_until is None
+    assert resolver.index_of("http://b:8529/_db/pydango/_api/cursor") == 1
@@ -0,0 +1,72 @@
+import pytest
+
+from pydango.connection.types import UpdateStrategy
+from pydango.indexes import PersistentIndex
+from pydango.orm.models import VertexModel
+from pydango.orm.models.vertex import VertexCollectionConfig
+from pydango.query.options import UpsertOptions
+from tests.stand_in import DocumentRoutes
+from tests.test_orm_query import User
+
+
+class City(VertexModel):
+    name: str
+
+    class Collection(VertexCollectionConfig):
+        name = "cities"
+        indexes = [PersistentIndex(fields=["name"], unique=True)]
+
+
+@pytest.fixture(autouse=True)
+def routes(server):
+    server.route("/_api/cursor", DocumentRoutes())
+
+
+async def test_save_many_chunks_and_writes_back(server, session):
+    users = [User(name=f"user {i}", age=i) for i in range(5)]
+    users[2].key = "two"
+
+    result = await session.save_many(users, batch_size=2)
+
+    assert result is users
+    assert [(u.id, u.key, u.rev) for u in users] == [
+        ("users/new1", "new1", "2"),
+        ("users/new2", "new2", "2"),
+        ("users/two", "two", "2"),
+        ("users/new3", "new3", "2"),
+        ("users/new4", "new4", "2"),
+    ]
+    assert len(server.requests) == 3
+    _, body = server.requests[0]
+    assert (
+        body["query"]
+        == "FOR var1 IN @param1 UPSERT {_key: var1._key} INSERT var1 UPDATE var1 IN `users`"
+        " RETURN {_id: NEW._id, _key: NEW._key, _rev: NEW._rev}"
+    )
+    assert body["bindVars"] == {"param1": [{"name": "user 0", "age": 0}, {"name": "user 1", "age": 1}]}
+    assert body["batchSize"] == 2
+    assert server.requests[1][1]["bindVars"]["param1"][0] == {"_key": "two", "name": "user 2", "age": 2}
+    assert len(server.requests[2][1]["bindVars"]["param1"]) == 1
+
+
+async def test_save_many_groups_by_collection(server, session):
+    documents = [City(name="tlv"), User(name="john", age=35), City(name="nyc")]
+
+    await session.save_many(
+        documents, strategy=UpdateStrategy.REPLACE, collection_options={City: UpsertOptions(ignore_errors=True)}
+    )
+
+    assert [i.id for i in documents] == ["cities/new1", "users/new3", "cities/new2"]
+    (_, cities), (_, users) = server.requests
+    assert (
+        cities["query"]
+        == "FOR var1 IN @param1 UPSERT {name: var1.name} INSERT var1 REPLACE var1 IN `cities`"
+        " OPTIONS {ignoreErrors: true} RETURN {_id: NEW._id, _key: NEW._key, _rev: NEW._rev}"
+    )
+    assert cities["bindVars"] == {"param1": [{"name": "tlv"}, {"name": "nyc"}]}
+    assert users["bindVars"] == {"param1": [{"name": "john", "age": 35}]}
+
+
+async def test_save_many_invalid_batch_size(session):
+    with pytest.raises(ValueError, match="batch_size"):
+        await session.save_many([User(name="john", age=35)], batch_size=0)
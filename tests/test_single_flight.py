@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from aioarango.exceptions import AQLQueryExecuteError
+
+from pydango.connection.codec import STDLIB_CODEC, JSONCodec
+from pydango.query import AQLQuery, VariableExpression
+from pydango.query.expressions import NEW
+from tests.stand_in import DocumentRoutes, stand_in_session, user
+from tests.test_orm_query import User
+
+
+@pytest.fixture(autouse=True)
+def routes(server):
+    documents = DocumentRoutes(lambda _id: user(_id[6:], name="john", age=35))
+
+    def cursor(method, body):
+        if "users/broken" in body["bindVars"].values():
+            return httpx.Response(500, json={"error": True, "errorNum": 4, "errorMessage": "internal error"})
+        return documents(method, body)
+
+    server.route("/_api/cursor", cursor)
+
+
+@pytest.fixture
+def session_options():
+    return {"single_flight": True}
+
+
+async def test_concurrent_identical_reads_share_one_request(server, session):
+    server.hold()
+    task = asyncio.gather(*(session.get(User, "1") for _ in range(50)), session.get(User, "2"))
+    await server.wait_for(2)
+    server.release()
+    users = await task
+
+    assert len(server.requests) == 2
+    assert session.execution_stats.coalesced == 49
+    assert len({id(user) for user in users}) == 51
+    users[0].name = "jim"
+    assert users[1].name == "john"
+
+    await session.get(User, "1")
+    assert len(server.requests) == 3
+
+
+async def test_only_the_callers_that_join_decode_the_results(server, session):
+    decoded = []
+
+    def loads(text):
+        decoded.append(text)
+        return json.loads(text)
+
+    session.codec = JSONCodec("json", STDLIB_CODEC.dumps, loads)
+    await session.get(User, "1")
+    assert decoded == []
+
+    server.hold()
+    task = asyncio.gather(*(session.get(User, "1") for _ in range(3)))
+    await server.wait_for(2)
+    server.release()
+    await task
+
+    assert len(decoded) == 2
+
+
+async def test_identical_writes_are_not_shared(server, session):
+    server.route("/_api/cursor", lambda method, body: {"result": [], "hasMore": False})
+
+    server.hold()
+    task = asyncio.ensure_future(session.execute_many([AQLQuery().insert({"name": "john"}, "users") for _ in range(3)]))
+    await server.wait_for(1)
+    server.release()
+
+    assert await task == [[], [], []]
+    assert len(server.requests) == 3
+    assert session.execution_stats.coalesced == 0
+
+
+async def test_identical_writes_in_subqueries_are_not_shared(server, session):
+    server.route("/_api/cursor", lambda method, body: {"result": [[]], "hasMore": False})
+
+    def insert() -> AQLQuery:
+        created = VariableExpression("created")
+        return AQLQuery().let(created, AQLQuery().insert({"name": "john"}, "users").return_(NEW())).return_(created)
+
+    server.hold()
+    task = asyncio.ensure_future(session.execute_many([insert(), insert()]))
+    await server.wait_for(1)
+    server.release()
+
+    assert await task == [[[]], [[]]]
+    assert len(server.requests) == 2
+    assert session.execution_stats.coalesced == 0
+
+
+async def test_a_cancelled_caller_does_not_cancel_the_others(server, session):
+    server.hold()
+    first = asyncio.ensure_future(session.get(User, "1"))
+    second = asyncio.ensure_future(session.get(User, "1"))
+    await server.wait_for(1)
+    first.cancel()
+    server.release()
+
+    assert (await second).key == "1"
+    assert first.cancelled()
+    assert len(server.requests) == 1
+
+
+async def test_errors_are_shared(server, session):
+    server.hold()
+    task = asyncio.gather(*(session.get(User, "broken") for _ in range(3)), return_exceptions=True)
+    await server.wait_for(1)
+    server.release()
+    results = await task
+
+    assert all(isinstance(result, AQLQueryExecuteError) for result in results)
+    assert len(server.requests) == 1
+
+
+async def test_single_flight_is_opt_in(server):
+    async with stand_in_session(server) as session:
+        await asyncio.gather(session.get(User, "1"), session.get(User, "1"))
+
+    assert len(server.requests) == 2
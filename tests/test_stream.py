@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from pydango.orm.query import ORMQuery
+from tests.test_orm_query import User
+
+BATCHES = [[{"_key": str(i + j), "name": f"user {i + j}", "age": i + j} for j in range(2)] for i in range(0, 6, 2)]
+
+
+@pytest.fixture(autouse=True)
+def routes(server):
+    batches = iter(BATCHES[1:])
+
+    def cursor(method, body):
+        return {"id": "42", "result": BATCHES[0], "hasMore": True}
+
+    def next_batch(method, body):
+        if method == "DELETE":
+            return {"id": "42", "error": False, "code": 202}
+        result = next(batches)
+        return {"id": "42", "result": result, "hasMore": result is not BATCHES[-1]}
+
+    server.route("/_api/cursor", cursor)
+    server.route("/_api/cursor/42", next_batch)
+
+
+async def test_stream_fetches_batch_by_batch(server, session):
+    users = []
+    async for user in session.stream(ORMQuery().for_(User).return_(User), model=User, batch_size=2):
+        users.append(user)
+        # the next batch is only requested once the current one is consumed
+        assert len(server.requests) == (len(users) + 1) // 2
+
+    assert [user.name for user in users] == [f"user {i}" for i in range(6)]
+    assert all(isinstance(user, User) for user in users)
+    (_, body), *fetches = server.requests
+    assert body["batchSize"] == 2
+    assert body["options"]["stream"] is True
+    assert [path for path, _ in fetches] == ["/_api/cursor/42", "/_api/cursor/42"]
+    assert server.methods("/_api/cursor/42") == ["PUT", "PUT"]
+
+
+async def test_stream_closes_cursor_on_break(server, session):
+    stream = session.stream(ORMQuery().for_(User).return_(User), batch_size=2)
+    async for result in stream:
+        assert result == BATCHES[0][0]
+        break
+    await stream.aclose()
+
+    assert len(server.requests) == 2
+    assert server.methods("/_api/cursor/42") == ["DELETE"]
+
+
+async def test_stream_closes_cursor_on_cancel(server, session):
+    results = []
+
+    async def consume():
+        async for result in session.stream(ORMQuery().for_(User).return_(User), batch_size=2):
+            results.append(result)
+
+    server.hold()
+    task = asyncio.create_task(consume())
+    await server.wait_for(1)
+    server.release()
+    # the fetch of the second batch is held until the consumer is cancelled
+    server.hold()
+    await server.wait_for(2)
+    task.cancel()
+    server.release()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert results == BATCHES[0]
+    # the initial request, the cancelled fetch and the release of the cursor
+    assert [path for path, _ in server.requests] == ["/_api/cursor", "/_api/cursor/42", "/_api/cursor/42"]
+    assert server.methods("/_api/cursor/42") == ["PUT", "DELETE"]
@@ -0,0 +1,79 @@
+import pytest
+
+from pydango.query import AQLQuery, Param, VariableExpression
+from pydango.query.cache import CacheInfo, TemplateCache, template_cache
+from pydango.query.functions import Document
+from tests.stand_in import DocumentRoutes
+from tests.test_orm_query import User
+
+builds = []
+
+
+def document_query(collection: str) -> AQLQuery:
+    builds.append(collection)
+    doc = VariableExpression()
+    return AQLQuery().let(doc, Document(Param("id"))).return_(doc)
+
+
+@pytest.fixture(autouse=True)
+def clear_builds():
+    builds.clear()
+
+
+def test_template_is_built_once_per_shape():
+    cache = TemplateCache()
+
+    first = cache.prepare(document_query, "users", id="users/1")
+    second = cache.prepare(document_query, "users", id="users/2")
+    cache.prepare(document_query, "cities", id="cities/tlv")
+
+    assert builds == ["users", "cities"]
+    assert first.query == second.query == "LET var1 = DOCUMENT(@id) RETURN var1"
+    assert (first.bind_vars, second.bind_vars) == ({"id": "users/1"}, {"id": "users/2"})
+    assert cache.cache_info() == CacheInfo(hits=1, misses=2, maxsize=1024, currsize=2)
+
+
+def test_least_recently_used_template_is_evicted():
+    cache = TemplateCache(maxsize=2)
+    cache.prepare(document_query, "users", id="users/1")
+    cache.prepare(document_query, "cities", id="cities/tlv")
+    cache.prepare(document_query, "users", id="users/2")
+
+    cache.prepare(document_query, "knows", id="knows/1")
+    cache.prepare(document_query, "users", id="users/3")
+    cache.prepare(document_query, "cities", id="cities/jlm")
+
+    assert builds == ["users", "cities", "knows", "cities"]
+    assert cache.cache_info() == CacheInfo(hits=2, misses=4, maxsize=2, currsize=2)
+
+    cache.cache_clear()
+    assert cache.cache_info() == CacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
+
+
+def test_template_values_are_checked():
+    cache = TemplateCache()
+    with pytest.raises(ValueError, match="missing values for parameters: id"):
+        cache.prepare(document_query, "users")
+    with pytest.raises(ValueError, match="unexpected parameters: key"):
+        cache.prepare(document_query, "users", id="users/1", key="1")
+    with pytest.raises(ValueError, match="maxsize should be a positive integer"):
+        TemplateCache(maxsize=0)
+
+
+async def test_session_point_lookups_share_a_template(server, session):
+    server.route("/_api/cursor", DocumentRoutes())
+    template_cache.cache_clear()
+
+    await session.get(User, "1")
+    await session.get(User, "2")
+    await session.get_many(User, ["3", "4"])
+    await session.get_many(User, ["5"])
+
+    assert template_cache.cache_info().hits == 2
+    assert template_cache.cache_info().misses == 2
+    assert [body["bindVars"] for _, body in server.requests] == [
+        {"id": "users/1"},
+        {"id": "users/2"},
+        {"ids": ["users/3", "users/4"]},
+        {"ids": ["users/5"]},
+    ]
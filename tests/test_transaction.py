@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from pydango.connection.cache import LRUDocumentCache
+from tests.stand_in import DocumentRoutes, user
+from tests.test_orm_query import User
+
+
+@pytest.fixture(autouse=True)
+def routes(server):
+    def begin(method, body):
+        return {"result": {"id": "42", "status": "running"}}
+
+    def end(method, body):
+        return {"result": {"id": "42", "status": "committed" if method == "PUT" else "aborted"}}
+
+    server.route("/_api/cursor", DocumentRoutes())
+    server.route("/_api/transaction/begin", begin)
+    server.route("/_api/transaction/42", end)
+
+
+@pytest.fixture
+def session_options():
+    return {"cache": LRUDocumentCache()}
+
+
+async def test_operations_run_in_the_transaction(server, session):
+    john, jane = User(name="john", age=35), User(name="jane", age=30)
+
+    async with session.transaction(write=[User], read="cities") as tx:
+        assert tx.transaction_id == "42"
+        await session.save_many([john, jane], batch_size=1)
+        await asyncio.gather(session.get(User, "1"), session.get(User, "2"))
+
+    paths = [path for path, _ in server.requests]
+    assert paths == ["/_api/transaction/begin", *["/_api/cursor"] * 4, "/_api/transaction/42"]
+    assert server.requests[0][1] == {"collections": {"read": ["cities"], "write": ["users"]}}
+    assert server.transaction_ids[1:5] == ["42"] * 4
+    assert server.methods("/_api/transaction/42") == ["PUT"]
+    # documents read in the transaction are not cached
+    assert session.cache.stats.entries == 0
+
+    await session.get(User, "1")
+    assert server.transaction_ids[-1] is None
+
+
+async def test_transaction_is_aborted_when_the_block_raises(server, session):
+    with pytest.raises(RuntimeError):
+        async with session.transaction(write="users"):
+            await session.save(User(name="john", age=35))
+            raise RuntimeError
+
+    assert server.methods("/_api/transaction/42") == ["DELETE"]
+    assert server.transaction_ids[-1] is None
+
+
+async def test_written_documents_are_invalidated_on_commit(session):
+    john = User(name="john", age=35)
+    async with session.transaction(write="users"):
+        await session.save_many([john])
+        # a read outside the transaction caches the document before the write is committed
+        session.cache.set(john.id, user(john.key), "0")
+
+    assert session.cache.get(john.id) is None
+
+    with pytest.raises(RuntimeError):
+        async with session.transaction(write="users"):
+            await session.save_many([john])
+            session.cache.set(john.id, user(john.key), "0")
+            raise RuntimeError
+
+    assert session.cache.get(john.id) is not None
+
+
+async def test_transactions_can_not_be_nested(server, session):
+    async with session.transaction(write="users"):
+        with pytest.raises(ValueError, match="transactions can not be nested"):
+            async with session.transaction(write="users"):
+                pass
+
+    assert server.methods("/_api/transaction/42") == ["PUT"]